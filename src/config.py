@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
+import logging
 import os
-import tempfile
 import threading
 from datetime import time
 from enum import Enum
@@ -13,31 +13,65 @@ from typing import Any, Callable, Optional, Type, TypeVar
 import yaml
 from pydantic import (
     BaseModel,
+    ConfigDict,
     Field,
     ValidationError,
     ValidationInfo,
     field_validator,
 )
 
+try:  # Prefer libyaml's C implementation when PyYAML was built with it.
+    from yaml import CSafeDumper as _SafeDumper, CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeDumper as _SafeDumper, SafeLoader as _SafeLoader
 
-_ALLOWED_DAYS = {"Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"}
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a flush that failed to write is retried.
+_FLUSH_RETRY_DELAY = 1.0
+
+# Directories already created by this process, so repeat writes skip the mkdir.
+_ENSURED_DIRS: set[str] = set()
+_ENSURED_DIRS_LOCK = threading.Lock()
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create ``path`` (and parents) once per process."""
+
+    key = str(path)
+    if key in _ENSURED_DIRS:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    with _ENSURED_DIRS_LOCK:
+        _ENSURED_DIRS.add(key)
+
+
+_DEFAULT_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_DAY_BITS = {day: 1 << index for index, day in enumerate(_DEFAULT_DAYS)}
 
 
 class ScheduleEntry(BaseModel):
     """Represents a recurring recording schedule window."""
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
     start: time
     end: time
-    days: list[str] = Field(default_factory=lambda: ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"])
+    days: list[str] = Field(default_factory=lambda: list(_DEFAULT_DAYS))
 
     @field_validator("days")
     @classmethod
     def validate_days(cls, value: list[str]) -> list[str]:
-        invalid = sorted(set(value) - _ALLOWED_DAYS)
-        if invalid:
-            raise ValueError(f"Invalid days: {', '.join(invalid)}")
-        if not value:
+        mask = 0
+        for day in value:
+            bit = _DAY_BITS.get(day)
+            if bit is None:
+                invalid = sorted({entry for entry in value if entry not in _DAY_BITS})
+                raise ValueError(f"Invalid days: {', '.join(invalid)}")
+            mask |= bit
+        if not mask:
             raise ValueError("At least one day must be provided")
         return value
 
@@ -143,6 +177,8 @@ class NTPSettings(BaseModel):
 class UserSettings(BaseModel):
     """User-tunable runtime settings."""
 
+    model_config = ConfigDict(frozen=True)
+
     recording_schedules: list[ScheduleEntry] = Field(default_factory=list)
     digital_inputs: list[dict[str, Any]] = Field(default_factory=list)
     digital_outputs: list[dict[str, Any]] = Field(default_factory=list)
@@ -160,6 +196,8 @@ class UserSettings(BaseModel):
 class DeviceMetadata(BaseModel):
     """Developer-provided metadata describing the device."""
 
+    model_config = ConfigDict(frozen=True)
+
     manufacturer: str = "OpenAI Labs"
     model: str = "ONVIF Reference NVR"
     firmware_version: str = "0.1.0"
@@ -174,52 +212,98 @@ T = TypeVar("T", bound=BaseModel)
 class ConfigManager:
     """Loads and persists configuration files with validation and atomic writes."""
 
-    def __init__(self, base_dir: Path | str = Path("config")) -> None:
+    def __init__(
+        self, base_dir: Path | str = Path("config"), *, flush_delay: float = 0.05
+    ) -> None:
         self.base_dir = Path(base_dir)
-        self.base_dir.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(self.base_dir)
         self.user_config_path = self.base_dir / "user.yaml"
         self.device_config_path = self.base_dir / "device.yaml"
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
         self._user_settings: Optional[UserSettings] = None
         self._device_metadata: Optional[DeviceMetadata] = None
+        # (st_mtime_ns, st_size) of each file as of the last load or save.
+        self._user_stat: Optional[tuple[int, int]] = None
+        self._device_stat: Optional[tuple[int, int]] = None
+        # Debounced user settings writes: the latest snapshot waits here until
+        # the flush timer fires so bursts of saves cost a single write.
+        self._flush_delay = flush_delay
+        self._pending_user: Optional[UserSettings] = None
+        # Serialized form of the last user settings written, to skip no-op flushes.
+        self._last_user_dump: Optional[dict[str, Any]] = None
+        self._flush_timer: Optional[threading.Timer] = None
         self._ensure_defaults()
 
     # Public API -----------------------------------------------------------
     def get_user_settings(self) -> UserSettings:
-        """Return validated user settings, reloading from disk if needed."""
+        """Return validated user settings, reloading only if the file changed on disk."""
 
         with self._lock:
-            if self._user_settings is None:
+            if self._pending_user is not None:
+                return self._pending_user
+            fingerprint = self._fingerprint(self.user_config_path)
+            if self._user_settings is None or fingerprint != self._user_stat:
                 self._user_settings = self._load_model(
                     self.user_config_path, UserSettings, self._default_user_settings
                 )
+                self._user_stat = self._fingerprint(self.user_config_path)
+                self._last_user_dump = None
             return self._user_settings
 
     def save_user_settings(self, settings: UserSettings) -> None:
-        """Persist user settings to disk with atomic replace."""
+        """Schedule user settings to be persisted; saves within the flush delay coalesce."""
 
         with self._lock:
-            self._write_yaml(
-                self.user_config_path, settings.model_dump(mode="json")
-            )
             self._user_settings = settings
+            self._pending_user = settings
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self._flush_delay, self.flush)
+                self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Write any pending user settings to disk immediately."""
+
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            settings, self._pending_user = self._pending_user, None
+            if settings is None:
+                return
+            data = settings.model_dump(mode="json")
+            if data != self._last_user_dump:
+                try:
+                    self._user_stat = self._write_yaml(self.user_config_path, data)
+                except OSError:
+                    # Keep the update pending so the retry, or any later flush,
+                    # still writes it. The retry timer is a daemon so a disk
+                    # that stays full cannot keep the process from exiting.
+                    logger.exception("Failed to write %s; retrying", self.user_config_path)
+                    self._pending_user = settings
+                    self._flush_timer = threading.Timer(_FLUSH_RETRY_DELAY, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                    return
+                self._last_user_dump = data
 
     def get_device_metadata(self) -> DeviceMetadata:
-        """Return validated device metadata, reloading from disk if needed."""
+        """Return validated device metadata, reloading only if the file changed on disk."""
 
         with self._lock:
-            if self._device_metadata is None:
+            fingerprint = self._fingerprint(self.device_config_path)
+            if self._device_metadata is None or fingerprint != self._device_stat:
                 self._device_metadata = self._load_model(
                     self.device_config_path, DeviceMetadata, self._default_device_metadata
                 )
+                self._device_stat = self._fingerprint(self.device_config_path)
             return self._device_metadata
 
     def save_device_metadata(self, metadata: DeviceMetadata) -> None:
         """Persist device metadata to disk with atomic replace."""
 
         with self._lock:
-            self._write_yaml(
-                self.device_config_path, metadata.model_dump(mode="json")
+            self._device_stat = self._write_yaml(
+                self.device_config_path, metadata.model_dump(mode="json"), durable=True
             )
             self._device_metadata = metadata
 
@@ -230,13 +314,11 @@ class ConfigManager:
         with self._lock:
             if not self.user_config_path.exists():
                 self._user_settings = self._default_user_settings()
-                self._write_yaml(
-                    self.user_config_path,
-                    self._user_settings.model_dump(mode="json"),
-                )
+                self._last_user_dump = self._user_settings.model_dump(mode="json")
+                self._user_stat = self._write_yaml(self.user_config_path, self._last_user_dump)
             if not self.device_config_path.exists():
                 self._device_metadata = self._default_device_metadata()
-                self._write_yaml(
+                self._device_stat = self._write_yaml(
                     self.device_config_path,
                     self._device_metadata.model_dump(mode="json"),
                 )
@@ -248,7 +330,7 @@ class ConfigManager:
                     name="Always",
                     start=time(hour=0, minute=0),
                     end=time(hour=23, minute=59),
-                    days=list(_ALLOWED_DAYS),
+                    days=list(_DEFAULT_DAYS),
                 )
             ],
             media_profiles=[
@@ -309,28 +391,53 @@ class ConfigManager:
 
     def _read_yaml(self, path: Path) -> dict[str, Any]:
         with path.open("r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
+            data = yaml.load(handle, Loader=_SafeLoader) or {}
         if not isinstance(data, dict):
             raise ValueError(f"Configuration file {path} must contain a mapping at the top level")
         return data
 
-    def _write_yaml(self, path: Path, data: dict[str, Any]) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        fd, tmp_path = tempfile.mkstemp(
-            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
-        )
+    @staticmethod
+    def _fingerprint(path: Path) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _write_yaml(
+        self, path: Path, data: dict[str, Any], *, durable: bool = False
+    ) -> Optional[tuple[int, int]]:
+        """Atomically replace ``path``; fsync before the rename only when ``durable``."""
+
+        _ensure_dir(path.parent)
+        # Writes are serialized by ``_lock``, so one fixed sidecar per file is
+        # enough and avoids mkstemp's randomized name search.
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
         try:
             with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
-                yaml.safe_dump(data, tmp_file, sort_keys=False)
-                tmp_file.flush()
-                os.fsync(tmp_file.fileno())
+                yaml.dump(
+                    data,
+                    tmp_file,
+                    Dumper=_SafeDumper,
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
+                if durable:
+                    tmp_file.flush()
+                    os.fsync(tmp_file.fileno())
             os.replace(tmp_path, path)
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return self._fingerprint(path)
 
 
 _config_manager: Optional[ConfigManager] = None
+_config_manager_lock = threading.Lock()
 
 
 def get_config_manager() -> ConfigManager:
@@ -338,5 +445,8 @@ def get_config_manager() -> ConfigManager:
 
     global _config_manager
     if _config_manager is None:
-        _config_manager = ConfigManager()
+        # Every router module calls this at import time; build the manager once.
+        with _config_manager_lock:
+            if _config_manager is None:
+                _config_manager = ConfigManager()
     return _config_manager
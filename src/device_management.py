@@ -1,8 +1,13 @@
 """Device management helpers for network and NTP configuration."""
 from __future__ import annotations
 
+import configparser
 import logging
+import os
+import re
+import threading
 from pathlib import Path
+from typing import Any, Callable, TypeVar
 
 from src.config import NetworkMode, NetworkSettings, NTPSettings, get_config_manager
 from src.system_control import apply_all, apply_hostname, apply_network, apply_ntp, _prefix_to_netmask
@@ -15,28 +20,48 @@ _RESOLV_CONF = Path("/etc/resolv.conf")
 _DHCPCD_CONF = Path("/etc/dhcpcd.conf")
 _TIMESYNCD_CONF = Path("/etc/systemd/timesyncd.conf")
 
+_NAMESERVER_RE = re.compile(r"^[ \t]*nameserver[ \t]+(\S+)", re.MULTILINE)
+_DHCPCD_RE = re.compile(
+    r"^[ \t]*(?:interface[ \t]+(?P<interface>\S+)"
+    r"|static (?P<key>ip_address|routers|domain_name_servers)=(?P<value>[^\r\n]*))",
+    re.MULTILINE,
+)
+
+T = TypeVar("T")
+
+# Parsed /etc files keyed by (path, parser) and stamped with the mtime they were read at.
+_FILE_CACHE: dict[tuple[Path, Callable[[str], Any]], tuple[int, Any]] = {}
+_FILE_CACHE_LOCK = threading.Lock()
+
+
+def _read_cached(path: Path, parser: Callable[[str], T]) -> T | None:
+    """Parse ``path`` with ``parser``, reusing the result while its mtime is unchanged."""
 
-def _read_hostname() -> str | None:
     try:
-        return _HOSTNAME_PATH.read_text(encoding="utf-8").strip()
+        stamp = os.stat(path).st_mtime_ns
     except OSError:
         return None
-
-
-def _read_dns_servers() -> list[str]:
-    if not _RESOLV_CONF.exists():
-        return []
-    servers: list[str] = []
+    key = (path, parser)
+    with _FILE_CACHE_LOCK:
+        cached = _FILE_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
     try:
-        for line in _RESOLV_CONF.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if line.startswith("nameserver"):
-                parts = line.split()
-                if len(parts) >= 2:
-                    servers.append(parts[1])
+        content = path.read_text(encoding="utf-8")
     except OSError:
-        return []
-    return servers
+        return None
+    value = parser(content)
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE[key] = (stamp, value)
+    return value
+
+
+def _parse_hostname(content: str) -> str:
+    return content.strip()
+
+
+def _parse_dns_servers(content: str) -> tuple[str, ...]:
+    return tuple(_NAMESERVER_RE.findall(content))
 
 
 def _parse_static_ip(entry: str) -> tuple[str, str] | tuple[None, None]:
@@ -49,57 +74,65 @@ def _parse_static_ip(entry: str) -> tuple[str, str] | tuple[None, None]:
         return None, None
 
 
-def _read_dhcpcd(interface: str) -> dict[str, str | list[str] | NetworkMode]:
-    if not _DHCPCD_CONF.exists():
-        return {}
+def _parse_dhcpcd(content: str) -> dict[str, dict[str, str | list[str] | NetworkMode]]:
+    """Collect static overrides for every interface block in dhcpcd.conf."""
+
+    interfaces: dict[str, dict[str, str | list[str] | NetworkMode]] = {}
+    parsed: dict[str, str | list[str] | NetworkMode] | None = None
 
-    active = False
-    parsed: dict[str, str | list[str] | NetworkMode] = {}
+    for match in _DHCPCD_RE.finditer(content):
+        name = match.group("interface")
+        if name is not None:
+            parsed = interfaces.setdefault(name, {})
+            continue
+        if parsed is None:
+            continue
 
+        key = match.group("key")
+        value = match.group("value").strip()
+        if key == "ip_address":
+            ip, netmask = _parse_static_ip(value)
+            if ip:
+                parsed["mode"] = NetworkMode.static
+                parsed["static_ip"] = ip
+            if netmask:
+                parsed["subnet_mask"] = netmask
+        elif key == "routers":
+            parsed["gateway"] = value
+        else:
+            parsed["dns_servers"] = value.split()
+
+    return interfaces
+
+
+def _parse_ntp_servers(content: str) -> tuple[str, ...]:
+    """Read ``NTP=`` from the ``[Time]`` section of timesyncd.conf."""
+
+    parser = configparser.RawConfigParser(strict=False)
     try:
-        for line in _DHCPCD_CONF.read_text(encoding="utf-8").splitlines():
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#"):
-                continue
-            if stripped.startswith("interface "):
-                active = stripped.split()[1] == interface
-                continue
-            if not active:
-                continue
-
-            if stripped.startswith("static ip_address="):
-                address = stripped.split("=", 1)[1]
-                ip, netmask = _parse_static_ip(address)
-                if ip:
-                    parsed["mode"] = NetworkMode.static
-                    parsed["static_ip"] = ip
-                if netmask:
-                    parsed["subnet_mask"] = netmask
-            elif stripped.startswith("static routers="):
-                parsed["gateway"] = stripped.split("=", 1)[1]
-            elif stripped.startswith("static domain_name_servers="):
-                dns = stripped.split("=", 1)[1]
-                parsed["dns_servers"] = dns.split()
-    except OSError:
-        return {}
+        parser.read_string(content)
+    except configparser.Error:
+        logger.warning("Unable to parse %s", _TIMESYNCD_CONF)
+        return ()
+    return tuple(parser.get("Time", "NTP", fallback="").split())
 
-    return parsed
+
+def _read_hostname() -> str | None:
+    return _read_cached(_HOSTNAME_PATH, _parse_hostname)
+
+
+def _read_dns_servers() -> list[str]:
+    return list(_read_cached(_RESOLV_CONF, _parse_dns_servers) or ())
+
+
+def _read_dhcpcd(interface: str) -> dict[str, str | list[str] | NetworkMode]:
+    interfaces = _read_cached(_DHCPCD_CONF, _parse_dhcpcd) or {}
+    return dict(interfaces.get(interface, {}))
 
 
 def _read_ntp_config() -> tuple[bool, list[str]]:
     enabled = True
-    servers: list[str] = []
-
-    if _TIMESYNCD_CONF.exists():
-        try:
-            for line in _TIMESYNCD_CONF.read_text(encoding="utf-8").splitlines():
-                stripped = line.strip()
-                if stripped.startswith("NTP="):
-                    values = stripped.split("=", 1)[1]
-                    servers.extend([entry for entry in values.split() if entry])
-        except OSError:
-            pass
-
+    servers = list(_read_cached(_TIMESYNCD_CONF, _parse_ntp_servers) or ())
     return enabled, servers
 
 
@@ -131,22 +164,57 @@ def _merge_ntp_settings(base: NTPSettings) -> NTPSettings:
     return NTPSettings(enabled=enabled if enabled is not None else base.enabled, servers=merged_servers)
 
 
+# Merged settings stamped with the objects they were built from. The stored
+# settings and the parsed /etc files are reused until they change, so an
+# identity match means the merge would produce the same result.
+_MERGED_NETWORK: tuple[tuple[object, ...], NetworkSettings | None] = ((), None)
+_MERGED_NTP: tuple[tuple[object, ...], NTPSettings | None] = ((), None)
+
+
+def _same_sources(cached: tuple[object, ...], current: tuple[object, ...]) -> bool:
+    return len(cached) == len(current) and all(a is b for a, b in zip(cached, current))
+
+
 def get_network_settings() -> NetworkSettings:
+    """Return the effective network settings.
+
+    The result is shared between callers until its inputs change; copy it
+    before modifying.
+    """
+
+    global _MERGED_NETWORK
     config = get_config_manager()
     base = config.get_user_settings().network
-    return _merge_network_settings(base)
+    sources = (
+        base,
+        _read_cached(_DHCPCD_CONF, _parse_dhcpcd),
+        _read_cached(_HOSTNAME_PATH, _parse_hostname),
+        _read_cached(_RESOLV_CONF, _parse_dns_servers),
+    )
+    cached_sources, merged = _MERGED_NETWORK
+    if merged is None or not _same_sources(cached_sources, sources):
+        merged = _merge_network_settings(base)
+        _MERGED_NETWORK = (sources, merged)
+    return merged
 
 
 def get_ntp_settings() -> NTPSettings:
+    """Return the effective NTP settings; shared like :func:`get_network_settings`."""
+
+    global _MERGED_NTP
     config = get_config_manager()
     base = config.get_user_settings().ntp
-    return _merge_ntp_settings(base)
+    sources = (base, _read_cached(_TIMESYNCD_CONF, _parse_ntp_servers))
+    cached_sources, merged = _MERGED_NTP
+    if merged is None or not _same_sources(cached_sources, sources):
+        merged = _merge_ntp_settings(base)
+        _MERGED_NTP = (sources, merged)
+    return merged
 
 
 def set_network_settings(settings: NetworkSettings) -> NetworkSettings:
     config = get_config_manager()
-    user_settings = config.get_user_settings()
-    user_settings.network = settings
+    user_settings = config.get_user_settings().model_copy(update={"network": settings})
     config.save_user_settings(user_settings)
     apply_network(settings)
     apply_hostname(settings.hostname)
@@ -155,8 +223,7 @@ def set_network_settings(settings: NetworkSettings) -> NetworkSettings:
 
 def set_ntp_settings(settings: NTPSettings) -> NTPSettings:
     config = get_config_manager()
-    user_settings = config.get_user_settings()
-    user_settings.ntp = settings
+    user_settings = config.get_user_settings().model_copy(update={"ntp": settings})
     config.save_user_settings(user_settings)
     apply_ntp(settings)
     return settings
@@ -165,8 +232,8 @@ def set_ntp_settings(settings: NTPSettings) -> NTPSettings:
 def set_hostname(hostname: str) -> str:
     config = get_config_manager()
     user_settings = config.get_user_settings()
-    user_settings.network.hostname = hostname
-    config.save_user_settings(user_settings)
+    network = user_settings.network.model_copy(update={"hostname": hostname})
+    config.save_user_settings(user_settings.model_copy(update={"network": network}))
     apply_hostname(hostname)
     return hostname
 
@@ -2,11 +2,67 @@
 
 import socket
 import threading
+import time
 import uuid
-from datetime import datetime
 
 WS_DISCOVERY_MULTICAST_GROUP = ("239.255.255.250", 3702)
 
+_PROBE_MATCH_TEMPLATE = """
+        <s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" xmlns:a="http://schemas.xmlsoap.org/ws/2004/08/addressing" xmlns:d="http://schemas.xmlsoap.org/ws/2005/04/discovery">
+          <s:Header>
+            <a:MessageID>uuid:{message_id}</a:MessageID>
+            <a:RelatesTo>{relates_to}</a:RelatesTo>
+            <a:To>urn:schemas-xmlsoap-org:ws:2005:04:discovery</a:To>
+            <a:Action>http://schemas.xmlsoap.org/ws/2005/04/discovery/ProbeMatches</a:Action>
+          </s:Header>
+          <s:Body>
+            <d:ProbeMatches>
+              <d:ProbeMatch>
+                <a:EndpointReference>
+                  <a:Address>urn:uuid:{endpoint}</a:Address>
+                </a:EndpointReference>
+                <d:Types>dn:NetworkVideoTransmitter</d:Types>
+                <d:Scopes>onvif://www.onvif.org/type/video_encoder</d:Scopes>
+                <d:XAddrs>{service_address}</d:XAddrs>
+                <d:MetadataVersion>{metadata_version}</d:MetadataVersion>
+              </d:ProbeMatch>
+            </d:ProbeMatches>
+          </s:Body>
+        </s:Envelope>
+        """
+
+_RECV_BUFFER_SIZE = 4096
+_SLOT = "\0"
+
+
+def _compile_probe_match_template(
+    service_address: str, endpoint: uuid.UUID
+) -> tuple[bytes, bytes, bytes, bytes]:
+    """Encode the constant parts of the ProbeMatch envelope around its three per-probe slots."""
+
+    rendered = _PROBE_MATCH_TEMPLATE.format(
+        message_id=_SLOT,
+        relates_to=_SLOT,
+        endpoint=endpoint,
+        service_address=service_address,
+        metadata_version=_SLOT,
+    )
+    head, after_message_id, after_relates_to, tail = rendered.encode().split(_SLOT.encode())
+    return head, after_message_id, after_relates_to, tail
+
+
+def _probe_message_id(datagram: bytes | bytearray, length: int) -> bytes | None:
+    """Return the MessageID of a received Probe so the match can echo it in RelatesTo."""
+
+    tag = datagram.find(b"MessageID", 0, length)
+    if tag == -1:
+        return None
+    start = datagram.find(b">", tag, length) + 1
+    end = datagram.find(b"<", start, length)
+    if start == 0 or end == -1:
+        return None
+    return bytes(datagram[start:end]).strip() or None
+
 
 class WSDiscoveryResponder:
     """
@@ -19,6 +75,10 @@ class WSDiscoveryResponder:
         self.service_address = service_address
         self.running = False
         self._thread: threading.Thread | None = None
+        # The endpoint reference identifies this device, so it stays fixed for the
+        # responder's lifetime and the envelope around it is encoded only once.
+        self._endpoint = uuid.uuid4()
+        self._template = _compile_probe_match_template(service_address, self._endpoint)
 
     def start(self) -> None:
         if self.running:
@@ -41,46 +101,35 @@ class WSDiscoveryResponder:
             mreq = socket.inet_aton(WS_DISCOVERY_MULTICAST_GROUP[0]) + socket.inet_aton("0.0.0.0")
             sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
 
+            # One receive buffer for the responder's lifetime; recvmsg_into fills
+            # it in place instead of allocating a bytes object per datagram.
+            buffer = bytearray(_RECV_BUFFER_SIZE)
+            view = memoryview(buffer)
             while self.running:
                 try:
-                    data, addr = sock.recvfrom(4096)
+                    nbytes, _, _, addr = sock.recvmsg_into([view])
                 except OSError:
                     break
 
-                if b"Probe" not in data:
+                if buffer.find(b"Probe", 0, nbytes) == -1:
                     continue
 
-                response = self._build_probe_match_response()
+                response = self._build_probe_match_response(_probe_message_id(buffer, nbytes))
                 try:
                     sock.sendto(response, addr)
                 except OSError:
                     continue
 
-    def _build_probe_match_response(self) -> bytes:
-        message_id = f"uuid:{uuid.uuid4()}"
-        relates_to = f"uuid:{uuid.uuid4()}"
-        body = f"""
-        <s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" xmlns:a="http://schemas.xmlsoap.org/ws/2004/08/addressing" xmlns:d="http://schemas.xmlsoap.org/ws/2005/04/discovery">
-          <s:Header>
-            <a:MessageID>{message_id}</a:MessageID>
-            <a:RelatesTo>{relates_to}</a:RelatesTo>
-            <a:To>urn:schemas-xmlsoap-org:ws:2005:04:discovery</a:To>
-            <a:Action>http://schemas.xmlsoap.org/ws/2005/04/discovery/ProbeMatches</a:Action>
-          </s:Header>
-          <s:Body>
-            <d:ProbeMatches>
-              <d:ProbeMatch>
-                <a:EndpointReference>
-                  <a:Address>urn:uuid:{uuid.uuid4()}</a:Address>
-                </a:EndpointReference>
-                <d:Types>dn:NetworkVideoTransmitter</d:Types>
-                <d:Scopes>onvif://www.onvif.org/type/video_encoder</d:Scopes>
-                <d:XAddrs>{self.service_address}</d:XAddrs>
-                <d:MetadataVersion>{int(datetime.utcnow().timestamp())}</d:MetadataVersion>
-              </d:ProbeMatch>
-            </d:ProbeMatches>
-          </s:Body>
-        </s:Envelope>
-        """
-        return body.encode()
-
+    def _build_probe_match_response(self, relates_to: bytes | None = None) -> bytes:
+        head, after_message_id, after_relates_to, tail = self._template
+        return b"".join(
+            (
+                head,
+                str(uuid.uuid4()).encode(),
+                after_message_id,
+                relates_to or f"uuid:{uuid.uuid4()}".encode(),
+                after_relates_to,
+                str(int(time.time())).encode(),
+                tail,
+            )
+        )
@@ -0,0 +1,164 @@
+"""Shared persistence helpers for the JSON-backed subscription and recording stores."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+import yaml
+
+logger = logging.getLogger(__name__)
+
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+# Seconds before a flush that failed to write is retried.
+_FLUSH_RETRY_DELAY = 1.0
+
+
+def _isoformat(value: datetime) -> str:
+    """Serialize a timestamp as UTC ISO-8601, memoized across persists and payloads."""
+
+    # Aware datetimes compare equal across offsets, so key the cache on the
+    # naive wall-clock value that is actually rendered.
+    return _utc_isoformat(value.replace(tzinfo=None))
+
+
+@functools.lru_cache(maxsize=4096)
+def _utc_isoformat(value: datetime) -> str:
+    return value.replace(tzinfo=timezone.utc).isoformat()
+
+
+def _fsync_directory(path: Path) -> None:
+    """Make a rename inside ``path`` durable; a no-op where directories can't be opened."""
+
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_store(path: str, inode: int, mtime_ns: int, size: int) -> dict[str, Any]:
+    """Parse a JSON store file; the stat fields only key the cache.
+
+    Stores are always rewritten through os.replace, so every write gets a
+    new inode even when mtime granularity or size would not tell the
+    versions apart. The returned payload is shared between callers and must
+    not be mutated.
+    """
+
+    return orjson.loads(Path(path).read_bytes()) or {}
+
+
+class _DebouncedJsonStore:
+    """Base for stores kept in memory and persisted as one JSON file.
+
+    Subclasses hold their state under ``_lock``, call ``_persist()`` after each
+    mutation and implement ``_snapshot()``; writes are coalesced by a timer.
+    Nothing is flushed at interpreter exit unless the owner arranges it: the
+    module singletons register their flush with atexit, other callers close().
+    """
+
+    def __init__(self, storage_path: Path | str, *, flush_delay: float) -> None:
+        self.storage_path = Path(storage_path)
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        # Mutations only mark the store dirty; the flush timer writes one
+        # snapshot per burst instead of one per call.
+        self._flush_delay = flush_delay
+        self._flush_timer: Optional[threading.Timer] = None
+        # Digest of the last snapshot written, to skip no-op flushes.
+        self._last_digest: Optional[bytes] = None
+
+    def _snapshot(self) -> bytes:
+        raise NotImplementedError
+
+    def _read_payload(self) -> Optional[dict[str, Any]]:
+        try:
+            stat = os.stat(self.storage_path)
+        except FileNotFoundError:
+            pass
+        else:
+            return _parse_store(
+                str(self.storage_path), stat.st_ino, stat.st_mtime_ns, stat.st_size
+            )
+        legacy_path = self.storage_path.with_suffix(".yaml")
+        if legacy_path == self.storage_path or not legacy_path.exists():
+            return None
+        # One-time migration from the YAML format used by earlier releases.
+        with legacy_path.open("r", encoding="utf-8") as handle:
+            payload = yaml.safe_load(handle) or {}
+        self._persist()
+        return payload
+
+    def _persist(self) -> None:
+        """Schedule a write; mutations within the flush delay coalesce."""
+
+        self._schedule_flush(self._flush_delay)
+
+    def _schedule_flush(self, delay: float) -> None:
+        with self._lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Write any pending changes to disk immediately."""
+
+        # The snapshot is taken under the state lock, but the write and fsync
+        # happen outside it so mutators never wait on the disk. _write_lock
+        # keeps concurrent flushes from landing out of order.
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is None:
+                    return
+                self._flush_timer.cancel()
+                self._flush_timer = None
+                data = self._snapshot()
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest == self._last_digest:
+                return
+            try:
+                self._write(data)
+            except OSError:
+                # Leave the store dirty so the retry, or a later flush or
+                # close(), still writes this state.
+                logger.exception("Failed to write %s; retrying", self.storage_path)
+                self._schedule_flush(_FLUSH_RETRY_DELAY)
+                return
+            self._last_digest = digest
+
+    def close(self) -> None:
+        """Flush pending changes before the store is discarded."""
+
+        self.flush()
+
+    def _write(self, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.storage_path.parent, prefix=f".{self.storage_path.stem}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, self.storage_path)
+            _fsync_directory(self.storage_path.parent)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
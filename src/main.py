@@ -5,9 +5,15 @@ import os
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from src.config import get_config_manager
 from src.discovery import WSDiscoveryResponder
+from src.notifications import get_notification_manager
+from src.recordings import get_recording_store
 from src.routers import device, events, media, ptz, recording, system, users
 from src import soap
 
@@ -20,6 +26,11 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     service_port = int(os.getenv("SERVICE_PORT", "8000"))
     discovery_address = f"http://{service_host}:{service_port}/"
 
+    # Parse the YAML settings before the first request instead of during it.
+    config_manager = get_config_manager()
+    config_manager.get_user_settings()
+    config_manager.get_device_metadata()
+
     responder = WSDiscoveryResponder(discovery_address)
     logger.info("Starting WS-Discovery responder on %s", discovery_address)
     responder.start()
@@ -28,10 +39,28 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     finally:
         logger.info("Stopping WS-Discovery responder")
         responder.stop()
+        config_manager.flush()
+        get_notification_manager().flush()
+        get_recording_store().flush()
+
+
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
+    """Render HTTP errors with orjson, like every other JSON response the app sends."""
+
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=headers)
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="ONVIF Reference NVR", lifespan=lifespan)
+    app = FastAPI(
+        title="ONVIF Reference NVR",
+        lifespan=lifespan,
+        # Handlers that return dicts or models are encoded with orjson.
+        default_response_class=ORJSONResponse,
+        exception_handlers={StarletteHTTPException: http_exception_handler},
+    )
     app.include_router(device.router)
     app.include_router(media.router)
     app.include_router(events.router)
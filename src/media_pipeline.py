@@ -9,7 +9,7 @@ import socket
 import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict
 
 from src.config import ConfigManager, MediaProfileSettings, MediaSourceType
 
@@ -19,6 +19,19 @@ _PLACEHOLDER_PNG = base64.b64decode(
     "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGMAAQAABQABDQottAAAAABJRU5ErkJggg=="
 )
 
+_SOURCE_BUILDERS: Dict[MediaSourceType, Callable[[MediaProfileSettings], str]] = {
+    MediaSourceType.camera: lambda profile: "libcamerasrc",
+    MediaSourceType.testscreen: lambda profile: "videotestsrc is-live=true pattern=smpte",
+    MediaSourceType.bouncing_ball: lambda profile: "videotestsrc is-live=true pattern=ball",
+    MediaSourceType.image: lambda profile: (
+        f"filesrc location={profile.source_location or 'image.png'} ! decodebin ! imagefreeze"
+    ),
+    MediaSourceType.mpeg: lambda profile: (
+        f"filesrc location={profile.source_location or 'video.mp4'} ! decodebin ! videoconvert"
+    ),
+}
+
+
 @dataclass
 class LightweightRTSPServer:
     """Represents the minimal RTSP endpoint used by ONVIF clients."""
@@ -41,6 +54,13 @@ class MediaPipelineInstance:
     running: bool = field(default=False, init=False)
     last_pipeline: str = field(default="", init=False)
     _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _cached_pipeline: str | None = field(default=None, init=False, repr=False)
+    _cached_preview: str | None = field(default=None, init=False, repr=False)
+    _snapshot_file: Path = field(init=False, repr=False)
+    _snapshot_ready: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._snapshot_file = self.snapshot_dir / f"{self.profile.token}.png"
 
     @property
     def rtsp_uri(self) -> str:
@@ -48,11 +68,38 @@ class MediaPipelineInstance:
 
     @property
     def snapshot_path(self) -> Path:
-        path = self.snapshot_dir / f"{self.profile.token}.png"
-        if not path.exists():
-            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
-            path.write_bytes(_PLACEHOLDER_PNG)
-        return path
+        if not self._snapshot_ready:
+            if not self._snapshot_file.exists():
+                self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+                self._snapshot_file.write_bytes(_PLACEHOLDER_PNG)
+            self._snapshot_ready = True
+        return self._snapshot_file
+
+    @property
+    def pipeline(self) -> str:
+        """GStreamer pipeline for the current profile, built once per profile revision."""
+
+        if self._cached_pipeline is None:
+            self._cached_pipeline = self._build_gstreamer_pipeline()
+        return self._cached_pipeline
+
+    @property
+    def preview(self) -> str:
+        """Short pipeline summary shown before the pipeline has been launched."""
+
+        if self._cached_preview is None:
+            self._cached_preview = self._build_preview()
+        return self._cached_preview
+
+    def update_profile(self, profile: MediaProfileSettings) -> None:
+        """Swap in new profile settings and drop the strings derived from the old ones."""
+
+        if profile.token != self.profile.token:
+            self._snapshot_file = self.snapshot_dir / f"{profile.token}.png"
+            self._snapshot_ready = False
+        self.profile = profile
+        self._cached_pipeline = None
+        self._cached_preview = None
 
     def ensure_running(self) -> None:
         """Start the backing pipeline if it isn't already active."""
@@ -61,7 +108,7 @@ class MediaPipelineInstance:
             if self.running:
                 return
 
-            self.last_pipeline = self._build_gstreamer_pipeline()
+            self.last_pipeline = self.pipeline
             self.running = True
             logger.info(
                 "Launching media pipeline for %s with RTSP URI %s", self.profile.token, self.rtsp_uri
@@ -85,26 +132,17 @@ class MediaPipelineInstance:
             "rtph264pay name=pay0 pt=96"
         )
 
+    def _build_preview(self) -> str:
+        source_preview = self.profile.source_type.value
+        location = f" ({self.profile.source_location})" if self.profile.source_location else ""
+        return (
+            f"{source_preview}{location} ! video/x-raw,width={self.profile.width},"
+            f"height={self.profile.height},framerate={self.profile.framerate}/1 ! overlays ..."
+        )
+
     def _build_source(self) -> str:
-        if self.profile.source_type == MediaSourceType.camera:
-            return "libcamerasrc"
-        if self.profile.source_type == MediaSourceType.testscreen:
-            return "videotestsrc is-live=true pattern=smpte"
-        if self.profile.source_type == MediaSourceType.bouncing_ball:
-            return "videotestsrc is-live=true pattern=ball"
-        if self.profile.source_type == MediaSourceType.image:
-            location = self.profile.source_location or "image.png"
-            return f"filesrc location={location} ! decodebin ! imagefreeze"
-        if self.profile.source_type == MediaSourceType.mpeg:
-            location = self.profile.source_location or "video.mp4"
-            return " ".join(
-                [
-                    f"filesrc location={location}",
-                    "! decodebin",
-                    "! videoconvert",
-                ]
-            )
-        return "videotestsrc is-live=true"
+        builder = _SOURCE_BUILDERS.get(self.profile.source_type)
+        return builder(self.profile) if builder else "videotestsrc is-live=true"
 
     def _build_overlays(self) -> str:
         return " ".join(
@@ -133,31 +171,28 @@ class MediaPipelineManager:
         user_settings = self._config_manager.get_user_settings()
         host = rtsp_host or os.getenv("RTSP_HOST", os.getenv("SERVICE_HOST", "0.0.0.0"))
         port = int(rtsp_port or os.getenv("RTSP_PORT", "8554"))
-        snapshot_dir = Path(os.getenv("SNAPSHOT_DIR", self._config_manager.base_dir / "snapshots"))
+        self._snapshot_dir = Path(
+            os.getenv("SNAPSHOT_DIR", self._config_manager.base_dir / "snapshots")
+        )
         self._rtsp_server = LightweightRTSPServer(host=host, port=port)
         self._hostname = os.getenv("DEVICE_HOSTNAME", socket.gethostname())
-        self._pipelines: Dict[str, MediaPipelineInstance] = {}
         profiles = list(user_settings.media_profiles or self._default_profiles())
         if not user_settings.media_profiles:
-            user_settings.media_profiles = profiles
-            self._config_manager.save_user_settings(user_settings)
-
-        for profile in profiles:
-            self._pipelines[profile.token] = MediaPipelineInstance(
-                profile=profile,
-                rtsp_server=self._rtsp_server,
-                snapshot_dir=snapshot_dir,
-                hostname=self._hostname,
+            self._config_manager.save_user_settings(
+                user_settings.model_copy(update={"media_profiles": profiles})
             )
 
+        # Pipelines are created on first use; profiles keep the configured order.
+        self._profiles: Dict[str, MediaProfileSettings] = {
+            profile.token: profile for profile in profiles
+        }
+        self._pipelines: Dict[str, MediaPipelineInstance] = {}
+
     def list_profiles(self) -> list[dict[str, str | int]]:
-        return [self._serialize(pipeline) for pipeline in self._pipelines.values()]
+        return [self._serialize(self._get_pipeline(token)) for token in self._profiles]
 
     def get_stream_uri(self, profile_token: str) -> str:
-        pipeline = self._pipelines.get(profile_token)
-        if pipeline is None:
-            raise KeyError(f"Unknown profile token {profile_token}")
-
+        pipeline = self._get_pipeline(profile_token)
         pipeline.ensure_running()
         return pipeline.rtsp_uri
 
@@ -174,10 +209,7 @@ class MediaPipelineManager:
     ) -> dict[str, str | int]:
         """Update runtime encoder parameters and persist them to disk."""
 
-        pipeline = self._pipelines.get(profile_token)
-        if pipeline is None:
-            raise KeyError(f"Unknown profile token {profile_token}")
-
+        pipeline = self._get_pipeline(profile_token)
         updated_profile = pipeline.profile.model_copy(
             update={
                 k: v
@@ -192,13 +224,33 @@ class MediaPipelineManager:
                 if v is not None
             }
         )
-        pipeline.profile = updated_profile
+        pipeline.update_profile(updated_profile)
+        self._profiles[profile_token] = updated_profile
         self._persist_profiles()
         return self._serialize(pipeline)
 
+    def _get_pipeline(self, profile_token: str) -> MediaPipelineInstance:
+        pipeline = self._pipelines.get(profile_token)
+        if pipeline is not None:
+            return pipeline
+
+        profile = self._profiles.get(profile_token)
+        if profile is None:
+            raise KeyError(f"Unknown profile token {profile_token}")
+        return self._pipelines.setdefault(
+            profile_token,
+            MediaPipelineInstance(
+                profile=profile,
+                rtsp_server=self._rtsp_server,
+                snapshot_dir=self._snapshot_dir,
+                hostname=self._hostname,
+            ),
+        )
+
     def _persist_profiles(self) -> None:
-        settings = self._config_manager.get_user_settings()
-        settings.media_profiles = [pipeline.profile for pipeline in self._pipelines.values()]
+        settings = self._config_manager.get_user_settings().model_copy(
+            update={"media_profiles": list(self._profiles.values())}
+        )
         self._config_manager.save_user_settings(settings)
 
     def _serialize(self, pipeline: MediaPipelineInstance) -> dict[str, str | int]:
@@ -212,19 +264,9 @@ class MediaPipelineManager:
             "framerate": pipeline.profile.framerate,
             "source_type": pipeline.profile.source_type.value,
             "source_location": pipeline.profile.source_location,
-            "pipeline": pipeline.last_pipeline or self._pipeline_preview(pipeline),
+            "pipeline": pipeline.last_pipeline or pipeline.preview,
         }
 
-    def _pipeline_preview(self, pipeline: MediaPipelineInstance) -> str:
-        source_preview = pipeline.profile.source_type.value
-        location = (
-            f" ({pipeline.profile.source_location})" if pipeline.profile.source_location else ""
-        )
-        return (
-            f"{source_preview}{location} ! video/x-raw,width={pipeline.profile.width},"
-            f"height={pipeline.profile.height},framerate={pipeline.profile.framerate}/1 ! overlays ..."
-        )
-
     def _default_profiles(self) -> list[MediaProfileSettings]:
         return [
             MediaProfileSettings(
@@ -1,16 +1,33 @@
 """Subscription and notification manager for ONVIF pull-point delivery."""
 from __future__ import annotations
 
-import os
-import tempfile
+import atexit
+import heapq
+import itertools
+import re
+import secrets
 import threading
-import uuid
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Iterable, Optional
 
-import yaml
+import orjson
+
+from src.json_store import _JSON_OPTIONS, _DebouncedJsonStore, _isoformat
+# Below this many distinct filter lengths, probing the index directly is
+# cheaper than running the combined filter regex first.
+_FILTER_REGEX_MIN_LENGTHS = 4
+
+
+def _parse_time(value: str | None) -> datetime:
+    if value is None:
+        return datetime.now(timezone.utc)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
 
 
 @dataclass
@@ -21,12 +38,26 @@ class NotificationRecord:
     message: dict[str, str]
     utc_time: datetime
     sequence: int
+    _cached_dict: Optional[dict[str, object]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def to_dict(self) -> dict[str, object]:
+        # Records are never modified after creation, so the persisted form is built once.
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "topic": self.topic,
+                "message": self.message,
+                "utc_time": _isoformat(self.utc_time),
+                "sequence": self.sequence,
+            }
+        return self._cached_dict
 
     def as_payload(self) -> dict[str, object]:
         return {
             "Topic": self.topic,
             "Message": self.message,
-            "UtcTime": self.utc_time.replace(tzinfo=timezone.utc).isoformat(),
+            "UtcTime": _isoformat(self.utc_time),
             "Sequence": self.sequence,
         }
 
@@ -39,65 +70,87 @@ class SubscriptionState:
     termination_time: datetime
     topics: set[str] = field(default_factory=set)
     sequence: int = 0
-    queue: list[NotificationRecord] = field(default_factory=list)
+    queue: deque[NotificationRecord] = field(default_factory=deque)
+    _cached_dict: Optional[dict[str, object]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Guards queue, sequence and termination_time so deliveries to different
+    # subscriptions don't contend on the manager lock.
+    _lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False, compare=False
+    )
+
+    def mark_dirty(self) -> None:
+        """Drop the cached persisted form after the state has been modified."""
+
+        self._cached_dict = None
 
     def to_dict(self) -> dict[str, object]:
-        return {
-            "token": self.token,
-            "termination_time": self.termination_time.replace(tzinfo=timezone.utc).isoformat(),
-            "topics": sorted(self.topics),
-            "sequence": self.sequence,
-            "queue": [
-                {
-                    "topic": record.topic,
-                    "message": record.message,
-                    "utc_time": record.utc_time.replace(tzinfo=timezone.utc).isoformat(),
-                    "sequence": record.sequence,
+        with self._lock:
+            if self._cached_dict is None:
+                self._cached_dict = {
+                    "token": self.token,
+                    "termination_time": _isoformat(self.termination_time),
+                    "topics": sorted(self.topics),
+                    "sequence": self.sequence,
+                    "queue": [record.to_dict() for record in self.queue],
                 }
-                for record in self.queue
-            ],
-        }
+            return self._cached_dict
 
     @classmethod
     def from_dict(cls, payload: dict[str, object]) -> "SubscriptionState":
         return cls(
             token=str(payload.get("token", "")),
-            termination_time=datetime.fromisoformat(str(payload.get("termination_time"))).replace(
-                tzinfo=timezone.utc
-            ),
+            termination_time=_parse_time(str(payload.get("termination_time"))),
             topics=set(payload.get("topics", []) or []),
             sequence=int(payload.get("sequence", 0)),
-            queue=[
+            queue=deque(
                 NotificationRecord(
                     topic=entry.get("topic", ""),
-                    message=entry.get("message", {}),
-                    utc_time=datetime.fromisoformat(entry.get("utc_time", datetime.utcnow().isoformat())),
+                    message=dict(entry.get("message", {})),
+                    utc_time=_parse_time(entry.get("utc_time")),
                     sequence=int(entry.get("sequence", 0)),
                 )
                 for entry in payload.get("queue", [])
                 if isinstance(entry, dict)
-            ],
+            ),
         )
 
 
-class BaseNotificationManager:
+class BaseNotificationManager(_DebouncedJsonStore):
     """Manages subscriptions and notification delivery with persistence."""
 
-    def __init__(self, storage_path: Path | str = Path("config/subscriptions.yaml")) -> None:
-        self.storage_path = Path(storage_path)
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.RLock()
+    def __init__(
+        self,
+        storage_path: Path | str = Path("config/subscriptions.json"),
+        *,
+        flush_delay: float = 0.1,
+    ) -> None:
+        # _lock protects the subscription map, topic index and flush timer. It may
+        # be held while taking a subscription's own lock, never the other way round.
+        super().__init__(storage_path, flush_delay=flush_delay)
         self._subscriptions: dict[str, SubscriptionState] = {}
         self._default_token: str | None = None
+        # Topic filter -> tokens of subscriptions using it, plus the lengths of
+        # all registered filters, so a topic is matched by probing one prefix
+        # per distinct filter length instead of scanning every subscription.
+        self._topic_index: dict[str, set[str]] = {}
+        self._filter_lengths: Counter[int] = Counter()
+        self._unfiltered: set[str] = set()
+        # Alternation of every registered filter, compiled lazily, used to
+        # reject topics no filter matches with a single C-level scan.
+        self._filter_pattern: Optional[re.Pattern[str]] = None
+        # (termination_time, token) min-heap so expiry checks only look at the
+        # soonest deadline. Entries left behind by renew or unsubscribe are
+        # discarded lazily when they reach the top.
+        self._expiry_heap: list[tuple[datetime, str]] = []
         self._load()
 
     # Persistence -----------------------------------------------------
     def _load(self) -> None:
-        if not self.storage_path.exists():
+        payload = self._read_payload()
+        if payload is None:
             return
-        with self.storage_path.open("r", encoding="utf-8") as handle:
-            payload = yaml.safe_load(handle) or {}
-        subs = {}
         now = datetime.now(timezone.utc)
         for token, entry in payload.get("subscriptions", {}).items():
             try:
@@ -106,41 +159,37 @@ class BaseNotificationManager:
                 continue
             if state.termination_time < now:
                 continue
-            subs[token] = state
-        self._subscriptions = subs
-        self._default_token = payload.get("default_token") if subs else None
+            self._add_subscription(token, state)
+        self._default_token = payload.get("default_token") if self._subscriptions else None
 
-    def _persist(self) -> None:
+    def _snapshot(self) -> bytes:
         payload = {
             "default_token": self._default_token,
             "subscriptions": {token: sub.to_dict() for token, sub in self._subscriptions.items()},
         }
-        fd, tmp_path = tempfile.mkstemp(
-            dir=self.storage_path.parent, prefix=".subscriptions.", suffix=".tmp"
-        )
-        try:
-            with os.fdopen(fd, "w", encoding="utf-8") as handle:
-                yaml.safe_dump(payload, handle, sort_keys=True)
-                handle.flush()
-                os.fsync(handle.fileno())
-            os.replace(tmp_path, self.storage_path)
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        return orjson.dumps(payload, option=_JSON_OPTIONS)
 
     # Helpers ---------------------------------------------------------
-    def _cleanup_expired(self) -> None:
-        now = datetime.now(timezone.utc)
-        expired = [token for token, sub in self._subscriptions.items() if sub.termination_time < now]
-        for token in expired:
-            self._subscriptions.pop(token, None)
+    def _cleanup_expired(self, now: Optional[datetime] = None) -> None:
+        now = now or datetime.now(timezone.utc)
+        heap = self._expiry_heap
+        expired = []
+        while heap and heap[0][0] < now:
+            _, token = heapq.heappop(heap)
+            subscription = self._subscriptions.get(token)
+            if subscription is not None and subscription.termination_time < now:
+                expired.append(token)
+                self._remove_subscription(token)
         if self._default_token in expired:
             self._default_token = next(iter(self._subscriptions), None)
         if expired:
             self._persist()
 
-    def _ensure_subscription(self, token: Optional[str]) -> SubscriptionState:
-        self._cleanup_expired()
+    def _ensure_subscription(
+        self, token: Optional[str], now: Optional[datetime] = None
+    ) -> SubscriptionState:
+        now = now or datetime.now(timezone.utc)
+        self._cleanup_expired(now)
         if token:
             if token not in self._subscriptions:
                 raise ValueError(f"Subscription {token} not found")
@@ -148,31 +197,68 @@ class BaseNotificationManager:
         if self._default_token and self._default_token in self._subscriptions:
             return self._subscriptions[self._default_token]
         # Auto-create a default subscription if none exist
-        return self.create_subscription()
+        return self.create_subscription(now=now)
 
-    def _topic_matches(self, topic: str, topics: set[str]) -> bool:
-        if not topics:
-            return True
-        return any(topic.startswith(filter_topic) for filter_topic in topics)
+    def _add_subscription(self, token: str, state: SubscriptionState) -> None:
+        self._subscriptions[token] = state
+        heapq.heappush(self._expiry_heap, (state.termination_time, token))
+        if not state.topics:
+            self._unfiltered.add(token)
+        for filter_topic in state.topics:
+            self._topic_index.setdefault(filter_topic, set()).add(token)
+            self._filter_pattern = None
+            self._filter_lengths[len(filter_topic)] += 1
 
-    def _next_sequence(self, subscription: SubscriptionState) -> int:
-        subscription.sequence += 1
-        return subscription.sequence
+    def _remove_subscription(self, token: str) -> None:
+        state = self._subscriptions.pop(token, None)
+        if state is None:
+            return
+        self._unfiltered.discard(token)
+        for filter_topic in state.topics:
+            tokens = self._topic_index[filter_topic]
+            tokens.discard(token)
+            if not tokens:
+                del self._topic_index[filter_topic]
+                self._filter_pattern = None
+            self._filter_lengths[len(filter_topic)] -= 1
+            if not self._filter_lengths[len(filter_topic)]:
+                del self._filter_lengths[len(filter_topic)]
+
+    def _matching_tokens(self, topic: str) -> set[str]:
+        matched = set(self._unfiltered)
+        if len(self._filter_lengths) >= _FILTER_REGEX_MIN_LENGTHS:
+            if self._filter_pattern is None:
+                self._filter_pattern = re.compile(
+                    "|".join(map(re.escape, sorted(self._topic_index, key=len, reverse=True)))
+                )
+            if self._filter_pattern.match(topic) is None:
+                return matched
+        for length in self._filter_lengths:
+            tokens = self._topic_index.get(topic[:length])
+            if tokens:
+                matched |= tokens
+        return matched
 
     # Public API ------------------------------------------------------
     def create_subscription(
-        self, topics: Optional[Iterable[str]] = None, termination: Optional[datetime] = None
+        self,
+        topics: Optional[Iterable[str]] = None,
+        termination: Optional[datetime] = None,
+        *,
+        now: Optional[datetime] = None,
     ) -> SubscriptionState:
         with self._lock:
-            self._cleanup_expired()
-            token = str(uuid.uuid4())
-            termination_time = termination or datetime.now(timezone.utc) + timedelta(hours=1)
+            now = now or datetime.now(timezone.utc)
+            self._cleanup_expired(now)
+            # Subscription tokens double as pull-point addresses, so keep 128 bits.
+            token = secrets.token_hex(16)
+            termination_time = termination or now + timedelta(hours=1)
             state = SubscriptionState(
                 token=token,
                 termination_time=termination_time,
                 topics=set(topics or []),
             )
-            self._subscriptions[token] = state
+            self._add_subscription(token, state)
             self._default_token = token
             self._persist()
             return state
@@ -180,14 +266,17 @@ class BaseNotificationManager:
     def renew(self, termination: datetime, token: Optional[str] = None) -> SubscriptionState:
         with self._lock:
             subscription = self._ensure_subscription(token)
-            subscription.termination_time = termination
+            with subscription._lock:
+                subscription.termination_time = termination
+                subscription.mark_dirty()
+            heapq.heappush(self._expiry_heap, (termination, subscription.token))
             self._persist()
             return subscription
 
     def unsubscribe(self, token: Optional[str] = None) -> None:
         with self._lock:
             subscription = self._ensure_subscription(token)
-            self._subscriptions.pop(subscription.token, None)
+            self._remove_subscription(subscription.token)
             if self._default_token == subscription.token:
                 self._default_token = next(iter(self._subscriptions), None)
             self._persist()
@@ -195,39 +284,79 @@ class BaseNotificationManager:
     def enqueue_notification(
         self, topic: str, message: dict[str, str], utc_time: Optional[datetime] = None
     ) -> None:
+        self.enqueue_batch([(topic, message)], utc_time)
+
+    def enqueue_batch(
+        self,
+        entries: Iterable[tuple[str, dict[str, str]]],
+        utc_time: Optional[datetime] = None,
+    ) -> None:
+        """Deliver several notifications with one persist.
+
+        The manager lock is only held to resolve recipients; records are then
+        appended under each subscription's own lock.
+        """
+
         with self._lock:
-            self._cleanup_expired()
-            timestamp = utc_time or datetime.now(timezone.utc)
-            for subscription in self._subscriptions.values():
-                if not self._topic_matches(topic, subscription.topics):
-                    continue
-                sequence = self._next_sequence(subscription)
-                record = NotificationRecord(
-                    topic=topic, message=message, utc_time=timestamp, sequence=sequence
-                )
-                subscription.queue.append(record)
-            self._persist()
+            now = datetime.now(timezone.utc)
+            self._cleanup_expired(now)
+            deliveries: dict[str, list[tuple[str, dict[str, str]]]] = {}
+            for topic, message in entries:
+                for token in self._matching_tokens(topic):
+                    deliveries.setdefault(token, []).append((topic, message))
+            recipients = [(self._subscriptions[token], batch) for token, batch in deliveries.items()]
+        timestamp = utc_time or now
+        for subscription, batch in recipients:
+            with subscription._lock:
+                for topic, message in batch:
+                    subscription.sequence += 1
+                    subscription.queue.append(
+                        NotificationRecord(
+                            topic=topic,
+                            message=message,
+                            utc_time=timestamp,
+                            sequence=subscription.sequence,
+                        )
+                    )
+                subscription.mark_dirty()
+        self._persist()
 
     def pull_messages(
         self, token: Optional[str] = None, message_limit: int = 10
     ) -> list[dict[str, object]]:
         with self._lock:
             subscription = self._ensure_subscription(token)
-            messages: list[dict[str, object]] = []
-            while subscription.queue and len(messages) < message_limit:
-                record = subscription.queue.pop(0)
-                messages.append(record.as_payload())
-            self._persist()
-            return messages
+        with subscription._lock:
+            queue = subscription.queue
+            count = max(0, min(message_limit, len(queue)))
+            if not count:
+                return []
+            if count == len(queue):
+                # Long-polling clients usually drain the whole queue.
+                messages = [record.as_payload() for record in queue]
+                queue.clear()
+            else:
+                messages = [record.as_payload() for record in itertools.islice(queue, count)]
+                for _ in range(count):
+                    queue.popleft()
+            subscription.mark_dirty()
+        self._persist()
+        return messages
 
 
 _notification_manager: BaseNotificationManager | None = None
+_notification_manager_lock = threading.Lock()
 
 
 def get_notification_manager() -> BaseNotificationManager:
     global _notification_manager
     if _notification_manager is None:
-        _notification_manager = BaseNotificationManager()
+        # Routers, the SOAP facade and the event pipeline all call this at
+        # import time; only one of them may load the store from disk.
+        with _notification_manager_lock:
+            if _notification_manager is None:
+                _notification_manager = BaseNotificationManager()
+                atexit.register(_notification_manager.flush)
     return _notification_manager
 
 
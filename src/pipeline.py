@@ -2,14 +2,34 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import Enum
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
-from src.config import ConfigManager, EventPipelineMode, ScheduleEntry
+from src.config import ConfigManager, EventPipelineMode, ScheduleEntry, get_config_manager
 from src.notifications import get_notification_manager
 
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last timestamp formatted.
+_second_prefix: tuple[int, str] = (-1, "")
+
+
+def iso_utc_now() -> str:
+    """Return the current UTC time as ISO-8601 with microseconds and a ``Z`` suffix.
+
+    The date/time prefix is reused while the second is unchanged, so most calls
+    only format the microseconds.
+    """
+
+    global _second_prefix
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_second, prefix = _second_prefix
+    if cached_second != seconds:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _second_prefix = (seconds, prefix)
+    return f"{prefix}.{micros:06d}Z"
+
 
 class EventMode(str, Enum):
     """Enumerates how the pipeline interprets incoming signals."""
@@ -49,7 +69,17 @@ class EventPipeline:
     def __init__(self, config_manager: ConfigManager) -> None:
         self._config_manager = config_manager
         self._state = self._load_from_config()
+        # ("input" | "output", channel_id) -> channel, so IO updates skip a list scan.
+        self._channels: dict[tuple[str, int], DigitalChannel] = {}
+        for kind, channels in (
+            ("input", self._state.digital_inputs),
+            ("output", self._state.digital_outputs),
+        ):
+            for channel in channels:
+                self._channels.setdefault((kind, channel.channel_id), channel)
         self._notifications = get_notification_manager()
+        # Notification rows minus the timestamp; rebuilt after any state change.
+        self._notification_rows: Optional[list[dict[str, str]]] = None
 
     # State helpers -----------------------------------------------------
     def _load_from_config(self) -> EventPipelineState:
@@ -65,12 +95,16 @@ class EventPipeline:
         )
 
     def _persist_state(self) -> None:
-        settings = self._config_manager.get_user_settings()
-        settings.event_pipeline_mode = EventPipelineMode(self._state.mode.value)
-        settings.digital_inputs = [channel.__dict__ for channel in self._state.digital_inputs]
-        settings.digital_outputs = [channel.__dict__ for channel in self._state.digital_outputs]
-        settings.recording_triggers = list(self._state.recording_triggers)
-        settings.recording_schedules = list(self._state.schedules)
+        self._notification_rows = None
+        settings = self._config_manager.get_user_settings().model_copy(
+            update={
+                "event_pipeline_mode": EventPipelineMode(self._state.mode.value),
+                "digital_inputs": [dict(channel.__dict__) for channel in self._state.digital_inputs],
+                "digital_outputs": [dict(channel.__dict__) for channel in self._state.digital_outputs],
+                "recording_triggers": list(self._state.recording_triggers),
+                "recording_schedules": list(self._state.schedules),
+            }
+        )
         self._config_manager.save_user_settings(settings)
 
     def set_mode(self, mode: EventMode) -> EventMode:
@@ -79,26 +113,39 @@ class EventPipeline:
         return mode
 
     def update_digital_channel(self, direction: str, channel_id: int, value: bool) -> DigitalChannel:
-        channels = self._state.digital_inputs if direction == "input" else self._state.digital_outputs
-        for channel in channels:
-            if channel.channel_id == channel_id:
-                channel.toggle(value)
-                self._persist_state()
-                topic = f"tns1:Device/IO/{channel.direction.title()}{channel.channel_id}/LogicalState"
-                self._notifications.enqueue_notification(
-                    topic,
-                    {
-                        "Source": channel.name,
-                        "State": "true" if channel.state else "false",
-                    },
-                )
-                return channel
-        raise ValueError(f"Channel {channel_id} not found for {direction}")
+        kind = "input" if direction == "input" else "output"
+        channel = self._channels.get((kind, channel_id))
+        if channel is None:
+            raise ValueError(f"Channel {channel_id} not found for {direction}")
+        channel.toggle(value)
+        self._persist_state()
+        topic = f"tns1:Device/IO/{channel.direction.title()}{channel.channel_id}/LogicalState"
+        self._notifications.enqueue_notification(
+            topic,
+            {
+                "Source": channel.name,
+                "State": "true" if channel.state else "false",
+            },
+        )
+        return channel
 
     def add_schedule(self, schedule: ScheduleEntry) -> list[ScheduleEntry]:
         self._state.schedules.append(schedule)
         self._persist_state()
-        self._notifications.enqueue_notification(
+        self._notifications.enqueue_notification(*self._schedule_notification(schedule))
+        return self._state.schedules
+
+    def replace_schedules(self, schedules: Iterable[ScheduleEntry]) -> list[ScheduleEntry]:
+        self._state.schedules = list(schedules)
+        self._persist_state()
+        self._notifications.enqueue_batch(
+            [self._schedule_notification(schedule) for schedule in self._state.schedules]
+        )
+        return self._state.schedules
+
+    @staticmethod
+    def _schedule_notification(schedule: ScheduleEntry) -> tuple[str, dict[str, str]]:
+        return (
             "tns1:Recording/Configuration/Schedule",
             {
                 "Name": schedule.name,
@@ -107,22 +154,6 @@ class EventPipeline:
                 "Days": ",".join(schedule.days),
             },
         )
-        return self._state.schedules
-
-    def replace_schedules(self, schedules: Iterable[ScheduleEntry]) -> list[ScheduleEntry]:
-        self._state.schedules = list(schedules)
-        self._persist_state()
-        for schedule in self._state.schedules:
-            self._notifications.enqueue_notification(
-                "tns1:Recording/Configuration/Schedule",
-                {
-                    "Name": schedule.name,
-                    "StartTime": schedule.start.isoformat(),
-                    "EndTime": schedule.end.isoformat(),
-                    "Days": ",".join(schedule.days),
-                },
-            )
-        return self._state.schedules
 
     def add_recording_trigger(self, source: str) -> list[str]:
         self._state.recording_triggers.append(source)
@@ -137,43 +168,34 @@ class EventPipeline:
     def build_notifications(self) -> list[dict[str, str]]:
         """Return ONVIF-style event messages representing current state."""
 
-        now = datetime.utcnow().isoformat() + "Z"
-        notifications: list[dict[str, str]] = [
-            {
-                "topic": "pipeline/mode",
-                "state": self._state.mode.value,
-                "utc_time": now,
-            }
-        ]
+        now = iso_utc_now()
+        if self._notification_rows is None:
+            self._notification_rows = self._build_notification_rows()
+        return [{**row, "utc_time": now} for row in self._notification_rows]
+
+    def _build_notification_rows(self) -> list[dict[str, str]]:
+        rows: list[dict[str, str]] = [{"topic": "pipeline/mode", "state": self._state.mode.value}]
 
         for channel in self._state.digital_inputs + self._state.digital_outputs:
-            notifications.append(
+            rows.append(
                 {
                     "topic": f"pipeline/digital/{channel.direction}{channel.channel_id}",
                     "state": "High" if channel.state else "Low",
-                    "utc_time": now,
                 }
             )
 
         for schedule in self._state.schedules:
-            notifications.append(
+            rows.append(
                 {
                     "topic": "pipeline/schedule",
                     "state": f"{schedule.name}:{schedule.start}-{schedule.end}",
-                    "utc_time": now,
                 }
             )
 
         for trigger in self._state.recording_triggers:
-            notifications.append(
-                {
-                    "topic": "pipeline/recording_trigger",
-                    "state": trigger,
-                    "utc_time": now,
-                }
-            )
+            rows.append({"topic": "pipeline/recording_trigger", "state": trigger})
 
-        return notifications
+        return rows
 
     # Accessors ---------------------------------------------------------
     @property
@@ -181,4 +203,26 @@ class EventPipeline:
         return self._state
 
 
-__all__ = ["EventPipeline", "EventMode", "DigitalChannel", "EventPipelineState"]
+_event_pipeline: EventPipeline | None = None
+_event_pipeline_lock = threading.Lock()
+
+
+def get_event_pipeline() -> EventPipeline:
+    """Provide the EventPipeline shared by the REST routers and the SOAP facade."""
+
+    global _event_pipeline
+    if _event_pipeline is None:
+        with _event_pipeline_lock:
+            if _event_pipeline is None:
+                _event_pipeline = EventPipeline(get_config_manager())
+    return _event_pipeline
+
+
+__all__ = [
+    "EventPipeline",
+    "EventMode",
+    "DigitalChannel",
+    "EventPipelineState",
+    "get_event_pipeline",
+    "iso_utc_now",
+]
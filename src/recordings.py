@@ -2,19 +2,22 @@
 
 from __future__ import annotations
 
-import os
-import tempfile
+import atexit
+import secrets
 import threading
-import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-import yaml
+import orjson
 
+from src.json_store import _JSON_OPTIONS, _DebouncedJsonStore, _isoformat
 
-def _parse_time(value: str | datetime) -> datetime:
+
+def _parse_time(value: str | datetime | None) -> datetime:
+    if value is None:
+        return datetime.now(timezone.utc)
     if isinstance(value, datetime):
         return value
     parsed = datetime.fromisoformat(value)
@@ -34,8 +37,8 @@ class TrackMetadata:
     def to_dict(self) -> dict[str, object]:
         return {
             "track_token": self.track_token,
-            "start_time": self.start_time.replace(tzinfo=timezone.utc).isoformat(),
-            "end_time": self.end_time.replace(tzinfo=timezone.utc).isoformat(),
+            "start_time": _isoformat(self.start_time),
+            "end_time": _isoformat(self.end_time),
             "state": self.state,
             "file_path": self.file_path,
         }
@@ -44,8 +47,8 @@ class TrackMetadata:
     def from_dict(cls, payload: dict[str, object]) -> "TrackMetadata":
         return cls(
             track_token=str(payload.get("track_token", "")),
-            start_time=_parse_time(payload.get("start_time", datetime.utcnow().isoformat())),
-            end_time=_parse_time(payload.get("end_time", datetime.utcnow().isoformat())),
+            start_time=_parse_time(payload.get("start_time")),
+            end_time=_parse_time(payload.get("end_time")),
             state=str(payload.get("state", "Completed")),
             file_path=payload.get("file_path"),
         )
@@ -63,8 +66,8 @@ class RecordingMetadata:
         return {
             "recording_token": self.recording_token,
             "source_token": self.source_token,
-            "start_time": self.start_time.replace(tzinfo=timezone.utc).isoformat(),
-            "end_time": self.end_time.replace(tzinfo=timezone.utc).isoformat(),
+            "start_time": _isoformat(self.start_time),
+            "end_time": _isoformat(self.end_time),
             "tracks": [track.to_dict() for track in self.tracks],
         }
 
@@ -73,8 +76,8 @@ class RecordingMetadata:
         return cls(
             recording_token=str(payload.get("recording_token", "")),
             source_token=str(payload.get("source_token", "")),
-            start_time=_parse_time(payload.get("start_time", datetime.utcnow().isoformat())),
-            end_time=_parse_time(payload.get("end_time", datetime.utcnow().isoformat())),
+            start_time=_parse_time(payload.get("start_time")),
+            end_time=_parse_time(payload.get("end_time")),
             tracks=[
                 TrackMetadata.from_dict(track)
                 for track in payload.get("tracks", [])
@@ -136,13 +139,16 @@ class ExportJob:
         )
 
 
-class RecordingStore:
+class RecordingStore(_DebouncedJsonStore):
     """Thread-safe recording metadata registry persisted to disk."""
 
-    def __init__(self, storage_path: Path | str = Path("config/recordings.yaml")) -> None:
-        self.storage_path = Path(storage_path)
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.RLock()
+    def __init__(
+        self,
+        storage_path: Path | str = Path("config/recordings.json"),
+        *,
+        flush_delay: float = 0.1,
+    ) -> None:
+        super().__init__(storage_path, flush_delay=flush_delay)
         self._recordings: dict[str, RecordingMetadata] = {}
         self._jobs: dict[str, RecordingJob] = {}
         self._exports: dict[str, ExportJob] = {}
@@ -150,10 +156,9 @@ class RecordingStore:
 
     # Persistence helpers -------------------------------------------------
     def _load(self) -> None:
-        if not self.storage_path.exists():
+        payload = self._read_payload()
+        if payload is None:
             return
-        with self.storage_path.open("r", encoding="utf-8") as handle:
-            payload = yaml.safe_load(handle) or {}
         self._recordings = {
             token: RecordingMetadata.from_dict(entry)
             for token, entry in (payload.get("recordings", {}) or {}).items()
@@ -170,24 +175,11 @@ class RecordingStore:
             if isinstance(entry, dict)
         }
 
-    def _persist(self) -> None:
-        payload = {
-            "recordings": {k: v.to_dict() for k, v in self._recordings.items()},
-            "jobs": {k: v.to_dict() for k, v in self._jobs.items()},
-            "exports": {k: v.to_dict() for k, v in self._exports.items()},
-        }
-        fd, tmp_path = tempfile.mkstemp(
-            dir=self.storage_path.parent, prefix=".recordings.", suffix=".tmp"
-        )
-        try:
-            with os.fdopen(fd, "w", encoding="utf-8") as handle:
-                yaml.safe_dump(payload, handle, sort_keys=True)
-                handle.flush()
-                os.fsync(handle.fileno())
-            os.replace(tmp_path, self.storage_path)
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+    def _snapshot(self) -> bytes:
+        # orjson serializes the dataclasses and their datetimes natively, so
+        # there is no intermediate to_dict() tree to build.
+        payload = {"recordings": self._recordings, "jobs": self._jobs, "exports": self._exports}
+        return orjson.dumps(payload, option=_JSON_OPTIONS | orjson.OPT_NAIVE_UTC)
 
     # Recording indexing --------------------------------------------------
     def index_recording(
@@ -200,7 +192,7 @@ class RecordingStore:
         recording_token: Optional[str] = None,
     ) -> RecordingMetadata:
         with self._lock:
-            token = recording_token or f"rec-{uuid.uuid4()}"
+            token = recording_token or f"rec-{secrets.token_hex(8)}"
             track = TrackMetadata(
                 track_token=track_token,
                 start_time=start_time,
@@ -245,9 +237,9 @@ class RecordingStore:
     # Job and track control ----------------------------------------------
     def create_job(self, source_token: str, recording_token: Optional[str] = None) -> RecordingJob:
         with self._lock:
-            recording_id = recording_token or f"rec-{uuid.uuid4()}"
+            recording_id = recording_token or f"rec-{secrets.token_hex(8)}"
             job = RecordingJob(
-                job_token=f"job-{uuid.uuid4()}",
+                job_token=f"job-{secrets.token_hex(8)}",
                 recording_token=recording_id,
                 source_token=source_token,
                 state="Recording",
@@ -307,7 +299,7 @@ class RecordingStore:
             if recording_token not in self._recordings:
                 raise ValueError(f"Recording {recording_token} not found")
             job = ExportJob(
-                job_token=f"export-{uuid.uuid4()}",
+                job_token=f"export-{secrets.token_hex(8)}",
                 recording_token=recording_token,
                 track_token=track_token,
                 state="Processing",
@@ -331,12 +323,18 @@ class RecordingStore:
 
 
 _recording_store: RecordingStore | None = None
+_recording_store_lock = threading.Lock()
 
 
 def get_recording_store() -> RecordingStore:
     global _recording_store
     if _recording_store is None:
-        _recording_store = RecordingStore()
+        # The recording router and SOAP facade both resolve this while importing;
+        # the lock keeps recordings.json from being loaded twice.
+        with _recording_store_lock:
+            if _recording_store is None:
+                _recording_store = RecordingStore()
+                atexit.register(_recording_store.flush)
     return _recording_store
 
 
@@ -1,8 +1,10 @@
 """Device service endpoints."""
 
-from fastapi import APIRouter, Depends
+import orjson
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import ORJSONResponse
 
-from src.config import NetworkSettings, NTPSettings, get_config_manager
+from src.config import DeviceMetadata, NetworkSettings, NTPSettings, get_config_manager
 from src.device_management import (
     get_network_settings,
     get_ntp_settings,
@@ -10,57 +12,91 @@ from src.device_management import (
     set_network_settings,
     set_ntp_settings,
 )
-from src.security import require_roles
+from src.security import OPERATOR_ROLES, VIEWER_ROLES, require_roles
 
 router = APIRouter(
     prefix="/device",
     tags=["device"],
-    dependencies=[Depends(require_roles(["viewer", "operator", "admin"]))],
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(require_roles(VIEWER_ROLES))],
 )
 
 config_manager = get_config_manager()
-
-
-@router.get("/information")
-def get_device_information() -> dict[str, str]:
+_REQUIRE_OPERATOR = Depends(require_roles(OPERATOR_ROLES))
+
+CAPABILITIES: dict[str, dict[str, bool]] = {
+    "device": {"system": True, "network": True},
+    "events": {"ws_subscription": True},
+    "media": {"profiles": True},
+    "ptz": {"supported": True},
+    "recording": {"search": False},
+}
+_CAPABILITIES_JSON = orjson.dumps(CAPABILITIES)
+# Encoded /device/information body for the metadata model it was built from.
+# ConfigManager hands out the same frozen model until device.yaml changes.
+_information_cache: tuple[DeviceMetadata | None, bytes] = (None, b"")
+# Encoded GET bodies for the shared settings models returned by device_management,
+# which hands out a new model whenever the setters or the /etc files change them.
+_network_cache: tuple[NetworkSettings | None, bytes] = (None, b"")
+_ntp_cache: tuple[NTPSettings | None, bytes] = (None, b"")
+
+
+def device_information(metadata: DeviceMetadata | None = None) -> dict[str, str]:
+    """Return device metadata as the flat string mapping served by GetDeviceInformation."""
+
+    metadata = metadata or config_manager.get_device_metadata()
+    # DeviceMetadata is flat, so its field values can be read without model_dump().
+    return {key: str(value) for key, value in metadata.__dict__.items() if value is not None}
+
+
+@router.get("/information", response_class=ORJSONResponse)
+def get_device_information() -> Response:
+    global _information_cache
     metadata = config_manager.get_device_metadata()
-    response = metadata.model_dump()
-    return {key: str(value) for key, value in response.items() if value is not None}
+    cached_metadata, body = _information_cache
+    if cached_metadata is not metadata:
+        body = orjson.dumps(device_information(metadata))
+        _information_cache = (metadata, body)
+    return Response(content=body, media_type="application/json")
 
 
-@router.get("/capabilities")
-def get_capabilities() -> dict[str, dict[str, bool]]:
-    return {
-        "device": {"system": True, "network": True},
-        "events": {"ws_subscription": True},
-        "media": {"profiles": True},
-        "ptz": {"supported": True},
-        "recording": {"search": False},
-    }
+@router.get("/capabilities", response_class=ORJSONResponse)
+def get_capabilities() -> Response:
+    return Response(content=_CAPABILITIES_JSON, media_type="application/json")
 
 
-@router.get("/network")
-def get_network_configuration() -> dict:
+@router.get("/network", response_class=ORJSONResponse)
+def get_network_configuration() -> Response:
+    global _network_cache
     settings = get_network_settings()
-    return settings.model_dump()
+    cached_settings, body = _network_cache
+    if cached_settings is not settings:
+        body = orjson.dumps(settings.model_dump(mode="json"))
+        _network_cache = (settings, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.put(
     "/network",
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 def set_network_configuration(payload: NetworkSettings) -> dict:
     updated = set_network_settings(payload)
     return {"status": "updated", "network": updated.model_dump()}
 
 
-@router.get("/ntp")
-def get_ntp_configuration() -> dict:
+@router.get("/ntp", response_class=ORJSONResponse)
+def get_ntp_configuration() -> Response:
+    global _ntp_cache
     settings = get_ntp_settings()
-    return settings.model_dump()
+    cached_settings, body = _ntp_cache
+    if cached_settings is not settings:
+        body = orjson.dumps(settings.model_dump(mode="json"))
+        _ntp_cache = (settings, body)
+    return Response(content=body, media_type="application/json")
 
 
-@router.put("/ntp", dependencies=[Depends(require_roles(["operator", "admin"]))])
+@router.put("/ntp", dependencies=[_REQUIRE_OPERATOR])
 def set_ntp_configuration(payload: NTPSettings) -> dict:
     updated = set_ntp_settings(payload)
     return {"status": "updated", "ntp": updated.model_dump()}
@@ -73,7 +109,7 @@ def get_hostname() -> dict[str, str]:
 
 @router.put(
     "/hostname",
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 def set_hostname_value(hostname: str) -> dict[str, str]:
     updated = set_hostname(hostname)
@@ -1,99 +1,119 @@
 """Event subscription endpoints."""
 
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 
 from src.config import ScheduleEntry, get_config_manager
 from src.notifications import BaseNotificationManager, get_notification_manager
-from src.pipeline import EventMode, EventPipeline
-from src.security import require_roles
+from src.pipeline import EventMode, EventPipeline, get_event_pipeline, iso_utc_now
+from src.security import OPERATOR_ROLES, require_roles
 
 router = APIRouter(
     prefix="/events",
     tags=["events"],
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(require_roles(OPERATOR_ROLES))],
 )
 config_manager = get_config_manager()
-pipeline = EventPipeline(config_manager)
+pipeline: EventPipeline = get_event_pipeline()
 notifications: BaseNotificationManager = get_notification_manager()
 
+# set_mode responses only vary by the timestamp, which is spliced in as bytes.
+_MODE_JSON_PREFIXES = {mode: b'{"mode":"%s","updated":"' % mode.value.encode() for mode in EventMode}
 
-@router.get("/subscription")
+
+def _termination_after(seconds: int) -> datetime:
+    """Return the UTC instant ``seconds`` from now without timedelta arithmetic."""
+
+    return datetime.fromtimestamp(time.time() + seconds, timezone.utc)
+
+
+@router.get("/subscription", response_class=ORJSONResponse)
 def create_subscription(
     topics: list[str] | None = None, termination_seconds: int | None = None
-) -> dict[str, str]:
+) -> ORJSONResponse:
     user_settings = config_manager.get_user_settings()
     status = "Enabled" if user_settings.events_enabled else "Disabled"
-    termination = datetime.now(timezone.utc) + (
-        timedelta(seconds=termination_seconds) if termination_seconds else timedelta(hours=1)
-    )
+    termination = _termination_after(termination_seconds or 3600)
     subscription = notifications.create_subscription(topics=topics, termination=termination)
-    return {
-        "subscription_id": subscription.token,
-        "expires": subscription.termination_time.isoformat(),
-        "delivery_mode": "PullPoint",
-        "status": status,
-    }
-
-
-@router.get("/pull")
-def pull_messages(
-    subscription_id: str | None = None, message_limit: int = 10
-) -> dict[str, list[dict[str, str]]]:
+    return ORJSONResponse(
+        {
+            "subscription_id": subscription.token,
+            "expires": subscription.termination_time.isoformat(),
+            "delivery_mode": "PullPoint",
+            "status": status,
+        }
+    )
+
+
+@router.get("/pull", response_class=ORJSONResponse)
+def pull_messages(subscription_id: str | None = None, message_limit: int = 10) -> ORJSONResponse:
     user_settings = config_manager.get_user_settings()
     if not user_settings.events_enabled:
-        return {"messages": []}
+        return ORJSONResponse({"messages": []})
 
     messages = notifications.pull_messages(token=subscription_id, message_limit=message_limit)
-    return {"messages": messages}
+    return ORJSONResponse({"messages": messages})
 
 
-@router.post("/subscription/{subscription_id}/renew")
-def renew_subscription(subscription_id: str, termination_seconds: int = 3600) -> dict[str, str]:
-    termination = datetime.now(timezone.utc) + timedelta(seconds=termination_seconds)
+@router.post("/subscription/{subscription_id}/renew", response_class=ORJSONResponse)
+def renew_subscription(subscription_id: str, termination_seconds: int = 3600) -> ORJSONResponse:
+    termination = _termination_after(termination_seconds)
     subscription = notifications.renew(termination, token=subscription_id)
-    return {"subscription_id": subscription.token, "expires": subscription.termination_time.isoformat()}
+    return ORJSONResponse(
+        {"subscription_id": subscription.token, "expires": subscription.termination_time.isoformat()}
+    )
 
 
-@router.post("/subscription/{subscription_id}/unsubscribe")
-def unsubscribe(subscription_id: str) -> dict[str, str]:
+@router.post("/subscription/{subscription_id}/unsubscribe", response_class=ORJSONResponse)
+def unsubscribe(subscription_id: str) -> ORJSONResponse:
     notifications.unsubscribe(token=subscription_id)
-    return {"subscription_id": subscription_id, "unsubscribed": datetime.now(timezone.utc).isoformat()}
+    return ORJSONResponse(
+        {"subscription_id": subscription_id, "unsubscribed": datetime.now(timezone.utc).isoformat()}
+    )
 
 
-@router.post("/mode/{mode}")
-def set_mode(mode: EventMode) -> dict[str, str]:
+@router.post("/mode/{mode}", response_class=ORJSONResponse)
+def set_mode(mode: EventMode) -> Response:
     pipeline.set_mode(mode)
-    return {"mode": mode.value, "updated": datetime.utcnow().isoformat() + "Z"}
+    body = _MODE_JSON_PREFIXES[mode] + iso_utc_now().encode() + b'"}'
+    return Response(content=body, media_type="application/json")
 
 
-@router.post("/digital/{direction}/{channel_id}")
-def set_digital_state(direction: str, channel_id: int, state: bool) -> dict[str, str | int]:
+@router.post("/digital/{direction}/{channel_id}", response_class=ORJSONResponse)
+def set_digital_state(direction: str, channel_id: int, state: bool) -> ORJSONResponse:
     try:
         channel = pipeline.update_digital_channel(direction, channel_id, state)
     except ValueError as exc:  # pragma: no cover - defensive
         raise HTTPException(status_code=404, detail=str(exc)) from exc
-    return {
-        "channel": channel.channel_id,
-        "direction": channel.direction,
-        "state": channel.state,
-        "utc_time": datetime.utcnow().isoformat() + "Z",
-    }
+    return ORJSONResponse(
+        {
+            "channel": channel.channel_id,
+            "direction": channel.direction,
+            "state": channel.state,
+            "utc_time": iso_utc_now(),
+        }
+    )
 
 
-@router.post("/schedules")
-def replace_schedules(schedules: list[ScheduleEntry]) -> dict[str, list[dict[str, str]]]:
+@router.post("/schedules", response_class=ORJSONResponse)
+def replace_schedules(schedules: list[ScheduleEntry]) -> ORJSONResponse:
     pipeline.replace_schedules(schedules)
-    return {
-        "schedules": [
-            {
-                "name": schedule.name,
-                "start": schedule.start.isoformat(),
-                "end": schedule.end.isoformat(),
-                "days": schedule.days,
-            }
-            for schedule in pipeline.state.schedules
-        ]
-    }
+    # orjson renders the start/end times itself, matching time.isoformat().
+    return ORJSONResponse(
+        {
+            "schedules": [
+                {
+                    "name": schedule.name,
+                    "start": schedule.start,
+                    "end": schedule.end,
+                    "days": schedule.days,
+                }
+                for schedule in pipeline.state.schedules
+            ]
+        }
+    )
 
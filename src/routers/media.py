@@ -1,21 +1,25 @@
 """Media service endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from src.config import MediaSourceType, get_config_manager
 from src.media_pipeline import MediaPipelineManager
-from src.security import require_roles
+from src.security import OPERATOR_ROLES, VIEWER_ROLES, require_roles
 
 router = APIRouter(
     prefix="/media",
     tags=["media"],
-    dependencies=[Depends(require_roles(["viewer", "operator", "admin"]))],
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(require_roles(VIEWER_ROLES))],
 )
 
 config_manager = get_config_manager()
 pipeline_manager = MediaPipelineManager(config_manager)
 
+_SOURCE_TYPE_MAP = {member.value: member for member in MediaSourceType}
+
 
 class ProfileTuning(BaseModel):
     width: int | None = Field(default=None, gt=0)
@@ -26,20 +30,31 @@ class ProfileTuning(BaseModel):
     source_location: str | None = Field(default=None)
 
 
-@router.get("/profiles")
-def list_profiles() -> list[dict[str, str | int]]:
+@router.get("/profiles", response_class=ORJSONResponse)
+def list_profiles() -> ORJSONResponse:
     """Return configured ONVIF media profiles and their RTSP bindings."""
 
-    return pipeline_manager.list_profiles()
+    return ORJSONResponse(pipeline_manager.list_profiles())
 
 
-@router.put("/profiles/{profile_token}", dependencies=[Depends(require_roles(["operator", "admin"]))])
+@router.put("/profiles/{profile_token}", dependencies=[Depends(require_roles(OPERATOR_ROLES))])
 def tune_profile(profile_token: str, tuning: ProfileTuning) -> dict[str, str | int]:
     """Adjust encoder parameters for an existing profile."""
 
-    if all(value is None for value in tuning.model_dump().values()):
+    # Only fields present in the request body can carry a value; an explicit
+    # null still counts as "not provided".
+    if all(getattr(tuning, name) is None for name in tuning.model_fields_set):
         raise HTTPException(status_code=400, detail="No parameters provided to update")
 
+    source_type = None
+    if tuning.source_type is not None:
+        try:
+            source_type = _SOURCE_TYPE_MAP[tuning.source_type]
+        except KeyError as exc:
+            raise HTTPException(
+                status_code=400, detail=f"Unsupported source type: {tuning.source_type}"
+            ) from exc
+
     try:
         return pipeline_manager.set_profile_parameters(
             profile_token,
@@ -47,9 +62,7 @@ def tune_profile(profile_token: str, tuning: ProfileTuning) -> dict[str, str | i
             height=tuning.height,
             bitrate_kbps=tuning.bitrate_kbps,
             framerate=tuning.framerate,
-            source_type=MediaSourceType(tuning.source_type)
-            if tuning.source_type is not None
-            else None,
+            source_type=source_type,
             source_location=tuning.source_location,
         )
     except KeyError as exc:  # pragma: no cover - thin API wrapper
@@ -1,22 +1,26 @@
 """PTZ control endpoints."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import ORJSONResponse
 
-from src.security import require_roles
+from src.security import OPERATOR_ROLES, require_roles
 
 router = APIRouter(
     prefix="/ptz",
     tags=["ptz"],
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(require_roles(OPERATOR_ROLES))],
 )
 
+_STOPPED_JSON = b'{"status":"stopped"}'
+
 
 @router.post("/move")
 def continuous_move(pan: float = 0.0, tilt: float = 0.0, zoom: float = 0.0) -> dict[str, float]:
     return {"pan": pan, "tilt": tilt, "zoom": zoom, "status": "moving"}
 
 
-@router.post("/stop")
-def stop_move() -> dict[str, str]:
-    return {"status": "stopped"}
+@router.post("/stop", response_class=ORJSONResponse)
+def stop_move() -> Response:
+    return Response(content=_STOPPED_JSON, media_type="application/json")
 
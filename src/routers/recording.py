@@ -1,76 +1,93 @@
 """Recording control endpoints."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from src.config import ScheduleEntry, get_config_manager
-from src.pipeline import EventPipeline
-from src.recordings import RecordingStore, get_recording_store
-from src.security import require_roles
+from src.config import ScheduleEntry
+from src.pipeline import EventPipeline, get_event_pipeline
+from src.recordings import RecordingMetadata, RecordingStore, get_recording_store
+from src.security import OPERATOR_ROLES, require_roles
 
 router = APIRouter(
     prefix="/recording",
     tags=["recording"],
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(require_roles(OPERATOR_ROLES))],
 )
-config_manager = get_config_manager()
-pipeline = EventPipeline(config_manager)
+pipeline: EventPipeline = get_event_pipeline()
 recordings: RecordingStore = get_recording_store()
 
+# pydantic serialises UTC datetimes with a "Z" suffix; OPT_UTC_Z keeps orjson's
+# output identical to what these routes returned before they bypassed it.
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
 
-@router.get("/jobs")
-def list_recording_jobs() -> list[dict[str, object]]:
-    return [
+
+class _RecordingResponse(ORJSONResponse):
+    """ORJSONResponse that encodes datetimes the way pydantic did."""
+
+    def render(self, content: object) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+@router.get("/jobs", response_class=ORJSONResponse)
+def list_recording_jobs() -> ORJSONResponse:
+    return ORJSONResponse(
+        [
+            {
+                "id": job.job_token,
+                "status": job.state,
+                "source": job.source_token,
+                "recording_token": job.recording_token,
+                "tracks": job.track_states,
+            }
+            for job in recordings.list_jobs()
+        ]
+    )
+
+
+@router.post("/jobs", response_class=ORJSONResponse)
+def create_recording_job(profile_token: str) -> ORJSONResponse:
+    pipeline.add_recording_trigger(profile_token)
+    job = recordings.create_job(profile_token)
+    return ORJSONResponse(
         {
             "id": job.job_token,
             "status": job.state,
             "source": job.source_token,
             "recording_token": job.recording_token,
-            "tracks": job.track_states,
         }
-        for job in recordings.list_jobs()
-    ]
-
-
-@router.post("/jobs")
-def create_recording_job(profile_token: str) -> dict[str, str]:
-    pipeline.add_recording_trigger(profile_token)
-    job = recordings.create_job(profile_token)
-    return {
-        "id": job.job_token,
-        "status": job.state,
-        "source": job.source_token,
-        "recording_token": job.recording_token,
-    }
+    )
 
 
-@router.put("/jobs/{job_token}/state")
-def set_job_state(job_token: str, state: str) -> dict[str, str]:
+@router.put("/jobs/{job_token}/state", response_class=ORJSONResponse)
+def set_job_state(job_token: str, state: str) -> ORJSONResponse:
     try:
         job = recordings.update_job_state(job_token, state)
     except ValueError as exc:  # pragma: no cover - defensive
         raise HTTPException(status_code=404, detail=str(exc))
-    return {"id": job.job_token, "status": job.state}
+    return ORJSONResponse({"id": job.job_token, "status": job.state})
 
 
-@router.put("/jobs/{job_token}/tracks/{track_token}")
-def set_track_state(job_token: str, track_token: str, state: str) -> dict[str, object]:
+@router.put("/jobs/{job_token}/tracks/{track_token}", response_class=ORJSONResponse)
+def set_track_state(job_token: str, track_token: str, state: str) -> ORJSONResponse:
     try:
         job = recordings.update_track_state(job_token, track_token, state)
     except ValueError as exc:  # pragma: no cover - defensive
         raise HTTPException(status_code=404, detail=str(exc))
-    return {"id": job.job_token, "tracks": job.track_states}
+    return ORJSONResponse({"id": job.job_token, "tracks": job.track_states})
 
 
-@router.post("/schedules")
-def update_schedules(schedules: list[ScheduleEntry]) -> dict[str, int]:
+@router.post("/schedules", response_class=ORJSONResponse)
+def update_schedules(schedules: list[ScheduleEntry]) -> ORJSONResponse:
     pipeline.replace_schedules(schedules)
-    return {"count": len(schedules)}
+    return ORJSONResponse({"count": len(schedules)})
 
 
-@router.post("/index")
+@router.post("/index", response_class=_RecordingResponse)
 def index_recording(
     source_token: str,
     start_time: datetime,
@@ -78,7 +95,7 @@ def index_recording(
     track_token: str = "track1",
     file_path: Optional[str] = None,
     recording_token: Optional[str] = None,
-) -> dict[str, object]:
+) -> _RecordingResponse:
     recording = recordings.index_recording(
         source_token=source_token,
         start_time=start_time,
@@ -87,22 +104,50 @@ def index_recording(
         file_path=file_path,
         recording_token=recording_token,
     )
-    return {
-        "recording_token": recording.recording_token,
-        "source_token": recording.source_token,
-        "start_time": recording.start_time,
-        "end_time": recording.end_time,
-    }
+    return _RecordingResponse(
+        {
+            "recording_token": recording.recording_token,
+            "source_token": recording.source_token,
+            "start_time": recording.start_time,
+            "end_time": recording.end_time,
+        }
+    )
 
 
-@router.get("/search")
+def _stream_recordings(results: Iterable[RecordingMetadata]) -> Iterator[bytes]:
+    separator = b"["
+    for rec in results:
+        yield separator + orjson.dumps(
+            {
+                "recording_token": rec.recording_token,
+                "source_token": rec.source_token,
+                "start_time": rec.start_time,
+                "end_time": rec.end_time,
+                "tracks": [track.to_dict() for track in rec.tracks],
+            },
+            option=_ORJSON_OPTIONS,
+        )
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+@router.get("/search", response_class=StreamingResponse)
 def search_recordings(
     start_time: datetime = Query(...),
     end_time: datetime = Query(...),
     source_token: Optional[str] = None,
-) -> list[dict[str, object]]:
+) -> StreamingResponse:
     results = recordings.search_recordings(start_time, end_time, source_token)
-    return [
+    return StreamingResponse(_stream_recordings(results), media_type="application/json")
+
+
+@router.get("/recordings/{recording_token}", response_class=_RecordingResponse)
+def get_recording(recording_token: str) -> _RecordingResponse:
+    try:
+        rec = recordings.get_recording(recording_token)
+    except ValueError as exc:  # pragma: no cover - defensive
+        raise HTTPException(status_code=404, detail=str(exc))
+    return _RecordingResponse(
         {
             "recording_token": rec.recording_token,
             "source_token": rec.source_token,
@@ -110,52 +155,38 @@ def search_recordings(
             "end_time": rec.end_time,
             "tracks": [track.to_dict() for track in rec.tracks],
         }
-        for rec in results
-    ]
-
-
-@router.get("/recordings/{recording_token}")
-def get_recording(recording_token: str) -> dict[str, object]:
-    try:
-        rec = recordings.get_recording(recording_token)
-    except ValueError as exc:  # pragma: no cover - defensive
-        raise HTTPException(status_code=404, detail=str(exc))
-    return {
-        "recording_token": rec.recording_token,
-        "source_token": rec.source_token,
-        "start_time": rec.start_time,
-        "end_time": rec.end_time,
-        "tracks": [track.to_dict() for track in rec.tracks],
-    }
+    )
 
 
-@router.get("/replay/{recording_token}")
-def get_replay_uri(recording_token: str) -> dict[str, str]:
+@router.get("/replay/{recording_token}", response_class=ORJSONResponse)
+def get_replay_uri(recording_token: str) -> ORJSONResponse:
     try:
         recordings.get_recording(recording_token)
     except ValueError as exc:  # pragma: no cover - defensive
         raise HTTPException(status_code=404, detail=str(exc))
-    return {"uri": f"rtsp://localhost:8554/{recording_token}"}
+    return ORJSONResponse({"uri": f"rtsp://localhost:8554/{recording_token}"})
 
 
-@router.post("/export/{recording_token}")
-def export_recording(recording_token: str, track_token: Optional[str] = None) -> dict[str, str]:
+@router.post("/export/{recording_token}", response_class=ORJSONResponse)
+def export_recording(recording_token: str, track_token: Optional[str] = None) -> ORJSONResponse:
     try:
         job = recordings.create_export_job(recording_token, track_token)
     except ValueError as exc:  # pragma: no cover - defensive
         raise HTTPException(status_code=404, detail=str(exc))
-    return {"job_token": job.job_token, "state": job.state}
-
-
-@router.get("/exports")
-def list_exports() -> list[dict[str, str]]:
-    return [
-        {
-            "job_token": job.job_token,
-            "recording_token": job.recording_token,
-            "track_token": job.track_token or "",
-            "state": job.state,
-        }
-        for job in recordings.list_exports()
-    ]
+    return ORJSONResponse({"job_token": job.job_token, "state": job.state})
+
+
+@router.get("/exports", response_class=ORJSONResponse)
+def list_exports() -> ORJSONResponse:
+    return ORJSONResponse(
+        [
+            {
+                "job_token": job.job_token,
+                "recording_token": job.recording_token,
+                "track_token": job.track_token or "",
+                "state": job.state,
+            }
+            for job in recordings.list_exports()
+        ]
+    )
 
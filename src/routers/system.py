@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import hashlib
+from dataclasses import dataclass
+from html import escape
+from typing import Callable, Optional, TypeVar
 
-from fastapi import APIRouter, Depends, Form, status
+import orjson
+from fastapi import APIRouter, Depends, Form, Request, Response, status
 from pydantic import BaseModel
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
+from starlette.concurrency import run_in_threadpool
 
 from src.config import (
     DeviceMetadata,
@@ -26,23 +31,37 @@ from src.device_management import (
     set_network_settings,
     set_ntp_settings,
 )
-from src.security import require_roles
+from src.security import OPERATOR_ROLES, VIEWER_ROLES, require_roles
 
 
 router = APIRouter(
     prefix="/system",
     tags=["system"],
-    dependencies=[Depends(require_roles(["viewer", "operator", "admin"]))],
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(require_roles(VIEWER_ROLES))],
 )
 
 config_manager = get_config_manager()
+# Reads only need the router-wide viewer check; every write adds this one.
+_REQUIRE_OPERATOR = Depends(require_roles(OPERATOR_ROLES))
 
 
-def _html_page(title: str, body: str) -> HTMLResponse:
-    template = f"""
+_NAV_LINKS = (
+    ("/system/ui", "Status"),
+    ("/system/ui/network", "Network"),
+    ("/system/ui/ntp", "NTP"),
+    ("/system/ui/metadata", "Device Metadata"),
+    ("/system/ui/events", "Events & Recording"),
+)
+_NAV_HTML = "".join(f'\n          <a href="{href}">{label}</a>' for href, label in _NAV_LINKS)
+
+# The page chrome never changes and is kept pre-encoded; only the title and
+# body are encoded per render.
+_PAGE_PREFIX = b"""
     <html>
       <head>
-        <title>{title}</title>
+        <title>"""
+_PAGE_MIDDLE = f"""</title>
         <style>
           body {{ font-family: Arial, sans-serif; margin: 2rem; }}
           section {{ margin-bottom: 2rem; }}
@@ -56,24 +75,65 @@ def _html_page(title: str, body: str) -> HTMLResponse:
         </style>
       </head>
       <body>
-        <nav>
-          <a href="/system/ui">Status</a>
-          <a href="/system/ui/network">Network</a>
-          <a href="/system/ui/ntp">NTP</a>
-          <a href="/system/ui/metadata">Device Metadata</a>
-          <a href="/system/ui/events">Events & Recording</a>
+        <nav>{_NAV_HTML}
         </nav>
-        {body}
+        """.encode()
+_PAGE_SUFFIX = b"""
       </body>
     </html>
     """
-    return HTMLResponse(content=template)
+
+
+def _render_page(title: str, body: str) -> bytes:
+    return b"".join((_PAGE_PREFIX, title.encode(), _PAGE_MIDDLE, body.encode(), _PAGE_SUFFIX))
+
+
+def _options(*choices: tuple[str, str]) -> str:
+    return "\n".join(f'          <option value="{value}">{label}</option>' for value, label in choices)
+
+
+# Static <option> lists; rendering only marks the current value as selected.
+_ENABLED_OPTIONS = _options(("true", "Enabled"), ("false", "Disabled"))
+_NETWORK_MODE_OPTIONS = _options(("dhcp", "DHCP"), ("static", "Static"))
+_PIPELINE_MODE_OPTIONS = _options(("motion", "Motion"), ("event", "Event"), ("alarm", "Alarm"))
+_RECORDING_MODE_OPTIONS = _options(
+    ("continuous", "Continuous"), ("schedule", "Schedule"), ("on_event", "On Event")
+)
+
+
+def _select(options: str, current: str | bool) -> str:
+    if isinstance(current, bool):
+        current = "true" if current else "false"
+    marker = f'value="{current}"'
+    return options.replace(marker, f"{marker} selected", 1)
+
+
+_Source = TypeVar("_Source")
+# Rendered form pages stamped with the settings object they were built from.
+# ConfigManager hands out the same frozen models until the settings change.
+_FORM_PAGES: dict[str, tuple[object, bytes]] = {}
+
+
+def _cached_page(name: str, source: _Source, render: Callable[[_Source], bytes]) -> HTMLResponse:
+    cached = _FORM_PAGES.get(name)
+    if cached is None or cached[0] is not source:
+        cached = (source, render(source))
+        _FORM_PAGES[name] = cached
+    return HTMLResponse(content=cached[1])
 
 
 def _load_settings() -> UserSettings:
     return config_manager.get_user_settings()
 
 
+def _split_csv(value: Optional[str]) -> list[str]:
+    """Split a comma-separated form field, dropping blank entries."""
+
+    if not value:
+        return []
+    return [entry for entry in map(str.strip, value.split(",")) if entry]
+
+
 class EventUpdate(BaseModel):
     events_enabled: Optional[bool] = None
     alarms_enabled: Optional[bool] = None
@@ -86,12 +146,18 @@ class RecordingUpdate(BaseModel):
     recording_triggers: Optional[list[str]] = None
 
 
-@router.get("/status")
-def get_status() -> dict:
-    settings = _load_settings()
-    network = load_network_settings()
-    ntp = load_ntp_settings()
-    metadata = config_manager.get_device_metadata()
+def _status_sources() -> tuple[UserSettings, NetworkSettings, NTPSettings, DeviceMetadata]:
+    return (
+        _load_settings(),
+        load_network_settings(),
+        load_ntp_settings(),
+        config_manager.get_device_metadata(),
+    )
+
+
+def _status_payload(
+    settings: UserSettings, network: NetworkSettings, ntp: NTPSettings, metadata: DeviceMetadata
+) -> dict:
     return {
         "network": network.model_dump(),
         "ntp": ntp.model_dump(),
@@ -110,26 +176,87 @@ def get_status() -> dict:
     }
 
 
-@router.get("/network")
-def get_network() -> NetworkSettings:
-    return load_network_settings()
+@dataclass
+class _StatusSnapshot:
+    """Status views rendered from one set of source models."""
+
+    sources: tuple[object, ...]
+    payload: dict
+    body: bytes
+    etag: str
+    page: bytes | None = None
+
+
+# Stamped with the models it was built from; each source hands out the same
+# object until its settings change.
+_status_snapshot: _StatusSnapshot | None = None
+
+
+def _current_status() -> _StatusSnapshot:
+    global _status_snapshot
+    sources = _status_sources()
+    snapshot = _status_snapshot
+    if snapshot is None or any(
+        cached is not current for cached, current in zip(snapshot.sources, sources)
+    ):
+        payload = _status_payload(*sources)
+        # orjson serialises the str-based setting enums natively.
+        body = orjson.dumps(payload)
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        snapshot = _status_snapshot = _StatusSnapshot(sources, payload, body, etag)
+    return snapshot
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison (RFC 9110 13.1.2) of an If-None-Match list against ``etag``."""
+
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _not_modified(request: Request, etag: str) -> Response | None:
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
+
+
+@router.get("/status", response_class=ORJSONResponse)
+def get_status(request: Request) -> Response:
+    snapshot = _current_status()
+    return _not_modified(request, snapshot.etag) or Response(
+        content=snapshot.body, media_type="application/json", headers={"ETag": snapshot.etag}
+    )
+
+
+@router.get("/network", response_class=ORJSONResponse)
+def get_network() -> ORJSONResponse:
+    return ORJSONResponse(load_network_settings().model_dump())
 
 
 @router.put(
     "/network",
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 def update_network(payload: NetworkSettings) -> dict:
     updated = set_network_settings(payload)
     return {"status": "updated", "network": updated}
 
 
-@router.get("/ntp")
-def get_ntp() -> NTPSettings:
-    return load_ntp_settings()
+@router.get("/ntp", response_class=ORJSONResponse)
+def get_ntp() -> ORJSONResponse:
+    return ORJSONResponse(load_ntp_settings().model_dump())
 
 
-@router.put("/ntp", dependencies=[Depends(require_roles(["operator", "admin"]))])
+@router.put("/ntp", dependencies=[_REQUIRE_OPERATOR])
 def update_ntp(payload: NTPSettings) -> dict:
     updated = set_ntp_settings(payload)
     return {"status": "updated", "ntp": updated}
@@ -137,45 +264,44 @@ def update_ntp(payload: NTPSettings) -> dict:
 
 @router.put(
     "/hostname",
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 def update_hostname(hostname: str) -> dict:
     updated = set_hostname(hostname)
     return {"status": "updated", "hostname": updated}
 
 
-@router.get("/metadata")
-def get_metadata() -> DeviceMetadata:
-    return config_manager.get_device_metadata()
+@router.get("/metadata", response_class=ORJSONResponse)
+def get_metadata() -> ORJSONResponse:
+    return ORJSONResponse(config_manager.get_device_metadata().model_dump())
 
 
 @router.put(
     "/metadata",
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 def update_metadata(payload: DeviceMetadata) -> dict:
     config_manager.save_device_metadata(payload)
     return {"status": "updated", "metadata": payload}
 
 
-def _apply_event_update(update: EventUpdate) -> UserSettings:
-    settings = _load_settings()
-    if update.events_enabled is not None:
-        settings.events_enabled = update.events_enabled
-    if update.alarms_enabled is not None:
-        settings.alarms_enabled = update.alarms_enabled
-    if update.event_pipeline_mode is not None:
-        settings.event_pipeline_mode = update.event_pipeline_mode
+def _apply_settings_updates(*updates: EventUpdate | RecordingUpdate) -> UserSettings:
+    """Merge partial updates into the user settings with a single load and save."""
+
+    changes: dict = {}
+    for update in updates:
+        changes.update(update.model_dump(exclude_none=True))
+    settings = _load_settings().model_copy(update=changes)
     config_manager.save_user_settings(settings)
     return settings
 
 
 @router.put(
     "/events",
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 def update_event_flags(update: EventUpdate) -> dict:
-    settings = _apply_event_update(update)
+    settings = _apply_settings_updates(update)
     return {
         "status": "updated",
         "events": {
@@ -186,24 +312,12 @@ def update_event_flags(update: EventUpdate) -> dict:
     }
 
 
-def _apply_recording_update(update: RecordingUpdate) -> UserSettings:
-    settings = _load_settings()
-    if update.recording_mode is not None:
-        settings.recording_mode = update.recording_mode
-    if update.recording_enabled is not None:
-        settings.recording_enabled = update.recording_enabled
-    if update.recording_triggers is not None:
-        settings.recording_triggers = update.recording_triggers
-    config_manager.save_user_settings(settings)
-    return settings
-
-
 @router.put(
     "/recording",
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 def update_recording(update: RecordingUpdate) -> dict:
-    settings = _apply_recording_update(update)
+    settings = _apply_settings_updates(update)
     return {
         "status": "updated",
         "recording": settings.recording_mode,
@@ -214,50 +328,58 @@ def update_recording(update: RecordingUpdate) -> dict:
 
 @router.post(
     "/apply",
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 def apply_changes() -> dict:
     apply_all_from_config()
     return {"status": "applied"}
 
 
-@router.get("/ui", response_class=HTMLResponse)
-async def ui_status() -> HTMLResponse:
-    status_payload = get_status()
+def _render_status_page(payload: dict) -> bytes:
     body = f"""
     <h1>System Status</h1>
     <section class="card">
       <h2>Runtime</h2>
-      <pre class="status">{status_payload}</pre>
+      <pre class="status">{escape(str(payload))}</pre>
       <p>Use the navigation links to update configuration using the built-in forms.</p>
     </section>
     """
-    return _html_page("System Status", body)
+    return _render_page("System Status", body)
 
 
-@router.get("/ui/network", response_class=HTMLResponse)
-async def ui_network() -> HTMLResponse:
-    settings = _load_settings().network
-    dns_value = ",".join(settings.dns_servers)
+@router.get("/ui", response_class=HTMLResponse)
+async def ui_status(request: Request) -> Response:
+    snapshot = _current_status()
+    # The page is a pure function of the status payload, so it shares its tag.
+    etag = f'{snapshot.etag[:-1]}-html"'
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    if snapshot.page is None:
+        snapshot.page = _render_status_page(snapshot.payload)
+    return HTMLResponse(content=snapshot.page, headers={"ETag": etag})
+
+
+def _render_network_page(settings: NetworkSettings) -> bytes:
+    dns_value = escape(",".join(settings.dns_servers))
     body = f"""
     <h1>Network Configuration</h1>
     <section class="card">
       <form method="post" action="/system/ui/network">
         <label for="hostname">Hostname</label>
-        <input type="text" id="hostname" name="hostname" value="{settings.hostname}" />
+        <input type="text" id="hostname" name="hostname" value="{escape(settings.hostname)}" />
         <label for="interface">Interface</label>
-        <input type="text" id="interface" name="interface" value="{settings.interface}" />
+        <input type="text" id="interface" name="interface" value="{escape(settings.interface)}" />
         <label for="mode">Mode</label>
         <select id="mode" name="mode">
-          <option value="dhcp" {'selected' if settings.mode == NetworkMode.dhcp else ''}>DHCP</option>
-          <option value="static" {'selected' if settings.mode == NetworkMode.static else ''}>Static</option>
+{_select(_NETWORK_MODE_OPTIONS, settings.mode.value)}
         </select>
         <label for="static_ip">Static IP</label>
-        <input type="text" id="static_ip" name="static_ip" value="{settings.static_ip or ''}" />
+        <input type="text" id="static_ip" name="static_ip" value="{escape(settings.static_ip or '')}" />
         <label for="subnet_mask">Subnet Mask</label>
-        <input type="text" id="subnet_mask" name="subnet_mask" value="{settings.subnet_mask or ''}" />
+        <input type="text" id="subnet_mask" name="subnet_mask" value="{escape(settings.subnet_mask or '')}" />
         <label for="gateway">Gateway</label>
-        <input type="text" id="gateway" name="gateway" value="{settings.gateway or ''}" />
+        <input type="text" id="gateway" name="gateway" value="{escape(settings.gateway or '')}" />
         <label for="dns_servers">DNS Servers (comma separated)</label>
         <input type="text" id="dns_servers" name="dns_servers" value="{dns_value}" />
         <div class="actions">
@@ -266,13 +388,18 @@ async def ui_network() -> HTMLResponse:
       </form>
     </section>
     """
-    return _html_page("Network Configuration", body)
+    return _render_page("Network Configuration", body)
+
+
+@router.get("/ui/network", response_class=HTMLResponse)
+async def ui_network() -> HTMLResponse:
+    return _cached_page("network", _load_settings().network, _render_network_page)
 
 
 @router.post(
     "/ui/network",
     response_class=HTMLResponse,
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 async def ui_network_submit(
     hostname: str = Form(...),
@@ -283,7 +410,7 @@ async def ui_network_submit(
     gateway: Optional[str] = Form(None),
     dns_servers: Optional[str] = Form(None),
 ) -> RedirectResponse:
-    dns_list = [entry.strip() for entry in (dns_servers or "").split(",") if entry.strip()]
+    dns_list = _split_csv(dns_servers)
     payload = NetworkSettings(
         hostname=hostname,
         interface=interface,
@@ -293,22 +420,20 @@ async def ui_network_submit(
         gateway=gateway or None,
         dns_servers=dns_list,
     )
-    update_network(payload)
+    # Applying the settings runs system commands; keep them off the event loop.
+    await run_in_threadpool(update_network, payload)
     return RedirectResponse("/system/ui", status_code=status.HTTP_302_FOUND)
 
 
-@router.get("/ui/ntp", response_class=HTMLResponse)
-async def ui_ntp() -> HTMLResponse:
-    settings = _load_settings().ntp
-    servers = ",".join(settings.servers)
+def _render_ntp_page(settings: NTPSettings) -> bytes:
+    servers = escape(",".join(settings.servers))
     body = f"""
     <h1>NTP Configuration</h1>
     <section class="card">
       <form method="post" action="/system/ui/ntp">
         <label for="enabled">NTP Enabled</label>
         <select id="enabled" name="enabled">
-          <option value="true" {'selected' if settings.enabled else ''}>Enabled</option>
-          <option value="false" {'selected' if not settings.enabled else ''}>Disabled</option>
+{_select(_ENABLED_OPTIONS, settings.enabled)}
         </select>
         <label for="servers">Servers (comma separated)</label>
         <input type="text" id="servers" name="servers" value="{servers}" />
@@ -318,56 +443,64 @@ async def ui_ntp() -> HTMLResponse:
       </form>
     </section>
     """
-    return _html_page("NTP Configuration", body)
+    return _render_page("NTP Configuration", body)
+
+
+@router.get("/ui/ntp", response_class=HTMLResponse)
+async def ui_ntp() -> HTMLResponse:
+    return _cached_page("ntp", _load_settings().ntp, _render_ntp_page)
 
 
 @router.post(
     "/ui/ntp",
     response_class=HTMLResponse,
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 async def ui_ntp_submit(
     enabled: str = Form(...),
     servers: Optional[str] = Form(None),
 ) -> RedirectResponse:
-    server_list = [entry.strip() for entry in (servers or "").split(",") if entry.strip()]
+    server_list = _split_csv(servers)
     payload = NTPSettings(enabled=enabled.lower() == "true", servers=server_list)
-    update_ntp(payload)
+    await run_in_threadpool(update_ntp, payload)
     return RedirectResponse("/system/ui", status_code=status.HTTP_302_FOUND)
 
 
-@router.get("/ui/metadata", response_class=HTMLResponse)
-async def ui_metadata() -> HTMLResponse:
-    metadata = config_manager.get_device_metadata()
+def _render_metadata_page(metadata: DeviceMetadata) -> bytes:
     body = f"""
     <h1>Device Metadata</h1>
     <section class="card">
       <form method="post" action="/system/ui/metadata">
         <label for="manufacturer">Manufacturer</label>
-        <input type="text" id="manufacturer" name="manufacturer" value="{metadata.manufacturer}" />
+        <input type="text" id="manufacturer" name="manufacturer" value="{escape(metadata.manufacturer)}" />
         <label for="model">Model</label>
-        <input type="text" id="model" name="model" value="{metadata.model}" />
+        <input type="text" id="model" name="model" value="{escape(metadata.model)}" />
         <label for="firmware_version">Firmware Version</label>
-        <input type="text" id="firmware_version" name="firmware_version" value="{metadata.firmware_version}" />
+        <input type="text" id="firmware_version" name="firmware_version" value="{escape(metadata.firmware_version)}" />
         <label for="serial_number">Serial Number</label>
-        <input type="text" id="serial_number" name="serial_number" value="{metadata.serial_number}" />
+        <input type="text" id="serial_number" name="serial_number" value="{escape(metadata.serial_number)}" />
         <label for="hardware_id">Hardware ID</label>
-        <input type="text" id="hardware_id" name="hardware_id" value="{metadata.hardware_id}" />
+        <input type="text" id="hardware_id" name="hardware_id" value="{escape(metadata.hardware_id)}" />
         <label for="developer_notes">Developer Notes</label>
-        <input type="text" id="developer_notes" name="developer_notes" value="{metadata.developer_notes or ''}" />
+        <input type="text" id="developer_notes" name="developer_notes" value="{escape(metadata.developer_notes or '')}" />
         <div class="actions">
           <button type="submit">Save Metadata</button>
         </div>
       </form>
     </section>
     """
-    return _html_page("Device Metadata", body)
+    return _render_page("Device Metadata", body)
+
+
+@router.get("/ui/metadata", response_class=HTMLResponse)
+async def ui_metadata() -> HTMLResponse:
+    return _cached_page("metadata", config_manager.get_device_metadata(), _render_metadata_page)
 
 
 @router.post(
     "/ui/metadata",
     response_class=HTMLResponse,
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 async def ui_metadata_submit(
     manufacturer: str = Form(...),
@@ -389,40 +522,31 @@ async def ui_metadata_submit(
     return RedirectResponse("/system/ui", status_code=status.HTTP_302_FOUND)
 
 
-@router.get("/ui/events", response_class=HTMLResponse)
-async def ui_events() -> HTMLResponse:
-    settings = _load_settings()
-    triggers = ",".join(settings.recording_triggers)
+def _render_events_page(settings: UserSettings) -> bytes:
+    triggers = escape(",".join(settings.recording_triggers))
     body = f"""
     <h1>Events & Recording</h1>
     <section class="card">
       <form method="post" action="/system/ui/events">
         <label for="events_enabled">Events Enabled</label>
         <select id="events_enabled" name="events_enabled">
-          <option value="true" {'selected' if settings.events_enabled else ''}>Enabled</option>
-          <option value="false" {'selected' if not settings.events_enabled else ''}>Disabled</option>
+{_select(_ENABLED_OPTIONS, settings.events_enabled)}
         </select>
         <label for="alarms_enabled">Alarms Enabled</label>
         <select id="alarms_enabled" name="alarms_enabled">
-          <option value="true" {'selected' if settings.alarms_enabled else ''}>Enabled</option>
-          <option value="false" {'selected' if not settings.alarms_enabled else ''}>Disabled</option>
+{_select(_ENABLED_OPTIONS, settings.alarms_enabled)}
         </select>
         <label for="event_pipeline_mode">Pipeline Mode</label>
         <select id="event_pipeline_mode" name="event_pipeline_mode">
-          <option value="motion" {'selected' if settings.event_pipeline_mode == EventPipelineMode.motion else ''}>Motion</option>
-          <option value="event" {'selected' if settings.event_pipeline_mode == EventPipelineMode.event else ''}>Event</option>
-          <option value="alarm" {'selected' if settings.event_pipeline_mode == EventPipelineMode.alarm else ''}>Alarm</option>
+{_select(_PIPELINE_MODE_OPTIONS, settings.event_pipeline_mode.value)}
         </select>
         <label for="recording_mode">Recording Mode</label>
         <select id="recording_mode" name="recording_mode">
-          <option value="continuous" {'selected' if settings.recording_mode == RecordingMode.continuous else ''}>Continuous</option>
-          <option value="schedule" {'selected' if settings.recording_mode == RecordingMode.schedule else ''}>Schedule</option>
-          <option value="on_event" {'selected' if settings.recording_mode == RecordingMode.on_event else ''}>On Event</option>
+{_select(_RECORDING_MODE_OPTIONS, settings.recording_mode.value)}
         </select>
         <label for="recording_enabled">Recording Enabled</label>
         <select id="recording_enabled" name="recording_enabled">
-          <option value="true" {'selected' if settings.recording_enabled else ''}>Enabled</option>
-          <option value="false" {'selected' if not settings.recording_enabled else ''}>Disabled</option>
+{_select(_ENABLED_OPTIONS, settings.recording_enabled)}
         </select>
         <label for="recording_triggers">Recording Triggers</label>
         <input type="text" id="recording_triggers" name="recording_triggers" value="{triggers}" />
@@ -432,13 +556,18 @@ async def ui_events() -> HTMLResponse:
       </form>
     </section>
     """
-    return _html_page("Events and Recording", body)
+    return _render_page("Events and Recording", body)
+
+
+@router.get("/ui/events", response_class=HTMLResponse)
+async def ui_events() -> HTMLResponse:
+    return _cached_page("events", _load_settings(), _render_events_page)
 
 
 @router.post(
     "/ui/events",
     response_class=HTMLResponse,
-    dependencies=[Depends(require_roles(["operator", "admin"]))],
+    dependencies=[_REQUIRE_OPERATOR],
 )
 async def ui_events_submit(
     events_enabled: str = Form(...),
@@ -448,20 +577,18 @@ async def ui_events_submit(
     recording_enabled: str = Form(...),
     recording_triggers: Optional[str] = Form(None),
 ) -> RedirectResponse:
-    trigger_list = [entry.strip() for entry in (recording_triggers or "").split(",") if entry.strip()]
-    _apply_event_update(
+    trigger_list = _split_csv(recording_triggers)
+    _apply_settings_updates(
         EventUpdate(
             events_enabled=events_enabled.lower() == "true",
             alarms_enabled=alarms_enabled.lower() == "true",
             event_pipeline_mode=event_pipeline_mode,
-        )
-    )
-    _apply_recording_update(
+        ),
         RecordingUpdate(
             recording_mode=recording_mode,
             recording_enabled=recording_enabled.lower() == "true",
             recording_triggers=trigger_list,
-        )
+        ),
     )
     return RedirectResponse("/system/ui", status_code=status.HTTP_302_FOUND)
 
@@ -1,9 +1,11 @@
 """User management CRUD endpoints secured by admin role."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
-from src.security import require_roles
+from src.security import ADMIN_ROLES, require_roles
 from src.users import User, UserStore, get_user_store
 
 
@@ -19,62 +21,77 @@ class UserUpdate(BaseModel):
 
 
 class UserResponse(BaseModel):
+    """Documented response shape; handlers build the payload without validating it."""
+
     username: str
     roles: list[str]
 
-    @classmethod
-    def from_user(cls, user: User) -> "UserResponse":
-        return cls(username=user.username, roles=sorted(user.roles))
+
+def _user_payload(user: User) -> dict[str, object]:
+    return {"username": user.username, "roles": sorted(user.roles)}
 
 
 router = APIRouter(
     prefix="/users",
     tags=["users"],
-    dependencies=[Depends(require_roles(["admin"]))],
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(require_roles(ADMIN_ROLES))],
 )
 
 
-def _get_store() -> UserStore:
-    return get_user_store()
+# Encoded user list stamped with the store and the version it was built from.
+_user_list_cache: tuple[UserStore | None, int, bytes] = (None, -1, b"")
 
 
-@router.get("/", response_model=list[UserResponse])
-def list_users(store: UserStore = Depends(_get_store)) -> list[UserResponse]:
-    return [UserResponse.from_user(user) for user in store.list_users()]
+@router.get("/", response_class=ORJSONResponse, responses={200: {"model": list[UserResponse]}})
+def list_users() -> Response:
+    global _user_list_cache
+    store = get_user_store()
+    # Read the version before listing so a concurrent change can only make the
+    # cached body look stale, never newer than it is.
+    version = store.version
+    cached_store, cached_version, body = _user_list_cache
+    if cached_store is not store or cached_version != version:
+        body = orjson.dumps([_user_payload(user) for user in store.list_users()])
+        _user_list_cache = (store, version, body)
+    return Response(content=body, media_type="application/json")
 
 
-@router.get("/{username}", response_model=UserResponse)
-def get_user(username: str, store: UserStore = Depends(_get_store)) -> UserResponse:
-    user = store.get_user(username)
+@router.get("/{username}", response_class=ORJSONResponse, responses={200: {"model": UserResponse}})
+def get_user(username: str) -> ORJSONResponse:
+    user = get_user_store().get_user(username)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return UserResponse.from_user(user)
+    return ORJSONResponse(_user_payload(user))
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED, response_model=UserResponse)
-def create_user(payload: UserCreate, store: UserStore = Depends(_get_store)) -> UserResponse:
+@router.post(
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    response_class=ORJSONResponse,
+    responses={201: {"model": UserResponse}},
+)
+def create_user(payload: UserCreate) -> ORJSONResponse:
     try:
-        user = store.add_user(payload.username, payload.password, payload.roles)
+        user = get_user_store().add_user(payload.username, payload.password, payload.roles)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    return UserResponse.from_user(user)
+    return ORJSONResponse(_user_payload(user), status_code=status.HTTP_201_CREATED)
 
 
-@router.put("/{username}", response_model=UserResponse)
-def update_user(
-    username: str, payload: UserUpdate, store: UserStore = Depends(_get_store)
-) -> UserResponse:
+@router.put("/{username}", response_class=ORJSONResponse, responses={200: {"model": UserResponse}})
+def update_user(username: str, payload: UserUpdate) -> ORJSONResponse:
     try:
-        user = store.update_user(username, password=payload.password, roles=payload.roles)
+        user = get_user_store().update_user(username, password=payload.password, roles=payload.roles)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    return UserResponse.from_user(user)
+    return ORJSONResponse(_user_payload(user))
 
 
 @router.delete("/{username}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(username: str, store: UserStore = Depends(_get_store)) -> None:
+def delete_user(username: str) -> None:
     try:
-        store.delete_user(username)
+        get_user_store().delete_user(username)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
 
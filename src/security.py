@@ -3,29 +3,70 @@
 from __future__ import annotations
 
 import logging
-import re
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Optional
 
 from fastapi import Depends, Header, HTTPException, status
 
-from src.users import AuthenticatedUser, UserStore, get_user_store
+from src.users import AuthenticatedUser, UserStore, get_authenticated, get_user_store
 
 
 logger = logging.getLogger(__name__)
 
+VIEWER_ROLES = frozenset({"viewer", "operator", "admin"})
+OPERATOR_ROLES = frozenset({"operator", "admin"})
+ADMIN_ROLES = frozenset({"admin"})
 
-_TOKEN_PATTERN = re.compile(
-    r"UsernameToken\s+username=\"(?P<username>[^\"]+)\"\s+password=\"(?P<password>[^\"]+)\"",
-    re.IGNORECASE,
-)
+
+_CANONICAL_PREFIX = 'UsernameToken username="'
+_CANONICAL_START = len(_CANONICAL_PREFIX)
+
+
+def _skip_space(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _scan_token_fields(token: str, lowered: str, pos: int) -> tuple[str, str] | None:
+    """Read ``username="..." password="..."`` following a ``UsernameToken`` keyword."""
+
+    fields = []
+    for key in ('username="', 'password="'):
+        start = _skip_space(token, pos)
+        if start == pos or not lowered.startswith(key, start):
+            return None
+        start += len(key)
+        end = token.find('"', start)
+        if end <= start:
+            return None
+        fields.append(token[start:end])
+        pos = end + 1
+    return fields[0], fields[1]
 
 
 def parse_username_token(username_token: str) -> tuple[str, str]:
     """Extract credentials from a UsernameToken header."""
 
-    match = _TOKEN_PATTERN.search(username_token)
-    if match:
-        return match.group("username"), match.group("password")
+    # Fast path for the canonical form written by create_username_token().
+    if username_token.startswith(_CANONICAL_PREFIX):
+        end = username_token.find('" password="', _CANONICAL_START)
+        if end > _CANONICAL_START and username_token.endswith('"'):
+            username = username_token[_CANONICAL_START:end]
+            password = username_token[end + 12 : -1]
+            if password and '"' not in password and '"' not in username:
+                return username, password
+
+    lowered = username_token.lower()
+    if len(lowered) != len(username_token):
+        # A few non-ASCII characters lowercase to several code points; keep
+        # offsets aligned with the original header.
+        lowered = "".join(char.lower()[0] for char in username_token)
+    keyword = lowered.find("usernametoken")
+    while keyword != -1:
+        fields = _scan_token_fields(username_token, lowered, keyword + len("usernametoken"))
+        if fields is not None:
+            return fields
+        keyword = lowered.find("usernametoken", keyword + 1)
 
     if ":" in username_token:
         username, password = username_token.split(":", 1)
@@ -76,21 +117,37 @@ def verify_wsse(
             status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)
         ) from exc
 
-    return AuthenticatedUser(username=user.username, roles=user.roles)
+    return get_authenticated(user)
+
+
+def _authenticate_header(
+    username_token: Optional[str] = Header(default=None, convert_underscores=False),
+) -> AuthenticatedUser:
+    # The user store is a process-wide singleton, so fetch it directly rather
+    # than adding it as another node in every request's dependency graph.
+    return verify_wsse(username_token, get_user_store())
+
+
+# One dependency per distinct role set, so identical checks share a callable
+# and FastAPI's per-request dependency cache can deduplicate them.
+_ROLE_DEPENDENCIES: dict[frozenset[str], Callable[..., AuthenticatedUser]] = {}
 
 
 def require_roles(allowed_roles: Iterable[str]):
     """Dependency factory enforcing that the user has one of the allowed roles."""
 
-    allowed = set(allowed_roles)
+    allowed = frozenset(allowed_roles)
+    cached = _ROLE_DEPENDENCIES.get(allowed)
+    if cached is not None:
+        return cached
 
-    def dependency(user: AuthenticatedUser = Depends(verify_wsse)) -> AuthenticatedUser:
-        if not set(user.roles) & allowed:
+    def dependency(user: AuthenticatedUser = Depends(_authenticate_header)) -> AuthenticatedUser:
+        if allowed.isdisjoint(user.roles):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient role permissions",
             )
         return user
 
-    return dependency
+    return _ROLE_DEPENDENCIES.setdefault(allowed, dependency)
 
@@ -1,15 +1,16 @@
 """Server entrypoint that honors SERVICE_HOST and SERVICE_PORT environment variables."""
 import os
 
-import uvicorn
 
-from src.main import app
+def main() -> None:
+    # Imported here so probes that only touch this module skip loading the app.
+    import uvicorn
 
+    from src.main import app
 
-def main() -> None:
-    host = os.getenv("SERVICE_HOST", "0.0.0.0")
-    port = int(os.getenv("SERVICE_PORT", "8000"))
-    log_level = os.getenv("UVICORN_LOG_LEVEL", "info")
+    host = os.environ.get("SERVICE_HOST", "0.0.0.0")
+    port = int(os.environ.get("SERVICE_PORT", "8000"))
+    log_level = os.environ.get("UVICORN_LOG_LEVEL", "info")
     uvicorn.run(app, host=host, port=port, log_level=log_level)
 
 
@@ -5,27 +5,48 @@ import base64
 import binascii
 import ipaddress
 import logging
+import threading
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict
-from xml.etree import ElementTree as ET
-from xml.etree.ElementTree import Element
+from typing import Callable, Dict, Iterable, Iterator, TypeVar
+from xml.sax.saxutils import escape as xml_escape
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-
-from src.config import NetworkMode, NetworkSettings, NTPSettings, get_config_manager
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.config import (
+    DeviceMetadata,
+    NetworkMode,
+    NetworkSettings,
+    NTPSettings,
+    get_config_manager,
+)
+from src.device_management import get_network_settings, get_ntp_settings
 from src.notifications import get_notification_manager
-from src.pipeline import EventPipeline
+from src.pipeline import get_event_pipeline
 from src.routers import device as device_rest
-from src.routers import events as events_rest
 from src.routers import media as media_rest
 from src.routers import ptz as ptz_rest
-from src.routers import recording as recording_rest
-from src.recordings import get_recording_store
+from src.recordings import RecordingMetadata, get_recording_store
 from src.security import parse_username_token
 from src.users import UserStore, get_user_store
 
+try:
+    from lxml import etree as ET
+    from lxml.etree import _Element as Element
+
+    _LXML = True
+except ImportError:  # pragma: no cover - source installs without lxml
+    from xml.etree import ElementTree as ET
+    from xml.etree.ElementTree import Element
+
+    _LXML = False
+
 logger = logging.getLogger(__name__)
 
+_Source = TypeVar("_Source")
+
 SOAP_NS = "http://www.w3.org/2003/05/soap-envelope"
 WSSE_NS = "http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd"
 TDS_NS = "http://www.onvif.org/ver10/device/wsdl"
@@ -34,13 +55,73 @@ TEV_NS = "http://www.onvif.org/ver10/events/wsdl"
 TRC_NS = "http://www.onvif.org/ver10/recording/wsdl"
 PTZ_NS = "http://www.onvif.org/ver20/ptz/wsdl"
 
-ET.register_namespace("soap", SOAP_NS)
-ET.register_namespace("wsse", WSSE_NS)
-ET.register_namespace("tds", TDS_NS)
-ET.register_namespace("trt", TRT_NS)
-ET.register_namespace("tev", TEV_NS)
-ET.register_namespace("trc", TRC_NS)
-ET.register_namespace("tptz", PTZ_NS)
+_BODY_TAG = f"{{{SOAP_NS}}}Body"
+_SECURITY_TAG = f"{{{WSSE_NS}}}Security"
+_USERNAME_TAG = f"{{{WSSE_NS}}}Username"
+_PASSWORD_TAG = f"{{{WSSE_NS}}}Password"
+
+_NAMESPACES = {
+    "soap": SOAP_NS,
+    "wsse": WSSE_NS,
+    "tds": TDS_NS,
+    "trt": TRT_NS,
+    "tev": TEV_NS,
+    "trc": TRC_NS,
+    "tptz": PTZ_NS,
+}
+
+_parser_state = threading.local()
+# Bodies at least this large (signed envelopes, inline certificates) are parsed as
+# they arrive instead of after the whole request has been buffered.
+_STREAMED_PARSE_MIN_BYTES = 64 * 1024
+
+
+def _new_xml_parser():
+    # Entities are never expanded and comments are dropped, as ElementTree's parser does.
+    return ET.XMLParser(
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=False,
+        remove_blank_text=True,
+        remove_comments=True,
+        remove_pis=True,
+    )
+
+
+def _xml_parser():
+    """Return this thread's reusable lxml parser, or None for ElementTree's default."""
+
+    if not _LXML:
+        return None
+    parser = getattr(_parser_state, "parser", None)
+    if parser is None:
+        # lxml parsers are not thread-safe, so each thread keeps its own.
+        parser = _parser_state.parser = _new_xml_parser()
+    return parser
+
+
+def _find(element: Element | None, tag: str) -> Element | None:
+    """Return the first descendant of ``element`` matching ``tag`` (``{*}`` wildcards allowed).
+
+    Element.iter() filters by tag in C, which is cheaper than compiling a ``.//`` path
+    on every call with either ElementTree or lxml.
+    """
+
+    if element is None:
+        return None
+    for found in element.iter(tag):
+        if found is not element:
+            return found
+    return None
+
+
+def _find_text(element: Element | None, tag: str) -> str | None:
+    """Like ``findtext(".//" + tag)``: None when missing, "" for an empty element."""
+
+    found = _find(element, tag)
+    if found is None:
+        return None
+    return found.text or ""
 
 
 def _authenticate_credentials(username: str | None, password: str | None, store: UserStore) -> None:
@@ -52,13 +133,18 @@ def _authenticate_credentials(username: str | None, password: str | None, store:
         ) from exc
 
 
-def _require_username_token(envelope: Element, store: UserStore, request: Request | None) -> None:
-    """Validate credentials from WS-Security, UsernameToken header, or HTTP Basic."""
+def _require_username_token(
+    envelope: Element | None, store: UserStore, request: Request | None
+) -> None:
+    """Validate credentials from WS-Security, UsernameToken header, or HTTP Basic.
+
+    ``envelope`` is None when the caller already knows the body carries no Security header.
+    """
 
-    security = envelope.find(f".//{{{WSSE_NS}}}Security")
+    security = _find(envelope, _SECURITY_TAG)
     if security is not None:
-        username_el = security.find(f".//{{{WSSE_NS}}}Username")
-        password_el = security.find(f".//{{{WSSE_NS}}}Password")
+        username_el = _find(security, _USERNAME_TAG)
+        password_el = _find(security, _PASSWORD_TAG)
         if username_el is not None and password_el is not None:
             _authenticate_credentials(username_el.text, password_el.text, store)
             return
@@ -105,30 +191,93 @@ def _require_username_token(envelope: Element, store: UserStore, request: Reques
     )
 
 
-def _soap_envelope(body_child: Element) -> Response:
-    envelope = ET.Element(f"{{{SOAP_NS}}}Envelope")
-    body = ET.SubElement(envelope, f"{{{SOAP_NS}}}Body")
-    body.append(body_child)
-    xml = ET.tostring(envelope, encoding="utf-8", xml_declaration=True)
-    return Response(content=xml, media_type="application/soap+xml")
+def _envelope_template(prefix: str, body: str) -> bytes:
+    """Pre-render a fixed-shape envelope; each ``%s`` in ``body`` takes escaped text."""
+
+    payload_ns = "" if prefix == "soap" else f' xmlns:{prefix}="{_NAMESPACES[prefix]}"'
+    return (
+        "<?xml version='1.0' encoding='utf-8'?>\n"
+        f'<soap:Envelope xmlns:soap="{SOAP_NS}"{payload_ns}>'
+        f"<soap:Body>{body}</soap:Body></soap:Envelope>"
+    ).encode()
+
+
+_ATTRIBUTE_ENTITIES = {'"': "&quot;"}
+
+
+def _xml_bytes(value: object) -> bytes:
+    return xml_escape(str(value)).encode()
+
+
+def _xml_attribute_bytes(value: object) -> bytes:
+    return xml_escape(str(value), _ATTRIBUTE_ENTITIES).encode()
+
+
+def _template_response(template: bytes, *values: object) -> Response:
+    content = template % tuple(_xml_bytes(value) for value in values)
+    return Response(content=content, media_type="application/soap+xml")
+
+
+# Rendered envelopes keyed by the model they were built from. ConfigManager and
+# device_management hand out the same frozen models until the settings change.
+_RENDERED_ENVELOPES: dict[str, tuple[object, bytes]] = {}
+
+
+def _cached_envelope(name: str, source: _Source, render: Callable[[_Source], bytes]) -> Response:
+    cached = _RENDERED_ENVELOPES.get(name)
+    if cached is None or cached[0] is not source:
+        cached = (source, render(source))
+        _RENDERED_ENVELOPES[name] = cached
+    return Response(content=cached[1], media_type="application/soap+xml")
+
+
+def _stream_envelope(prologue: bytes, chunks: Iterable[bytes], epilogue: bytes) -> Response:
+    """Stream an envelope whose repeated body fragments are rendered lazily."""
+
+    def body() -> Iterator[bytes]:
+        yield prologue
+        yield from chunks
+        yield epilogue
+
+    return StreamingResponse(body(), media_type="application/soap+xml")
+
+
+_FAULT_TMPL = _envelope_template(
+    "soap",
+    "<soap:Fault><Code><Value>soap:Sender</Value></Code>"
+    "<Reason><Text>%s</Text></Reason></soap:Fault>",
+)
 
 
 def _fault(reason: str) -> Response:
-    fault_body = ET.Element(f"{{{SOAP_NS}}}Fault")
-    code_el = ET.SubElement(fault_body, "Code")
-    ET.SubElement(code_el, "Value").text = "soap:Sender"
-    reason_el = ET.SubElement(fault_body, "Reason")
-    ET.SubElement(reason_el, "Text").text = reason
-    return _soap_envelope(fault_body)
+    return _template_response(_FAULT_TMPL, reason)
 
 
 def _parse_operation(content: bytes) -> tuple[Element, Element, str]:
     try:
-        envelope = ET.fromstring(content)
+        envelope = ET.fromstring(content, _xml_parser())
     except ET.ParseError as exc:  # pragma: no cover - defensive
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return _split_operation(envelope)
+
+
+async def _parse_streamed_operation(request: Request) -> tuple[Element, Element, str]:
+    """Parse the request body chunk by chunk as it is received."""
+
+    # Other requests may feed a parser on this thread between chunks, so the shared
+    # per-thread parser cannot be used here.
+    parser = _new_xml_parser()
+    try:
+        async for chunk in request.stream():
+            parser.feed(chunk)
+        envelope = parser.close()
+    except ET.ParseError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return _split_operation(envelope)
 
-    body = envelope.find(f".//{{{SOAP_NS}}}Body")
+
+def _split_operation(envelope: Element) -> tuple[Element, Element, str]:
+    body = _find(envelope, _BODY_TAG)
     if body is None or not list(body):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="SOAP Body is missing"
@@ -139,42 +288,96 @@ def _parse_operation(content: bytes) -> tuple[Element, Element, str]:
     return envelope, operation, local_name
 
 
+_NAME_TERMINATORS = frozenset(b" \t\r\n/>")
+
+
+def _peek_operation_name(content: bytes) -> str | None:
+    """Read the local name of the first element inside the SOAP Body without parsing.
+
+    Returns None whenever the bytes do not look like a plain ``<Body><Operation`` pair,
+    so callers can fall back to a full parse.
+    """
+
+    start = content.find(b":Body")
+    if start < 0:
+        start = content.find(b"<Body")
+    if start < 0 or content[start + 5 : start + 6] not in (b">", b" "):
+        return None
+    start = content.find(b">", start)
+    if start < 0 or content[start - 1 : start] == b"/":
+        return None
+    start = content.find(b"<", start)
+    if start < 0 or content[start + 1 : start + 2] in (b"", b"!", b"?", b"/"):
+        return None
+    end = start + 1
+    length = len(content)
+    while end < length and content[end] not in _NAME_TERMINATORS:
+        end += 1
+    try:
+        return content[start + 1 : end].rpartition(b":")[2].decode("ascii")
+    except UnicodeDecodeError:
+        return None
+
+
 # Business logic adapters -----------------------------------------------------
 
 
 config_manager = get_config_manager()
-pipeline = EventPipeline(config_manager)
+pipeline = get_event_pipeline()
 notifications = get_notification_manager()
 recording_store = get_recording_store()
 
 
+# Wall-clock time read at most once per SOAP request; _dispatch scopes it to the request.
+_REQUEST_NOW: ContextVar[datetime | None] = ContextVar("_REQUEST_NOW", default=None)
+
+
+def _request_now() -> datetime:
+    now = _REQUEST_NOW.get()
+    if now is None:
+        now = datetime.now(timezone.utc)
+        _REQUEST_NOW.set(now)
+    return now
+
+
+def _parse_iso_duration(text: str) -> tuple[int, int, int, int] | None:
+    """Scan the ``PnDTnHnMnS`` subset of ISO-8601 into (days, hours, minutes, seconds).
+
+    Like the anchored pattern it replaces, parsing stops at the first component it
+    cannot read, so trailing text is ignored. Returns None when ``text`` is not a duration.
+    """
+
+    if not text.startswith("P"):
+        return None
+    length = len(text)
+    values = {"D": 0, "H": 0, "M": 0, "S": 0}
+    pos = 1
+    for designator in "DTHMS":
+        if designator == "T":
+            if pos < length and text[pos] == "T":
+                pos += 1
+                continue
+            break
+        end = pos
+        while end < length and text[end].isdecimal():
+            end += 1
+        if end > pos and end < length and text[end] == designator:
+            values[designator] = int(text[pos:end])
+            pos = end + 1
+    return values["D"], values["H"], values["M"], values["S"]
+
+
 def _parse_duration(duration_text: str | None, default_seconds: int = 3600) -> datetime:
     """Convert an ISO-8601 duration string into an absolute UTC expiration."""
 
     if not duration_text:
-        return datetime.now(timezone.utc) + timedelta(seconds=default_seconds)
+        return _request_now() + timedelta(seconds=default_seconds)
 
     duration_text = duration_text.strip()
-    iso_duration = ET.DurationParser() if hasattr(ET, "DurationParser") else None
-    if iso_duration:  # pragma: no cover - fallback for newer Python versions
-        try:
-            delta = iso_duration.parse(duration_text)
-            return datetime.now(timezone.utc) + delta
-        except Exception:
-            pass
-
-    import re
-
-    match = re.match(
-        r"P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?",
-        duration_text,
-    )
-    if match and match.group(0):
-        days = int(match.group("days") or 0)
-        hours = int(match.group("hours") or 0)
-        minutes = int(match.group("minutes") or 0)
-        seconds = int(match.group("seconds") or 0)
-        return datetime.now(timezone.utc) + timedelta(
+    parsed = _parse_iso_duration(duration_text)
+    if parsed is not None:
+        days, hours, minutes, seconds = parsed
+        return _request_now() + timedelta(
             days=days, hours=hours, minutes=minutes, seconds=seconds
         )
 
@@ -184,7 +387,7 @@ def _parse_duration(duration_text: str | None, default_seconds: int = 3600) -> d
             explicit = explicit.replace(tzinfo=timezone.utc)
         return explicit
     except ValueError:
-        return datetime.now(timezone.utc) + timedelta(seconds=default_seconds)
+        return _request_now() + timedelta(seconds=default_seconds)
 
 
 def _extract_subscription_token(operation: Element) -> str | None:
@@ -193,98 +396,134 @@ def _extract_subscription_token(operation: Element) -> str | None:
     token = operation.get("SubscriptionId")
     if token:
         return token
-    address = operation.findtext(".//{*}Address")
+    address = _find_text(operation, "{*}Address")
     if address:
         return address
     return None
 
 
 def _extract_topic_filters(operation: Element) -> set[str]:
-    topics: set[str] = set()
-    for expr in operation.findall(".//{*}TopicExpression"):
-        if expr.text:
-            topics.update(expr.text.split())
-    filter_el = operation.find(".//{*}Filter")
-    if filter_el is not None and filter_el.text:
-        topics.update(filter_el.text.split())
-    return topics
+    texts = [expr.text for expr in operation.iter("{*}TopicExpression")]
+    filter_el = _find(operation, "{*}Filter")
+    if filter_el is not None:
+        texts.append(filter_el.text)
+    return {topic for text in texts if text for topic in text.split()}
+
+
+_CAPABILITIES_TMPL = _envelope_template(
+    "tds",
+    "<tds:GetCapabilitiesResponse><tds:Capabilities>"
+    "<tds:Device><tds:System>%s</tds:System><tds:Network>%s</tds:Network></tds:Device>"
+    "<tds:Events><tds:WSSubscription>%s</tds:WSSubscription></tds:Events>"
+    "<tds:Media><tds:Profiles>%s</tds:Profiles></tds:Media>"
+    "<tds:PTZ><tds:Supported>%s</tds:Supported></tds:PTZ>"
+    "<tds:Recording><tds:Search>%s</tds:Search></tds:Recording>"
+    "</tds:Capabilities></tds:GetCapabilitiesResponse>",
+)
+
+
+# CAPABILITIES keys filling the template slots above, in document order.
+_CAPABILITY_FIELDS = (
+    ("device", "system"),
+    ("device", "network"),
+    ("events", "ws_subscription"),
+    ("media", "profiles"),
+    ("ptz", "supported"),
+    ("recording", "search"),
+)
+# CAPABILITIES is fixed for the process, so the envelope is rendered once.
+_CAPABILITIES_RESPONSE = _CAPABILITIES_TMPL % tuple(
+    b"true" if device_rest.CAPABILITIES[section].get(name, False) else b"false"
+    for section, name in _CAPABILITY_FIELDS
+)
+_DEVICE_INFORMATION_PROLOGUE, _DEVICE_INFORMATION_EPILOGUE = _envelope_template(
+    "tds", "<tds:GetDeviceInformationResponse>%s</tds:GetDeviceInformationResponse>"
+).split(b"%s")
 
 
 def _device_get_capabilities(operation: Element | None = None) -> Response:
-    capabilities = device_rest.get_capabilities()
-    response = ET.Element(f"{{{TDS_NS}}}GetCapabilitiesResponse")
-    caps_el = ET.SubElement(response, f"{{{TDS_NS}}}Capabilities")
+    return Response(content=_CAPABILITIES_RESPONSE, media_type="application/soap+xml")
 
-    device_caps = ET.SubElement(caps_el, f"{{{TDS_NS}}}Device")
-    ET.SubElement(device_caps, f"{{{TDS_NS}}}System").text = str(
-        capabilities["device"].get("system", False)
-    ).lower()
-    ET.SubElement(device_caps, f"{{{TDS_NS}}}Network").text = str(
-        capabilities["device"].get("network", False)
-    ).lower()
 
-    events_caps = ET.SubElement(caps_el, f"{{{TDS_NS}}}Events")
-    ET.SubElement(events_caps, f"{{{TDS_NS}}}WSSubscription").text = str(
-        capabilities["events"].get("ws_subscription", False)
-    ).lower()
+def _device_information_tag(field: str) -> bytes:
+    return f"tds:{field.title().replace('_', '')}".encode()
 
-    media_caps = ET.SubElement(caps_el, f"{{{TDS_NS}}}Media")
-    ET.SubElement(media_caps, f"{{{TDS_NS}}}Profiles").text = str(
-        capabilities["media"].get("profiles", False)
-    ).lower()
 
-    ptz_caps = ET.SubElement(caps_el, f"{{{TDS_NS}}}PTZ")
-    ET.SubElement(ptz_caps, f"{{{TDS_NS}}}Supported").text = str(
-        capabilities["ptz"].get("supported", False)
-    ).lower()
+_DEVICE_INFORMATION_TAGS = {field: _device_information_tag(field) for field in DeviceMetadata.model_fields}
 
-    rec_caps = ET.SubElement(caps_el, f"{{{TDS_NS}}}Recording")
-    ET.SubElement(rec_caps, f"{{{TDS_NS}}}Search").text = str(
-        capabilities["recording"].get("search", False)
-    ).lower()
 
-    return _soap_envelope(response)
+def _render_device_information(metadata: DeviceMetadata) -> bytes:
+    out = bytearray(_DEVICE_INFORMATION_PROLOGUE)
+    for key, value in device_rest.device_information(metadata).items():
+        tag = _DEVICE_INFORMATION_TAGS.get(key) or _device_information_tag(key)
+        out += b"<%s>%s</%s>" % (tag, _xml_bytes(value), tag)
+    out += _DEVICE_INFORMATION_EPILOGUE
+    return bytes(out)
 
 
 def _device_get_information(operation: Element | None = None) -> Response:
-    info = device_rest.get_device_information()
-    response = ET.Element(f"{{{TDS_NS}}}GetDeviceInformationResponse")
-    for key, value in info.items():
-        child = ET.SubElement(response, f"{{{TDS_NS}}}{key.title().replace('_', '')}")
-        child.text = value
-    return _soap_envelope(response)
+    return _cached_envelope(
+        "device_information", config_manager.get_device_metadata(), _render_device_information
+    )
+
+
+_GET_HOSTNAME_TMPL = _envelope_template(
+    "tds",
+    "<tds:GetHostnameResponse><tds:HostnameInformation><tds:Name>%s</tds:Name>"
+    "</tds:HostnameInformation></tds:GetHostnameResponse>",
+)
+_SET_HOSTNAME_TMPL = _envelope_template("tds", "<tds:SetHostnameResponse/>")
+_SET_NTP_TMPL = _envelope_template("tds", "<tds:SetNTPResponse/>")
+_SET_DNS_TMPL = _envelope_template("tds", "<tds:SetDNSResponse/>")
+_SET_NETWORK_INTERFACES_TMPL = _envelope_template(
+    "tds", "<tds:SetNetworkInterfacesResponse><tds:Reboot>false</tds:Reboot></tds:SetNetworkInterfacesResponse>"
+)
 
 
 def _device_get_hostname(operation: Element | None = None) -> Response:
     hostname = device_rest.get_hostname().get("hostname", "")
-    response = ET.Element(f"{{{TDS_NS}}}GetHostnameResponse")
-    info = ET.SubElement(response, f"{{{TDS_NS}}}HostnameInformation")
-    ET.SubElement(info, f"{{{TDS_NS}}}Name").text = hostname
-    return _soap_envelope(response)
+    return _template_response(_GET_HOSTNAME_TMPL, hostname)
 
 
 def _device_set_hostname(operation: Element | None = None) -> Response:
-    hostname = operation.findtext(".//{*}Name") if operation is not None else None
+    hostname = _find_text(operation, "{*}Name")
     if not hostname:
         return _fault("Hostname missing")
     device_rest.set_hostname_value(hostname)
-    response = ET.Element(f"{{{TDS_NS}}}SetHostnameResponse")
-    return _soap_envelope(response)
+    return _template_response(_SET_HOSTNAME_TMPL)
+
+
+_GET_NTP_PROLOGUE, _GET_NTP_EPILOGUE = _envelope_template(
+    "tds",
+    "<tds:GetNTPResponse><tds:NTPInformation>%s</tds:NTPInformation></tds:GetNTPResponse>",
+).split(b"%s")
+_GET_DNS_PROLOGUE, _GET_DNS_EPILOGUE = _envelope_template(
+    "tds",
+    "<tds:GetDNSResponse><tds:DNSInformation>%s</tds:DNSManual></tds:DNSInformation>"
+    "</tds:GetDNSResponse>",
+).split(b"%s")
+_GET_NETWORK_INTERFACES_PROLOGUE, _GET_NETWORK_INTERFACES_EPILOGUE = _envelope_template(
+    "tds",
+    "<tds:GetNetworkInterfacesResponse>%s</tds:Config></tds:IPv4></tds:NetworkInterfaces>"
+    "</tds:GetNetworkInterfacesResponse>",
+).split(b"%s")
+
+
+def _render_ntp(settings: NTPSettings) -> bytes:
+    out = bytearray(_GET_NTP_PROLOGUE)
+    out += b"<tds:FromDHCP>%s</tds:FromDHCP>" % (b"true" if settings.enabled else b"false")
+    for server in settings.servers:
+        out += b"<tds:NTPManual><tds:Address>%s</tds:Address></tds:NTPManual>" % _xml_bytes(server)
+    out += _GET_NTP_EPILOGUE
+    return bytes(out)
 
 
 def _device_get_ntp(operation: Element | None = None) -> Response:
-    settings = NTPSettings(**device_rest.get_ntp_configuration())
-    response = ET.Element(f"{{{TDS_NS}}}GetNTPResponse")
-    info = ET.SubElement(response, f"{{{TDS_NS}}}NTPInformation")
-    ET.SubElement(info, f"{{{TDS_NS}}}FromDHCP").text = str(settings.enabled).lower()
-    for server in settings.servers:
-        entry = ET.SubElement(info, f"{{{TDS_NS}}}NTPManual")
-        ET.SubElement(entry, f"{{{TDS_NS}}}Address").text = server
-    return _soap_envelope(response)
+    return _cached_envelope("ntp", get_ntp_settings(), _render_ntp)
 
 
 def _device_set_ntp(operation: Element | None = None) -> Response:
-    enabled_text = operation.findtext(".//{*}FromDHCP") if operation is not None else None
+    enabled_text = _find_text(operation, "{*}FromDHCP")
     enabled = True if enabled_text is None else enabled_text.lower() == "true"
     servers = [
         entry.text
@@ -293,21 +532,22 @@ def _device_set_ntp(operation: Element | None = None) -> Response:
     ] if operation is not None else []
     settings = NTPSettings(enabled=enabled, servers=servers or ["pool.ntp.org"])
     device_rest.set_ntp_configuration(settings)
-    response = ET.Element(f"{{{TDS_NS}}}SetNTPResponse")
-    return _soap_envelope(response)
+    return _template_response(_SET_NTP_TMPL)
 
 
-def _device_get_dns(operation: Element | None = None) -> Response:
-    settings = NetworkSettings(**device_rest.get_network_configuration())
-    response = ET.Element(f"{{{TDS_NS}}}GetDNSResponse")
-    info = ET.SubElement(response, f"{{{TDS_NS}}}DNSInformation")
-    ET.SubElement(info, f"{{{TDS_NS}}}FromDHCP").text = str(
-        settings.mode == NetworkMode.dhcp
-    ).lower()
-    manual = ET.SubElement(info, f"{{{TDS_NS}}}DNSManual")
+def _render_dns(settings: NetworkSettings) -> bytes:
+    out = bytearray(_GET_DNS_PROLOGUE)
+    out += b"<tds:FromDHCP>%s</tds:FromDHCP><tds:DNSManual>" % (
+        b"true" if settings.mode == NetworkMode.dhcp else b"false"
+    )
     for server in settings.dns_servers:
-        ET.SubElement(manual, f"{{{TDS_NS}}}Address").text = server
-    return _soap_envelope(response)
+        out += b"<tds:Address>%s</tds:Address>" % _xml_bytes(server)
+    out += _GET_DNS_EPILOGUE
+    return bytes(out)
+
+
+def _device_get_dns(operation: Element | None = None) -> Response:
+    return _cached_envelope("dns", get_network_settings(), _render_dns)
 
 
 def _device_set_dns(operation: Element | None = None) -> Response:
@@ -316,46 +556,48 @@ def _device_set_dns(operation: Element | None = None) -> Response:
         for entry in operation.findall(".//{*}DNSManual//{*}Address")
         if entry.text
     ] if operation is not None else []
-    settings = NetworkSettings(**device_rest.get_network_configuration())
+    settings = get_network_settings().model_copy(deep=True)
     if servers:
         settings.dns_servers = servers
     device_rest.set_network_configuration(settings)
-    response = ET.Element(f"{{{TDS_NS}}}SetDNSResponse")
-    return _soap_envelope(response)
-
-
-def _device_get_network_interfaces(operation: Element | None = None) -> Response:
-    settings = NetworkSettings(**device_rest.get_network_configuration())
-    response = ET.Element(f"{{{TDS_NS}}}GetNetworkInterfacesResponse")
-    iface = ET.SubElement(response, f"{{{TDS_NS}}}NetworkInterfaces")
-    iface.set("token", settings.interface)
-    ET.SubElement(iface, f"{{{TDS_NS}}}Enabled").text = "true"
+    return _template_response(_SET_DNS_TMPL)
 
-    ipv4 = ET.SubElement(iface, f"{{{TDS_NS}}}IPv4")
-    config = ET.SubElement(ipv4, f"{{{TDS_NS}}}Config")
-    dhcp = settings.mode == NetworkMode.dhcp
-    ET.SubElement(config, f"{{{TDS_NS}}}DHCP").text = str(dhcp).lower()
 
+def _render_network_interfaces(settings: NetworkSettings) -> bytes:
+    out = bytearray(_GET_NETWORK_INTERFACES_PROLOGUE)
+    out += (
+        b'<tds:NetworkInterfaces token="%s"><tds:Enabled>true</tds:Enabled>'
+        b"<tds:IPv4><tds:Config><tds:DHCP>%s</tds:DHCP>"
+    ) % (
+        _xml_attribute_bytes(settings.interface),
+        b"true" if settings.mode == NetworkMode.dhcp else b"false",
+    )
     if settings.mode == NetworkMode.static:
-        manual = ET.SubElement(config, f"{{{TDS_NS}}}Manual")
+        out += b"<tds:Manual>"
         if settings.static_ip:
-            ET.SubElement(manual, f"{{{TDS_NS}}}Address").text = settings.static_ip
+            out += b"<tds:Address>%s</tds:Address>" % _xml_bytes(settings.static_ip)
         prefix = ipaddress.IPv4Network(
             f"0.0.0.0/{settings.subnet_mask or '255.255.255.0'}"
         ).prefixlen
-        ET.SubElement(manual, f"{{{TDS_NS}}}PrefixLength").text = str(prefix)
+        out += b"<tds:PrefixLength>%d</tds:PrefixLength></tds:Manual>" % prefix
         if settings.gateway:
-            gateway_el = ET.SubElement(config, f"{{{TDS_NS}}}Gateway")
-            ET.SubElement(gateway_el, f"{{{TDS_NS}}}IPv4Address").text = settings.gateway
-    return _soap_envelope(response)
+            out += b"<tds:Gateway><tds:IPv4Address>%s</tds:IPv4Address></tds:Gateway>" % _xml_bytes(
+                settings.gateway
+            )
+    out += _GET_NETWORK_INTERFACES_EPILOGUE
+    return bytes(out)
+
+
+def _device_get_network_interfaces(operation: Element | None = None) -> Response:
+    return _cached_envelope("network_interfaces", get_network_settings(), _render_network_interfaces)
 
 
 def _device_set_network_interfaces(operation: Element | None = None) -> Response:
-    dhcp_text = operation.findtext(".//{*}DHCP") if operation is not None else None
+    dhcp_text = _find_text(operation, "{*}DHCP")
     mode = NetworkMode.dhcp if dhcp_text and dhcp_text.lower() == "true" else NetworkMode.static
-    manual = operation.find(".//{*}Manual") if operation is not None else None
-    ip_address = manual.findtext(".//{*}Address") if manual is not None else None
-    prefix_text = manual.findtext(".//{*}PrefixLength") if manual is not None else None
+    manual = _find(operation, "{*}Manual")
+    ip_address = _find_text(manual, "{*}Address")
+    prefix_text = _find_text(manual, "{*}PrefixLength")
     subnet = None
     if prefix_text:
         try:
@@ -364,7 +606,7 @@ def _device_set_network_interfaces(operation: Element | None = None) -> Response
             subnet = None
     gateway = operation.findtext(".//{*}Gateway//{*}IPv4Address") if operation is not None else None
 
-    settings = NetworkSettings(**device_rest.get_network_configuration())
+    settings = get_network_settings().model_copy(deep=True)
     settings.mode = mode
     if mode == NetworkMode.static:
         settings.static_ip = ip_address or settings.static_ip
@@ -372,234 +614,318 @@ def _device_set_network_interfaces(operation: Element | None = None) -> Response
         settings.gateway = gateway or settings.gateway
 
     device_rest.set_network_configuration(settings)
-    response = ET.Element(f"{{{TDS_NS}}}SetNetworkInterfacesResponse")
-    ET.SubElement(response, f"{{{TDS_NS}}}Reboot").text = "false"
-    return _soap_envelope(response)
+    return _template_response(_SET_NETWORK_INTERFACES_TMPL)
+
+
+_PROFILES_PROLOGUE, _PROFILES_EPILOGUE = _envelope_template(
+    "trt", "<trt:GetProfilesResponse>%s</trt:GetProfilesResponse>"
+).split(b"%s")
+_PROFILE_TMPL = (
+    b'<trt:Profiles token="%s"><trt:Name>%s</trt:Name>'
+    b"<trt:VideoEncoderConfiguration><trt:Name>%s</trt:Name></trt:VideoEncoderConfiguration>"
+    b"<trt:AudioEncoderConfiguration><trt:Name>%s</trt:Name></trt:AudioEncoderConfiguration>"
+    b"</trt:Profiles>"
+)
 
 
 def _media_get_profiles(operation: Element | None = None) -> Response:
-    profiles = media_rest.list_profiles()
-    response = ET.Element(f"{{{TRT_NS}}}GetProfilesResponse")
-    for profile in profiles:
-        profile_el = ET.SubElement(response, f"{{{TRT_NS}}}Profiles")
-        profile_el.set("token", profile.get("token", ""))
-        ET.SubElement(profile_el, f"{{{TRT_NS}}}Name").text = profile.get("name", "")
-        ve = ET.SubElement(
-            profile_el,
-            f"{{{TRT_NS}}}VideoEncoderConfiguration",
-        )
-        ET.SubElement(ve, f"{{{TRT_NS}}}Name").text = profile.get(
-            "video_encoder_configuration", ""
+    fragments = [
+        _PROFILE_TMPL
+        % (
+            _xml_attribute_bytes(profile.get("token", "")),
+            _xml_bytes(profile.get("name", "")),
+            _xml_bytes(profile.get("video_encoder_configuration", "")),
+            _xml_bytes(profile.get("audio_encoder_configuration", "")),
         )
-        ae = ET.SubElement(
-            profile_el,
-            f"{{{TRT_NS}}}AudioEncoderConfiguration",
-        )
-        ET.SubElement(ae, f"{{{TRT_NS}}}Name").text = profile.get(
-            "audio_encoder_configuration", ""
-        )
-    return _soap_envelope(response)
+        for profile in media_rest.pipeline_manager.list_profiles()
+    ]
+    return Response(
+        content=_PROFILES_PROLOGUE + b"".join(fragments) + _PROFILES_EPILOGUE,
+        media_type="application/soap+xml",
+    )
+
+
+_STREAM_URI_TMPL = _envelope_template(
+    "trt",
+    "<trt:GetStreamUriResponse><trt:MediaUri><trt:Uri>%s</trt:Uri>"
+    "<trt:InvalidAfterConnect>false</trt:InvalidAfterConnect>"
+    "<trt:InvalidAfterReboot>false</trt:InvalidAfterReboot>"
+    "<trt:Timeout>PT60S</trt:Timeout></trt:MediaUri></trt:GetStreamUriResponse>",
+)
 
 
 def _media_get_stream_uri(operation: Element | None = None) -> Response:
     uri = media_rest.get_stream_uri()
-    response = ET.Element(f"{{{TRT_NS}}}GetStreamUriResponse")
-    stream = ET.SubElement(response, f"{{{TRT_NS}}}MediaUri")
-    ET.SubElement(stream, f"{{{TRT_NS}}}Uri").text = uri["uri"]
-    ET.SubElement(stream, f"{{{TRT_NS}}}InvalidAfterConnect").text = "false"
-    ET.SubElement(stream, f"{{{TRT_NS}}}InvalidAfterReboot").text = "false"
-    ET.SubElement(stream, f"{{{TRT_NS}}}Timeout").text = "PT60S"
-    return _soap_envelope(response)
+    return _template_response(_STREAM_URI_TMPL, uri["uri"])
+
+
+_CREATE_SUBSCRIPTION_TMPL = _envelope_template(
+    "tev",
+    "<tev:CreatePullPointSubscriptionResponse><tev:SubscriptionReference>"
+    "<tev:Address>%s</tev:Address></tev:SubscriptionReference>"
+    "<tev:CurrentTime>%s</tev:CurrentTime><tev:TerminationTime>%s</tev:TerminationTime>"
+    "</tev:CreatePullPointSubscriptionResponse>",
+)
+_RENEW_TMPL = _envelope_template(
+    "tev", "<tev:RenewResponse><tev:TerminationTime>%s</tev:TerminationTime></tev:RenewResponse>"
+)
+_UNSUBSCRIBE_TMPL = _envelope_template(
+    "tev", "<tev:UnsubscribeResponse><tev:Status>Unsubscribed</tev:Status></tev:UnsubscribeResponse>"
+)
 
 
 def _events_create_subscription(operation: Element | None = None) -> Response:
     topics = _extract_topic_filters(operation) if operation is not None else set()
-    termination_el = operation.find(".//{*}InitialTerminationTime") if operation is not None else None
+    termination_el = _find(operation, "{*}InitialTerminationTime")
     termination_time = _parse_duration(termination_el.text if termination_el is not None else None)
-    remaining_seconds = max(
-        1, int((termination_time - datetime.now(timezone.utc)).total_seconds())
-    )
-    result = events_rest.create_subscription(
-        topics=list(topics), termination_seconds=remaining_seconds
-    )
-    response = ET.Element(f"{{{TEV_NS}}}CreatePullPointSubscriptionResponse")
-    sub = ET.SubElement(response, f"{{{TEV_NS}}}SubscriptionReference")
-    ET.SubElement(sub, f"{{{TEV_NS}}}Address").text = result["subscription_id"]
-    ET.SubElement(response, f"{{{TEV_NS}}}CurrentTime").text = result["expires"]
-    ET.SubElement(response, f"{{{TEV_NS}}}TerminationTime").text = result["expires"]
-    return _soap_envelope(response)
+    termination_time = max(termination_time, _request_now() + timedelta(seconds=1))
+    subscription = notifications.create_subscription(topics=topics, termination=termination_time)
+    expires = subscription.termination_time.isoformat()
+    return _template_response(_CREATE_SUBSCRIPTION_TMPL, subscription.token, expires, expires)
+
+
+_PULL_MESSAGES_PROLOGUE, _PULL_MESSAGES_EPILOGUE = _envelope_template(
+    "tev", "<tev:PullMessagesResponse>%s</tev:PullMessagesResponse>"
+).split(b"%s")
+
+
+_NOTIFICATION_TMPL = (
+    "<tev:NotificationMessage><tev:Topic>{topic}</tev:Topic><tev:Message>{inner}"
+    "<tev:UtcTime>{utc}</tev:UtcTime><tev:SequenceNumber>{seq}</tev:SequenceNumber>"
+    "</tev:Message></tev:NotificationMessage>"
+)
+
+
+def _notification_fragments(messages: list[dict[str, object]]) -> Iterator[bytes]:
+    for message in messages:
+        message_body = message.get("Message", {}) or {}
+        inner = "".join(
+            f"<tev:{key}>{xml_escape(str(value))}</tev:{key}>" for key, value in message_body.items()
+        )
+        yield _NOTIFICATION_TMPL.format(
+            topic=xml_escape(str(message.get("Topic"))),
+            inner=inner,
+            utc=xml_escape(str(message.get("UtcTime"))),
+            seq=xml_escape(str(message.get("Sequence"))),
+        ).encode()
 
 
 def _events_pull_messages(operation: Element | None = None) -> Response:
     token = _extract_subscription_token(operation) if operation is not None else None
-    message_limit_text = operation.findtext(".//{*}MessageLimit") if operation is not None else None
+    message_limit_text = _find_text(operation, "{*}MessageLimit")
     message_limit = int(message_limit_text or 10)
-    result = events_rest.pull_messages(subscription_id=token, message_limit=message_limit)
-    response = ET.Element(f"{{{TEV_NS}}}PullMessagesResponse")
-    for message in result.get("messages", []):
-        msg_holder = ET.SubElement(response, f"{{{TEV_NS}}}NotificationMessage")
-        ET.SubElement(msg_holder, f"{{{TEV_NS}}}Topic").text = str(message.get("Topic"))
-        msg = ET.SubElement(msg_holder, f"{{{TEV_NS}}}Message")
-        message_body = message.get("Message", {}) or {}
-        for key, value in message_body.items():
-            ET.SubElement(msg, f"{{{TEV_NS}}}{key}").text = str(value)
-        ET.SubElement(msg, f"{{{TEV_NS}}}UtcTime").text = str(message.get("UtcTime"))
-        ET.SubElement(msg, f"{{{TEV_NS}}}SequenceNumber").text = str(message.get("Sequence"))
-    return _soap_envelope(response)
+    messages = (
+        notifications.pull_messages(token=token, message_limit=message_limit)
+        if config_manager.get_user_settings().events_enabled
+        else []
+    )
+    # Messages are dequeued up front; only their rendering is deferred to the stream.
+    return _stream_envelope(
+        _PULL_MESSAGES_PROLOGUE, _notification_fragments(messages), _PULL_MESSAGES_EPILOGUE
+    )
 
 
 def _events_renew(operation: Element | None = None) -> Response:
     token = _extract_subscription_token(operation) if operation is not None else None
-    termination_el = operation.find(".//{*}TerminationTime") if operation is not None else None
+    termination_el = _find(operation, "{*}TerminationTime")
     termination = _parse_duration(termination_el.text if termination_el is not None else None)
     subscription = notifications.renew(termination, token=token)
-    response = ET.Element(f"{{{TEV_NS}}}RenewResponse")
-    ET.SubElement(response, f"{{{TEV_NS}}}TerminationTime").text = subscription.termination_time.isoformat()
-    return _soap_envelope(response)
+    return _template_response(_RENEW_TMPL, subscription.termination_time.isoformat())
 
 
 def _events_unsubscribe(operation: Element | None = None) -> Response:
     token = _extract_subscription_token(operation) if operation is not None else None
     notifications.unsubscribe(token=token)
-    response = ET.Element(f"{{{TEV_NS}}}UnsubscribeResponse")
-    ET.SubElement(response, f"{{{TEV_NS}}}Status").text = "Unsubscribed"
-    return _soap_envelope(response)
+    return _template_response(_UNSUBSCRIBE_TMPL)
+
+
+_RECORDING_JOBS_PROLOGUE, _RECORDING_JOBS_EPILOGUE = _envelope_template(
+    "trc", "<trc:GetRecordingJobsResponse>%s</trc:GetRecordingJobsResponse>"
+).split(b"%s")
+_JOB_CONFIGURATION_TMPL = (
+    b"<trc:JobConfiguration><trc:JobToken>%s</trc:JobToken>"
+    b"<trc:RecordingToken>%s</trc:RecordingToken><trc:State>%s</trc:State></trc:JobConfiguration>"
+)
+_JOB_STATE_PROLOGUE, _JOB_STATE_EPILOGUE = _envelope_template(
+    "trc", "<trc:GetRecordingJobStateResponse>%s</trc:GetRecordingJobStateResponse>"
+).split(b"%s")
+_JOB_STATE_FIELDS_TMPL = b"<trc:JobToken>%s</trc:JobToken><trc:State>%s</trc:State>"
+_TRACK_STATE_TMPL = b"<trc:Tracks><trc:TrackToken>%s</trc:TrackToken><trc:State>%s</trc:State></trc:Tracks>"
+_FIND_RECORDINGS_PROLOGUE, _FIND_RECORDINGS_EPILOGUE = _envelope_template(
+    "trc", "<trc:FindRecordingsResponse>%s</trc:FindRecordingsResponse>"
+).split(b"%s")
+_RECORDING_INFORMATION_PROLOGUE, _RECORDING_INFORMATION_EPILOGUE = _envelope_template(
+    "trc", "<trc:GetRecordingInformationResponse>%s</trc:GetRecordingInformationResponse>"
+).split(b"%s")
+_RECORDING_TMPL = (
+    b"<trc:RecordingInformation><trc:RecordingToken>%s</trc:RecordingToken>"
+    b"<trc:SourceToken>%s</trc:SourceToken><trc:EarliestRecording>%s</trc:EarliestRecording>"
+    b"<trc:LatestRecording>%s</trc:LatestRecording>"
+)
+_TRACK_TMPL = (
+    b"<trc:Tracks><trc:TrackToken>%s</trc:TrackToken><trc:StartTime>%s</trc:StartTime>"
+    b"<trc:EndTime>%s</trc:EndTime></trc:Tracks>"
+)
+
+
+def _utc_bytes(value: datetime) -> bytes:
+    # isoformat() never produces characters that need escaping.
+    return value.replace(tzinfo=timezone.utc).isoformat().encode()
+
+
+def _render_recording(out: bytearray, rec: RecordingMetadata) -> None:
+    out += _RECORDING_TMPL % (
+        _xml_bytes(rec.recording_token),
+        _xml_bytes(rec.source_token),
+        _utc_bytes(rec.start_time),
+        _utc_bytes(rec.end_time),
+    )
+    for track in rec.tracks:
+        out += _TRACK_TMPL % (
+            _xml_bytes(track.track_token),
+            _utc_bytes(track.start_time),
+            _utc_bytes(track.end_time),
+        )
+    out += b"</trc:RecordingInformation>"
+
+
+def _bytes_response(out: bytearray) -> Response:
+    return Response(content=bytes(out), media_type="application/soap+xml")
 
 
 def _recording_get_jobs(operation: Element | None = None) -> Response:
-    jobs = recording_rest.list_recording_jobs()
-    response = ET.Element(f"{{{TRC_NS}}}GetRecordingJobsResponse")
-    for job in jobs:
-        job_el = ET.SubElement(response, f"{{{TRC_NS}}}JobConfiguration")
-        ET.SubElement(job_el, f"{{{TRC_NS}}}JobToken").text = job.get("id", "")
-        ET.SubElement(job_el, f"{{{TRC_NS}}}RecordingToken").text = job.get(
-            "source", ""
+    out = bytearray(_RECORDING_JOBS_PROLOGUE)
+    for job in recording_store.list_jobs():
+        out += _JOB_CONFIGURATION_TMPL % (
+            _xml_bytes(job.job_token),
+            _xml_bytes(job.source_token),
+            _xml_bytes(job.state),
         )
-        ET.SubElement(job_el, f"{{{TRC_NS}}}State").text = job.get("status", "")
-    return _soap_envelope(response)
+    out += _RECORDING_JOBS_EPILOGUE
+    return _bytes_response(out)
+
+
+_CREATE_JOB_TMPL = _envelope_template(
+    "trc",
+    "<trc:CreateRecordingJobResponse><trc:JobToken>%s</trc:JobToken>"
+    "<trc:JobState>%s</trc:JobState></trc:CreateRecordingJobResponse>",
+)
+_REPLAY_URI_TMPL = _envelope_template(
+    "trc", "<trc:GetReplayUriResponse><trc:Uri>%s</trc:Uri></trc:GetReplayUriResponse>"
+)
+_EXPORT_TMPL = _envelope_template(
+    "trc",
+    "<trc:ExportRecordedDataResponse><trc:JobToken>%s</trc:JobToken>"
+    "<trc:State>%s</trc:State></trc:ExportRecordedDataResponse>",
+)
 
 
 def _recording_create_job(operation: Element | None = None) -> Response:
-    source = operation.findtext(".//{*}SourceToken") if operation is not None else None
+    source = _find_text(operation, "{*}SourceToken")
     created = recording_store.create_job(source or "profile1")
     pipeline.add_recording_trigger(created.source_token)
-    response = ET.Element(f"{{{TRC_NS}}}CreateRecordingJobResponse")
-    ET.SubElement(response, f"{{{TRC_NS}}}JobToken").text = created.job_token
-    ET.SubElement(response, f"{{{TRC_NS}}}JobState").text = created.state
-    return _soap_envelope(response)
+    return _template_response(_CREATE_JOB_TMPL, created.job_token, created.state)
 
 
 def _recording_get_job_state(operation: Element | None = None) -> Response:
-    token = operation.findtext(".//{*}JobToken") if operation is not None else None
+    token = _find_text(operation, "{*}JobToken")
     if not token:
         return _fault("JobToken missing")
     try:
         job = recording_store.get_job(token)
     except Exception:
         return _fault(f"Job {token} not found")
-    response = ET.Element(f"{{{TRC_NS}}}GetRecordingJobStateResponse")
-    ET.SubElement(response, f"{{{TRC_NS}}}JobToken").text = token
-    ET.SubElement(response, f"{{{TRC_NS}}}State").text = job.state
+    out = bytearray(_JOB_STATE_PROLOGUE)
+    out += _JOB_STATE_FIELDS_TMPL % (_xml_bytes(token), _xml_bytes(job.state))
     for track_token, state in job.track_states.items():
-        track_el = ET.SubElement(response, f"{{{TRC_NS}}}Tracks")
-        ET.SubElement(track_el, f"{{{TRC_NS}}}TrackToken").text = track_token
-        ET.SubElement(track_el, f"{{{TRC_NS}}}State").text = state
-    return _soap_envelope(response)
+        out += _TRACK_STATE_TMPL % (_xml_bytes(track_token), _xml_bytes(state))
+    out += _JOB_STATE_EPILOGUE
+    return _bytes_response(out)
 
 
 def _recording_find_recordings(operation: Element | None = None) -> Response:
-    start_text = operation.findtext(".//{*}StartTime") if operation is not None else None
-    end_text = operation.findtext(".//{*}EndTime") if operation is not None else None
-    source_token = operation.findtext(".//{*}SourceToken") if operation is not None else None
+    start_text = _find_text(operation, "{*}StartTime")
+    end_text = _find_text(operation, "{*}EndTime")
+    source_token = _find_text(operation, "{*}SourceToken")
     try:
         start_time = datetime.fromisoformat(start_text) if start_text else datetime.min.replace(tzinfo=timezone.utc)
         end_time = datetime.fromisoformat(end_text) if end_text else datetime.max.replace(tzinfo=timezone.utc)
     except ValueError:
         return _fault("Invalid time range")
     results = recording_store.search_recordings(start_time, end_time, source_token)
-    response = ET.Element(f"{{{TRC_NS}}}FindRecordingsResponse")
+    out = bytearray(_FIND_RECORDINGS_PROLOGUE)
     for rec in results:
-        info = ET.SubElement(response, f"{{{TRC_NS}}}RecordingInformation")
-        ET.SubElement(info, f"{{{TRC_NS}}}RecordingToken").text = rec.recording_token
-        ET.SubElement(info, f"{{{TRC_NS}}}SourceToken").text = rec.source_token
-        ET.SubElement(info, f"{{{TRC_NS}}}EarliestRecording").text = rec.start_time.replace(tzinfo=timezone.utc).isoformat()
-        ET.SubElement(info, f"{{{TRC_NS}}}LatestRecording").text = rec.end_time.replace(tzinfo=timezone.utc).isoformat()
-        for track in rec.tracks:
-            track_el = ET.SubElement(info, f"{{{TRC_NS}}}Tracks")
-            ET.SubElement(track_el, f"{{{TRC_NS}}}TrackToken").text = track.track_token
-            ET.SubElement(track_el, f"{{{TRC_NS}}}StartTime").text = track.start_time.replace(tzinfo=timezone.utc).isoformat()
-            ET.SubElement(track_el, f"{{{TRC_NS}}}EndTime").text = track.end_time.replace(tzinfo=timezone.utc).isoformat()
-    return _soap_envelope(response)
+        _render_recording(out, rec)
+    out += _FIND_RECORDINGS_EPILOGUE
+    return _bytes_response(out)
 
 
 def _recording_get_recording_information(operation: Element | None = None) -> Response:
-    recording_token = operation.findtext(".//{*}RecordingToken") if operation is not None else None
+    recording_token = _find_text(operation, "{*}RecordingToken")
     if not recording_token:
         return _fault("RecordingToken missing")
     try:
         rec = recording_store.get_recording(recording_token)
     except ValueError:
         return _fault(f"Recording {recording_token} not found")
-    response = ET.Element(f"{{{TRC_NS}}}GetRecordingInformationResponse")
-    info = ET.SubElement(response, f"{{{TRC_NS}}}RecordingInformation")
-    ET.SubElement(info, f"{{{TRC_NS}}}RecordingToken").text = rec.recording_token
-    ET.SubElement(info, f"{{{TRC_NS}}}SourceToken").text = rec.source_token
-    ET.SubElement(info, f"{{{TRC_NS}}}EarliestRecording").text = rec.start_time.replace(tzinfo=timezone.utc).isoformat()
-    ET.SubElement(info, f"{{{TRC_NS}}}LatestRecording").text = rec.end_time.replace(tzinfo=timezone.utc).isoformat()
-    for track in rec.tracks:
-        track_el = ET.SubElement(info, f"{{{TRC_NS}}}Tracks")
-        ET.SubElement(track_el, f"{{{TRC_NS}}}TrackToken").text = track.track_token
-        ET.SubElement(track_el, f"{{{TRC_NS}}}StartTime").text = track.start_time.replace(tzinfo=timezone.utc).isoformat()
-        ET.SubElement(track_el, f"{{{TRC_NS}}}EndTime").text = track.end_time.replace(tzinfo=timezone.utc).isoformat()
-    return _soap_envelope(response)
+    out = bytearray(_RECORDING_INFORMATION_PROLOGUE)
+    _render_recording(out, rec)
+    out += _RECORDING_INFORMATION_EPILOGUE
+    return _bytes_response(out)
 
 
 def _recording_get_replay_uri(operation: Element | None = None) -> Response:
-    recording_token = operation.findtext(".//{*}RecordingToken") if operation is not None else None
+    recording_token = _find_text(operation, "{*}RecordingToken")
     if not recording_token:
         return _fault("RecordingToken missing")
     try:
         recording_store.get_recording(recording_token)
     except ValueError:
         return _fault(f"Recording {recording_token} not found")
-    response = ET.Element(f"{{{TRC_NS}}}GetReplayUriResponse")
-    ET.SubElement(response, f"{{{TRC_NS}}}Uri").text = f"rtsp://localhost:8554/{recording_token}"
-    return _soap_envelope(response)
+    return _template_response(_REPLAY_URI_TMPL, f"rtsp://localhost:8554/{recording_token}")
 
 
 def _recording_export_recorded_data(operation: Element | None = None) -> Response:
-    recording_token = operation.findtext(".//{*}RecordingToken") if operation is not None else None
-    track_token = operation.findtext(".//{*}TrackToken") if operation is not None else None
+    recording_token = _find_text(operation, "{*}RecordingToken")
+    track_token = _find_text(operation, "{*}TrackToken")
     if not recording_token:
         return _fault("RecordingToken missing")
     try:
         export_job = recording_store.create_export_job(recording_token, track_token)
     except ValueError:
         return _fault(f"Recording {recording_token} not found")
-    response = ET.Element(f"{{{TRC_NS}}}ExportRecordedDataResponse")
-    ET.SubElement(response, f"{{{TRC_NS}}}JobToken").text = export_job.job_token
-    ET.SubElement(response, f"{{{TRC_NS}}}State").text = export_job.state
-    return _soap_envelope(response)
+    return _template_response(_EXPORT_TMPL, export_job.job_token, export_job.state)
+
+
+_CONTINUOUS_MOVE_TMPL = _envelope_template(
+    "tptz",
+    "<tptz:ContinuousMoveResponse><tptz:Pan>%s</tptz:Pan><tptz:Tilt>%s</tptz:Tilt>"
+    "<tptz:Zoom>%s</tptz:Zoom><tptz:Status>%s</tptz:Status></tptz:ContinuousMoveResponse>",
+)
+_PTZ_STOP_RESPONSE = _envelope_template(
+    "tptz", "<tptz:StopResponse><tptz:Status>stopped</tptz:Status></tptz:StopResponse>"
+)
 
 
 def _ptz_continuous_move(operation: Element | None = None) -> Response:
     result = ptz_rest.continuous_move()
-    response = ET.Element(f"{{{PTZ_NS}}}ContinuousMoveResponse")
-    ET.SubElement(response, f"{{{PTZ_NS}}}Pan").text = str(result.get("pan", 0.0))
-    ET.SubElement(response, f"{{{PTZ_NS}}}Tilt").text = str(result.get("tilt", 0.0))
-    ET.SubElement(response, f"{{{PTZ_NS}}}Zoom").text = str(result.get("zoom", 0.0))
-    ET.SubElement(response, f"{{{PTZ_NS}}}Status").text = result.get("status", "")
-    return _soap_envelope(response)
+    return _template_response(
+        _CONTINUOUS_MOVE_TMPL,
+        result.get("pan", 0.0),
+        result.get("tilt", 0.0),
+        result.get("zoom", 0.0),
+        result.get("status", ""),
+    )
 
 
 def _ptz_stop(operation: Element | None = None) -> Response:
-    result = ptz_rest.stop_move()
-    response = ET.Element(f"{{{PTZ_NS}}}StopResponse")
-    ET.SubElement(response, f"{{{PTZ_NS}}}Status").text = result.get("status", "")
-    return _soap_envelope(response)
+    ptz_rest.stop_move()
+    return Response(content=_PTZ_STOP_RESPONSE, media_type="application/soap+xml")
+
 
+OperationMap = Dict[str, Callable[[Element | None], Response]]
 
-_DEVICE_OPERATIONS: Dict[str, Callable[[Element | None], Response]] = {
+_DEVICE_OPERATIONS: OperationMap = {
     "GetCapabilities": _device_get_capabilities,
     "GetDeviceInformation": _device_get_information,
     "GetNetworkInterfaces": _device_get_network_interfaces,
@@ -612,19 +938,19 @@ _DEVICE_OPERATIONS: Dict[str, Callable[[Element | None], Response]] = {
     "SetHostname": _device_set_hostname,
 }
 
-_MEDIA_OPERATIONS: Dict[str, Callable[[Element | None], Response]] = {
+_MEDIA_OPERATIONS: OperationMap = {
     "GetProfiles": _media_get_profiles,
     "GetStreamUri": _media_get_stream_uri,
 }
 
-_EVENTS_OPERATIONS: Dict[str, Callable[[Element | None], Response]] = {
+_EVENTS_OPERATIONS: OperationMap = {
     "CreatePullPointSubscription": _events_create_subscription,
     "PullMessages": _events_pull_messages,
     "Renew": _events_renew,
     "Unsubscribe": _events_unsubscribe,
 }
 
-_RECORDING_OPERATIONS: Dict[str, Callable[[Element | None], Response]] = {
+_RECORDING_OPERATIONS: OperationMap = {
     "GetRecordingJobs": _recording_get_jobs,
     "CreateRecordingJob": _recording_create_job,
     "GetRecordingJobState": _recording_get_job_state,
@@ -634,14 +960,39 @@ _RECORDING_OPERATIONS: Dict[str, Callable[[Element | None], Response]] = {
     "ExportRecordedData": _recording_export_recorded_data,
 }
 
-_PTZ_OPERATIONS: Dict[str, Callable[[Element | None], Response]] = {
+_PTZ_OPERATIONS: OperationMap = {
     "ContinuousMove": _ptz_continuous_move,
     "Stop": _ptz_stop,
 }
 
 
-ServiceMap = Dict[str, Dict[str, Callable[[Element | None], Response]]]
-_SERVICE_OPERATIONS: ServiceMap = {
+# ONVIF's PRE_AUTH access class: clients call these while probing a device, before
+# they have credentials. GetDeviceInformation is READ_SYSTEM and stays authenticated.
+# Every entry must also be argument-less, since they are answered without a parse.
+_ANONYMOUS_OPERATIONS = frozenset({"GetCapabilities"})
+
+# Handlers that never read their operation element.
+_ARGUMENTLESS_OPERATIONS = frozenset(
+    {
+        "GetCapabilities",
+        "GetDeviceInformation",
+        "GetNetworkInterfaces",
+        "GetDNS",
+        "GetNTP",
+        "GetHostname",
+        "GetProfiles",
+        "GetStreamUri",
+        "GetRecordingJobs",
+        "ContinuousMove",
+        "Stop",
+    }
+)
+
+# Handlers that reconfigure the host through system_control, whose commands block
+# for up to several seconds; they run on the threadpool instead of the event loop.
+_SYSTEM_OPERATIONS = frozenset({"SetNetworkInterfaces", "SetDNS", "SetNTP", "SetHostname"})
+
+_SERVICE_OPERATIONS: Dict[str, OperationMap] = {
     "device": _DEVICE_OPERATIONS,
     "media": _MEDIA_OPERATIONS,
     "events": _EVENTS_OPERATIONS,
@@ -652,41 +1003,69 @@ _SERVICE_OPERATIONS: ServiceMap = {
 router = APIRouter(prefix="/onvif", tags=["soap"])
 
 
-async def _dispatch(service: str, request: Request, store: UserStore) -> Response:
-    content = await request.body()
-    envelope, operation, operation_name = _parse_operation(content)
-    _require_username_token(envelope, store, request)
-
-    operations = _SERVICE_OPERATIONS.get(service)
-    if not operations or operation_name not in operations:
-        logger.warning("Unsupported SOAP operation %s for %s", operation_name, service)
-        return _fault(f"Unsupported operation: {operation_name}")
-
-    return operations[operation_name](operation)
+def _is_large_body(request: Request) -> bool:
+    content_length = request.headers.get("content-length", "")
+    return _LXML and content_length.isdigit() and int(content_length) >= _STREAMED_PARSE_MIN_BYTES
 
 
-@router.post("/device_service")
-async def device_service(request: Request, store: UserStore = Depends(get_user_store)) -> Response:
-    return await _dispatch("device", request, store)
+async def _dispatch(operations: OperationMap, request: Request, store: UserStore) -> Response:
+    token = _REQUEST_NOW.set(None)
+    try:
+        return await _dispatch_request(operations, request, store)
+    finally:
+        _REQUEST_NOW.reset(token)
 
 
-@router.post("/media_service")
-async def media_service(request: Request, store: UserStore = Depends(get_user_store)) -> Response:
-    return await _dispatch("media", request, store)
+async def _dispatch_request(operations: OperationMap, request: Request, store: UserStore) -> Response:
+    if _is_large_body(request):
+        envelope, operation, operation_name = await _parse_streamed_operation(request)
+        if operation_name not in _ANONYMOUS_OPERATIONS:
+            _require_username_token(envelope, store, request)
+        return await _call_operation(operations, operation, operation_name, request)
 
+    content = await request.body()
+    peeked = _peek_operation_name(content)
+    if peeked in _ANONYMOUS_OPERATIONS:
+        handler = operations.get(peeked)
+        if handler is not None:
+            return handler(None)
+
+    if b"Security" in content:
+        envelope, operation, operation_name = _parse_operation(content)
+        if operation_name not in _ANONYMOUS_OPERATIONS:
+            _require_username_token(envelope, store, request)
+    else:
+        # Without a WS-Security header only the HTTP headers can carry credentials, so
+        # they are checked before any parsing, and operations that take no arguments
+        # skip the XML parse entirely.
+        _require_username_token(None, store, request)
+        if peeked in _ARGUMENTLESS_OPERATIONS:
+            handler = operations.get(peeked)
+            if handler is not None:
+                return handler(None)
+        _, operation, operation_name = _parse_operation(content)
+
+    return await _call_operation(operations, operation, operation_name, request)
+
+
+async def _call_operation(
+    operations: OperationMap, operation: Element, operation_name: str, request: Request
+) -> Response:
+    handler = operations.get(operation_name)
+    if handler is None:
+        logger.warning("Unsupported SOAP operation %s for %s", operation_name, request.url.path)
+        return _fault(f"Unsupported operation: {operation_name}")
 
-@router.post("/events_service")
-async def events_service(request: Request, store: UserStore = Depends(get_user_store)) -> Response:
-    return await _dispatch("events", request, store)
+    if operation_name in _SYSTEM_OPERATIONS:
+        return await run_in_threadpool(handler, operation)
+    return handler(operation)
 
 
-@router.post("/recording_service")
-async def recording_service(
-    request: Request, store: UserStore = Depends(get_user_store)
+@router.post("/{service}_service")
+async def onvif_service(
+    service: str, request: Request, store: UserStore = Depends(get_user_store)
 ) -> Response:
-    return await _dispatch("recording", request, store)
-
-
-@router.post("/ptz_service")
-async def ptz_service(request: Request, store: UserStore = Depends(get_user_store)) -> Response:
-    return await _dispatch("ptz", request, store)
+    operations = _SERVICE_OPERATIONS.get(service)
+    if operations is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return await _dispatch(operations, request, store)
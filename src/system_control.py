@@ -2,28 +2,37 @@
 
 from __future__ import annotations
 
+import functools
 import ipaddress
 import logging
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from src.config import NetworkMode, NetworkSettings, NTPSettings
+from src.config import NetworkMode, NetworkSettings, NTPSettings, _ensure_dir
 
 
 logger = logging.getLogger(__name__)
 
 
-def _run_command(command: list[str]) -> None:
+@functools.lru_cache(maxsize=32)
+def _which(executable: str) -> str | None:
+    """Resolve ``executable`` on PATH once per process; ``cache_clear()`` forgets results."""
+
+    return shutil.which(executable)
+
+
+def _run_command(command: list[str], stdin: str | None = None) -> None:
     """Run a system command if available, logging warnings on failure."""
 
     executable = command[0]
-    if shutil.which(executable) is None:
+    if _which(executable) is None:
         logger.warning("Command %s not available on this system", executable)
         return
 
     try:
-        subprocess.run(command, check=False, timeout=5)
+        subprocess.run(command, input=stdin, text=stdin is not None, check=False, timeout=5)
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.warning("Failed to run %s: %s", " ".join(command), exc)
 
@@ -32,18 +41,27 @@ def _write_file(path: Path, content: str) -> None:
     """Safely write a configuration file if permissions allow."""
 
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(path.parent)
         path.write_text(content, encoding="utf-8")
     except Exception as exc:  # pragma: no cover - environment dependent
         logger.warning("Unable to write %s: %s", path, exc)
 
 
+# The 33 canonical dotted netmasks; anything else falls back to ipaddress parsing.
+_PREFIX_TO_NETMASK = tuple(str(ipaddress.IPv4Network(f"0.0.0.0/{p}").netmask) for p in range(33))
+_NETMASK_TO_PREFIX = {netmask: prefix for prefix, netmask in enumerate(_PREFIX_TO_NETMASK)}
+
+
 def _netmask_to_prefix(netmask: str) -> int:
-    network = ipaddress.IPv4Network(f"0.0.0.0/{netmask}")
-    return network.prefixlen
+    prefix = _NETMASK_TO_PREFIX.get(netmask)
+    if prefix is not None:
+        return prefix
+    return ipaddress.IPv4Network(f"0.0.0.0/{netmask}").prefixlen
 
 
 def _prefix_to_netmask(prefix: int) -> str:
+    if 0 <= prefix <= 32:
+        return _PREFIX_TO_NETMASK[prefix]
     return str(ipaddress.IPv4Network(f"0.0.0.0/{prefix}").netmask)
 
 
@@ -83,47 +101,55 @@ def apply_dns(servers: list[str]) -> None:
 def apply_network(settings: NetworkSettings) -> None:
     """Apply network settings using iproute2 utilities."""
 
+    _apply_address(settings)
+    apply_dns(settings.dns_servers)
+    _write_dhcpcd_config(settings)
+
+
+def _apply_address(settings: NetworkSettings) -> None:
+    """Renew the DHCP lease or set the static address, depending on the mode."""
+
     if settings.mode == NetworkMode.dhcp:
         _run_command(["dhclient", "-r", settings.interface])
         _run_command(["dhclient", settings.interface])
     else:
-        prefix = _netmask_to_prefix(settings.subnet_mask or "255.255.255.0")
-        _run_command(["ip", "addr", "flush", "dev", settings.interface])
-        if settings.static_ip:
-            _run_command(
-                [
-                    "ip",
-                    "addr",
-                    "add",
-                    f"{settings.static_ip}/{prefix}",
-                    "dev",
-                    settings.interface,
-                ]
-            )
-        if settings.gateway:
-            _run_command(
-                [
-                    "ip",
-                    "route",
-                    "replace",
-                    "default",
-                    "via",
-                    settings.gateway,
-                    "dev",
-                    settings.interface,
-                ]
-            )
+        _apply_static_address(settings)
 
-    apply_dns(settings.dns_servers)
-    _write_dhcpcd_config(settings)
+
+def _apply_static_address(settings: NetworkSettings) -> None:
+    """Flush the interface and set its address and default route in one ip -batch run."""
+
+    values = [v for v in (settings.interface, settings.static_ip, settings.gateway) if v]
+    if any(len(value.split()) != 1 for value in values):
+        # Each batch line is split on whitespace, so refuse values that could
+        # smuggle in extra arguments or commands. Like a failed ip invocation,
+        # this only skips the address step; DNS and dhcpcd are still applied.
+        logger.warning("Refusing network settings with embedded whitespace: %r", values)
+        return
+    prefix = _netmask_to_prefix(settings.subnet_mask or "255.255.255.0")
+    # One iproute2 process for the whole change; -force keeps going past a
+    # failed line the way separate invocations did.
+    commands = [f"addr flush dev {settings.interface}"]
+    if settings.static_ip:
+        commands.append(f"addr add {settings.static_ip}/{prefix} dev {settings.interface}")
+    if settings.gateway:
+        commands.append(f"route replace default via {settings.gateway} dev {settings.interface}")
+    _run_command(["ip", "-force", "-batch", "-"], stdin="\n".join(commands) + "\n")
 
 
 def apply_all(network: NetworkSettings, ntp: NTPSettings) -> None:
-    """Apply all system-related settings in order."""
+    """Apply all system-related settings, overlapping NTP with the config file writes."""
 
+    # dhclient sends the system hostname in its DHCP request, so the hostname
+    # must be set first, and timesyncd must not restart while the lease is
+    # released. Only the DNS and dhcpcd writes are independent of NTP.
     apply_hostname(network.hostname)
-    apply_network(network)
-    apply_ntp(ntp)
+    _apply_address(network)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="apply") as pool:
+        ntp_applied = pool.submit(apply_ntp, ntp)
+        apply_dns(network.dns_servers)
+        _write_dhcpcd_config(network)
+        ntp_applied.result()
 
 
 def _write_dhcpcd_config(settings: NetworkSettings) -> None:
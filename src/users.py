@@ -5,21 +5,85 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import secrets
 import sys
 import tempfile
 import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
 
+import orjson
 import yaml
 from passlib.context import CryptContext
 from pydantic import BaseModel, Field, field_validator
 
+from src.config import _ensure_dir
 
-_DEFAULT_ROLES = {"admin", "operator", "viewer"}
+try:  # Prefer libyaml's C implementation when PyYAML was built with it.
+    from yaml import CSafeDumper as _SafeDumper, CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeDumper as _SafeDumper, SafeLoader as _SafeLoader
+
+
+_DEFAULT_ROLES = frozenset({"admin", "operator", "viewer"})
 _DEFAULT_ADMIN_PASSWORD = "admin123"
 
+# Parsed user files keyed by absolute path and stamped with the (st_mtime_ns, st_size)
+# they were read at, so new stores and cold loads skip the YAML parse.
+_USERS_FILE_CACHE: OrderedDict[str, tuple[tuple[int, int], dict[str, "User"]]] = OrderedDict()
+_USERS_FILE_CACHE_SIZE = 100
+_USERS_FILE_CACHE_LOCK = threading.Lock()
+
+# Linux can create the replacement file with no directory entry (O_TMPFILE) and
+# name it only once it is complete, so a failed write leaves nothing to clean up.
+_HAS_O_TMPFILE = hasattr(os, "O_TMPFILE") and os.path.isdir("/proc/self/fd")
+
+
+def _remember_users_file(key: str, stamp: tuple[int, int], users: dict[str, "User"]) -> None:
+    with _USERS_FILE_CACHE_LOCK:
+        _USERS_FILE_CACHE[key] = (stamp, dict(users))
+        _USERS_FILE_CACHE.move_to_end(key)
+        while len(_USERS_FILE_CACHE) > _USERS_FILE_CACHE_SIZE:
+            _USERS_FILE_CACHE.popitem(last=False)
+
+
+_pwd_context: CryptContext | None = None
+_pwd_context_lock = threading.Lock()
+# Verified against when a username is unknown so failed logins cost the same either way.
+_dummy_hash: str | None = None
+# Hashes that start with the current scheme's "$argon2id$v=..$m=..,t=..,p=..$" settings
+# need no upgrade, so they can be verified by the handler without context dispatch.
+_pwd_handler = None
+_current_hash_prefix = ""
+
+
+def _get_pwd_context() -> CryptContext:
+    """Return the process-wide CryptContext, building it on first use."""
+
+    global _pwd_context, _dummy_hash, _pwd_handler, _current_hash_prefix
+    if _pwd_context is None:
+        with _pwd_context_lock:
+            if _pwd_context is None:
+                # Argon2id (via argon2-cffi) is memory-hard, so a ~7 MiB, two-pass
+                # setting verifies faster than PBKDF2 at a comparable attacker cost.
+                # PBKDF2-SHA256 stays listed so existing hashes still verify and are
+                # upgraded on login.
+                context = CryptContext(
+                    schemes=["argon2", "pbkdf2_sha256"],
+                    deprecated=["pbkdf2_sha256"],
+                    argon2__memory_cost=7168,
+                    argon2__time_cost=2,
+                    argon2__parallelism=1,
+                )
+                _dummy_hash = context.hash("\x00invalid\x00")
+                _pwd_handler = context.handler()
+                _current_hash_prefix = _dummy_hash.rsplit("$", 2)[0] + "$"
+                _pwd_context = context
+    return _pwd_context
+
 
 class User(BaseModel):
     """Represents a user with a hashed password and role assignments."""
@@ -41,8 +105,8 @@ class User(BaseModel):
     def validate_roles(cls, value: list[str]) -> list[str]:
         if not value:
             raise ValueError("At least one role must be assigned")
-        unknown = sorted(set(value) - _DEFAULT_ROLES)
-        if unknown:
+        if not _DEFAULT_ROLES.issuperset(value):
+            unknown = sorted(set(value).difference(_DEFAULT_ROLES))
             raise ValueError(f"Unknown roles: {', '.join(unknown)}")
         return value
 
@@ -52,122 +116,241 @@ class UserStore:
 
     def __init__(self, path: Path | str = Path("config/users.yaml")) -> None:
         self.path = Path(path)
-        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(self.path.parent)
         self._lock = threading.RLock()
-        # Use PBKDF2-SHA256 for hashing to avoid strict bcrypt backend/version
-        # coupling that can cause runtime failures when optional dependencies
-        # are missing or incompatible.
-        self._pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
         self._users: dict[str, User] | None = None
+        # Serialized form of self._users, kept in step per username so a write
+        # only re-dumps the user that changed.
+        self._payload: dict[str, dict] | None = None
+        self._version = 0
+        # Mutations persist immediately unless a batch() is open; _dirty marks
+        # in-memory changes that flush() still has to write.
+        self._dirty = False
+        self._autoflush = True
         self._ensure_default_admin()
 
     # Public API ---------------------------------------------------------
-    def list_users(self) -> list[User]:
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the stored users change; lets callers cache views."""
+
+        return self._version
+
+    def flush(self) -> None:
+        """Write pending changes to disk in one atomic, fsynced replace."""
+
         with self._lock:
-            return list(self._load_users().values())
+            if self._dirty and self._users is not None:
+                self._persist(self._users)
+                self._dirty = False
+
+    @contextmanager
+    def batch(self) -> Iterator["UserStore"]:
+        """Coalesce the mutations made inside the block into a single write."""
 
-    def get_user(self, username: str) -> Optional[User]:
         with self._lock:
-            return self._load_users().get(username)
+            previous, self._autoflush = self._autoflush, False
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._autoflush = previous
+                if previous:
+                    self.flush()
+
+    # Readers take no lock: mutations build a new dict under self._lock and
+    # swap it into self._users, so a reader always sees one complete snapshot.
+    def list_users(self) -> list[User]:
+        return list(self._load_users().values())
+
+    def get_user(self, username: str) -> Optional[User]:
+        return self._load_users().get(username)
 
     def add_user(self, username: str, password: str, roles: Iterable[str]) -> User:
         with self._lock:
-            users = self._load_users()
+            users = dict(self._load_users())
             if username in users:
                 raise ValueError(f"User '{username}' already exists")
 
             user = User(
                 username=username,
-                password_hash=self._pwd_context.hash(password),
+                password_hash=_get_pwd_context().hash(password),
                 roles=sorted(set(roles)),
             )
             users[username] = user
-            self._persist(users)
+            self._commit(users, username)
             return user
 
     def update_user(
         self, username: str, password: Optional[str] = None, roles: Optional[Iterable[str]] = None
     ) -> User:
         with self._lock:
-            users = self._load_users()
+            users = dict(self._load_users())
             if username not in users:
                 raise ValueError(f"User '{username}' not found")
 
-            user = users[username]
+            # Copy rather than mutate: the cached file snapshot shares User objects.
+            changes: dict[str, object] = {}
             if password:
-                user.password_hash = self._pwd_context.hash(password)
+                changes["password_hash"] = _get_pwd_context().hash(password)
             if roles is not None:
-                user.roles = User.validate_roles(list(roles))
+                changes["roles"] = User.validate_roles(list(roles))
+            user = users[username].model_copy(update=changes)
             users[username] = user
-            self._persist(users)
+            self._commit(users, username)
             return user
 
     def delete_user(self, username: str) -> None:
         with self._lock:
-            users = self._load_users()
+            users = dict(self._load_users())
             if username not in users:
                 raise ValueError(f"User '{username}' not found")
             del users[username]
-            self._persist(users)
+            self._commit(users, username)
 
     def authenticate(self, username: str, password: str) -> User:
         """Validate credentials and return the associated user."""
 
-        with self._lock:
-            users = self._load_users()
-            user = users.get(username)
-            if not user:
-                raise ValueError("Invalid credentials")
-            if not self._pwd_context.verify(password, user.password_hash):
-                raise ValueError("Invalid credentials")
-            return user
+        user = self._load_users().get(username)
+        context = _get_pwd_context()
+        if not user:
+            # Still pay for a verify so response time does not reveal which
+            # usernames exist.
+            _pwd_handler.verify(password, _dummy_hash)
+            raise ValueError("Invalid credentials")
+        if user.password_hash.startswith(_current_hash_prefix):
+            verified, new_hash = _pwd_handler.verify(password, user.password_hash), None
+        else:
+            verified, new_hash = context.verify_and_update(password, user.password_hash)
+        if not verified:
+            raise ValueError("Invalid credentials")
+        if new_hash is not None:
+            with self._lock:
+                users = self._load_users()
+                # Skip the upgrade if the user changed while we were verifying.
+                if users.get(username) is user:
+                    user = user.model_copy(update={"password_hash": new_hash})
+                    self._commit({**users, username: user}, username)
+        return user
 
     # Internal helpers ----------------------------------------------------
+    def _commit(self, users: dict[str, User], username: str) -> None:
+        _AUTH_CACHE.pop(username, None)
+        if self._payload is not None:
+            user = users.get(username)
+            if user is None:
+                self._payload.pop(username, None)
+            else:
+                self._payload[username] = user.model_dump(exclude={"username"})
+        self._users = users
+        self._version += 1
+        self._dirty = True
+        if self._autoflush:
+            self.flush()
+
     def _load_users(self) -> dict[str, User]:
-        if self._users is None:
-            self._users = self._read_users_file()
-        return self._users
+        users = self._users
+        if users is None:
+            with self._lock:
+                if self._users is None:
+                    self._users = self._read_users_file()
+                users = self._users
+        return users
 
     def _read_users_file(self) -> dict[str, User]:
-        if not self.path.exists():
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
             return {}
+        key = str(self.path.resolve())
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with _USERS_FILE_CACHE_LOCK:
+            cached = _USERS_FILE_CACHE.get(key)
+            if cached is not None and cached[0] == stamp:
+                _USERS_FILE_CACHE.move_to_end(key)
+                return dict(cached[1])
         with self.path.open("r", encoding="utf-8") as handle:
-            data = yaml.safe_load(handle) or {}
+            data = yaml.load(handle, Loader=_SafeLoader) or {}
         if not isinstance(data, dict):
             raise ValueError("User file must contain a mapping of username to attributes")
         users: dict[str, User] = {}
         for username, payload in data.items():
-            if not isinstance(payload, dict):
+            if not isinstance(payload, dict) or "password_hash" not in payload:
                 raise ValueError(f"Invalid user payload for {username}")
-            users[username] = User(username=username, **payload)
+            # The file is written by _persist from validated models, so skip
+            # re-running the validators; mutations still build User() normally.
+            users[username] = User.model_construct(
+                username=username,
+                password_hash=payload["password_hash"],
+                roles=payload.get("roles", ["viewer"]),
+            )
+        _remember_users_file(key, stamp, users)
         return users
 
     def _persist(self, users: dict[str, User]) -> None:
-        payload = {name: u.model_dump(exclude={"username"}) for name, u in users.items()}
-        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".users.", suffix=".tmp")
+        if self._payload is None:
+            self._payload = {name: u.model_dump(exclude={"username"}) for name, u in users.items()}
+        payload = self._payload
+        fd = self._open_unnamed()
+        unnamed = fd is not None
+        if fd is None:
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".users.", suffix=".tmp")
+        else:
+            # _lock only serializes this process; the CLI and the server may both
+            # be writing, so the link needs a name of its own, like mkstemp's.
+            tmp_path = str(self.path.with_name(f".users.{secrets.token_hex(8)}.tmp"))
+        owned = not unnamed
         try:
             with os.fdopen(fd, "w", encoding="utf-8") as handle:
-                yaml.safe_dump(payload, handle, sort_keys=True)
+                yaml.dump(payload, handle, Dumper=_SafeDumper, sort_keys=True)
                 handle.flush()
                 os.fsync(handle.fileno())
+                stat = os.fstat(handle.fileno())
+                if unnamed:
+                    self._link_unnamed(handle.fileno(), tmp_path)
+                    owned = True
             os.replace(tmp_path, self.path)
-            self._users = users
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+            _remember_users_file(
+                str(self.path.resolve()), (stat.st_mtime_ns, stat.st_size), users
+            )
+        except BaseException:
+            if owned:
+                try:
+                    os.unlink(tmp_path)
+                except FileNotFoundError:
+                    pass
+            raise
+
+    @staticmethod
+    def _link_unnamed(fd: int, tmp_path: str) -> None:
+        # os.link only calls linkat(..., AT_SYMLINK_FOLLOW) when a dir fd is given;
+        # plain link() would try to hard-link the /proc symlink itself. The source
+        # is absolute, so linkat ignores the descriptor.
+        os.link(f"/proc/self/fd/{fd}", tmp_path, src_dir_fd=fd)
+
+    def _open_unnamed(self) -> int | None:
+        """Open an anonymous O_TMPFILE in the store's directory, or None if unsupported."""
+
+        if not _HAS_O_TMPFILE:
+            return None
+        try:
+            return os.open(self.path.parent, os.O_TMPFILE | os.O_WRONLY, 0o600)
+        except OSError:  # e.g. filesystems without O_TMPFILE support
+            return None
 
     def _ensure_default_admin(self) -> None:
         with self._lock:
             if self.path.exists():
                 return
-            self._persist(
+            self._commit(
                 {
                     "admin": User(
                         username="admin",
-                        password_hash=self._pwd_context.hash(_DEFAULT_ADMIN_PASSWORD),
+                        password_hash=_get_pwd_context().hash(_DEFAULT_ADMIN_PASSWORD),
                         roles=["admin"],
                     )
-                }
+                },
+                "admin",
             )
 
 
@@ -181,10 +364,26 @@ def get_user_store() -> UserStore:
     return _user_store
 
 
-@dataclass
+@dataclass(frozen=True)
 class AuthenticatedUser:
     username: str
-    roles: list[str]
+    roles: frozenset[str]
+
+
+# Projection handed out per username, paired with the User it was built from.
+# Mutations swap in new User objects, so an identity match means it is current.
+_AUTH_CACHE: dict[str, tuple[object, AuthenticatedUser]] = {}
+
+
+def get_authenticated(user: User | AuthenticatedUser) -> AuthenticatedUser:
+    """Return the shared AuthenticatedUser for ``user``, building it on first use."""
+
+    cached = _AUTH_CACHE.get(user.username)
+    if cached is not None and cached[0] is user:
+        return cached[1]
+    authenticated = AuthenticatedUser(username=user.username, roles=frozenset(user.roles))
+    _AUTH_CACHE[user.username] = (user, authenticated)
+    return authenticated
 
 
 # CLI utilities -----------------------------------------------------------
@@ -195,8 +394,9 @@ def _print_user(user: User) -> None:
 
 
 def _cli_list(store: UserStore, args: argparse.Namespace) -> None:  # noqa: ARG001
-    for user in store.list_users():
-        _print_user(user)
+    # One array in a single orjson call instead of a json.dumps per user.
+    listing = [{"username": u.username, "roles": sorted(u.roles)} for u in store.list_users()]
+    sys.stdout.write(orjson.dumps(listing, option=orjson.OPT_INDENT_2).decode() + "\n")
 
 
 def _cli_create(store: UserStore, args: argparse.Namespace) -> None:
@@ -245,7 +445,8 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = parser.parse_args(argv)
     store = get_user_store()
     try:
-        args.func(store, args)
+        with store.batch():
+            args.func(store, args)
     except ValueError as exc:  # pragma: no cover - CLI surface
         parser.error(str(exc))
     return 0
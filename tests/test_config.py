@@ -0,0 +1,86 @@
+import errno
+import os
+from datetime import time
+
+import pytest
+from pydantic import ValidationError
+
+from src.config import ConfigManager, ScheduleEntry
+
+
+def test_get_user_settings_reuses_cached_model(tmp_path):
+    manager = ConfigManager(tmp_path)
+
+    first = manager.get_user_settings()
+    second = manager.get_user_settings()
+
+    assert first is second
+
+
+def test_get_user_settings_reloads_after_external_edit(tmp_path):
+    manager = ConfigManager(tmp_path)
+    manager.get_user_settings()
+
+    path = tmp_path / "user.yaml"
+    path.write_text("events_enabled: false\n", encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert manager.get_user_settings().events_enabled is False
+
+
+def test_save_user_settings_coalesces_until_flush(tmp_path):
+    manager = ConfigManager(tmp_path, flush_delay=60)
+    settings = manager.get_user_settings()
+
+    settings = settings.model_copy(update={"events_enabled": False})
+    manager.save_user_settings(settings)
+    settings = settings.model_copy(update={"alarms_enabled": False})
+    manager.save_user_settings(settings)
+    assert "events_enabled: false" not in (tmp_path / "user.yaml").read_text()
+
+    manager.flush()
+
+    reloaded = ConfigManager(tmp_path).get_user_settings()
+    assert reloaded.events_enabled is False
+    assert reloaded.alarms_enabled is False
+
+
+def test_schedule_entry_rejects_unknown_days():
+    with pytest.raises(ValidationError, match="Invalid days: Funday"):
+        ScheduleEntry(name="Bad", start=time(1), end=time(2), days=["Mon", "Funday"])
+
+    with pytest.raises(ValidationError, match="At least one day"):
+        ScheduleEntry(name="Empty", start=time(1), end=time(2), days=[])
+
+
+def test_flush_skips_write_when_settings_are_unchanged(tmp_path):
+    manager = ConfigManager(tmp_path, flush_delay=60)
+    settings = manager.get_user_settings().model_copy(update={"events_enabled": False})
+    manager.save_user_settings(settings)
+    manager.flush()
+    written = os.stat(tmp_path / "user.yaml").st_mtime_ns
+
+    manager.save_user_settings(settings)
+    manager.flush()
+
+    assert os.stat(tmp_path / "user.yaml").st_mtime_ns == written
+
+
+def test_flush_keeps_settings_pending_when_write_fails(tmp_path, monkeypatch):
+    manager = ConfigManager(tmp_path, flush_delay=60)
+    settings = manager.get_user_settings().model_copy(update={"events_enabled": False})
+    manager.save_user_settings(settings)
+    write_yaml = manager._write_yaml
+
+    def fail_once(*args, **kwargs):
+        monkeypatch.setattr(manager, "_write_yaml", write_yaml)
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(manager, "_write_yaml", fail_once)
+    manager.flush()
+    assert "events_enabled: false" not in (tmp_path / "user.yaml").read_text()
+
+    manager.flush()
+
+    assert ConfigManager(tmp_path).get_user_settings().events_enabled is False
@@ -0,0 +1,104 @@
+import os
+
+from src import device_management
+from src.config import NetworkMode
+
+
+def test_read_dhcpcd_only_applies_matching_interface(tmp_path, monkeypatch):
+    conf = tmp_path / "dhcpcd.conf"
+    conf.write_text(
+        "# Generated by ONVIF NVR device management\n"
+        "interface wlan0\n"
+        "static routers=10.0.0.1\n"
+        "interface eth0\n"
+        "  static ip_address=192.168.1.20/24\n"
+        "static routers=192.168.1.1\n"
+        "# static routers=192.168.1.254\n"
+        "static domain_name_servers=1.1.1.1 8.8.8.8\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(device_management, "_DHCPCD_CONF", conf)
+
+    parsed = device_management._read_dhcpcd("eth0")
+
+    assert parsed == {
+        "mode": NetworkMode.static,
+        "static_ip": "192.168.1.20",
+        "subnet_mask": "255.255.255.0",
+        "gateway": "192.168.1.1",
+        "dns_servers": ["1.1.1.1", "8.8.8.8"],
+    }
+
+
+def test_read_dns_servers_skips_comments(tmp_path, monkeypatch):
+    resolv = tmp_path / "resolv.conf"
+    resolv.write_text(
+        "# nameserver 9.9.9.9\nsearch lan\nnameserver 1.1.1.1\n nameserver 8.8.4.4 \n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(device_management, "_RESOLV_CONF", resolv)
+
+    assert device_management._read_dns_servers() == ["1.1.1.1", "8.8.4.4"]
+
+
+def test_read_dns_servers_refreshes_when_file_changes(tmp_path, monkeypatch):
+    resolv = tmp_path / "resolv.conf"
+    resolv.write_text("nameserver 1.1.1.1\n", encoding="utf-8")
+    monkeypatch.setattr(device_management, "_RESOLV_CONF", resolv)
+    assert device_management._read_dns_servers() == ["1.1.1.1"]
+
+    resolv.write_text("nameserver 9.9.9.9\n", encoding="utf-8")
+    stat = os.stat(resolv)
+    os.utime(resolv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert device_management._read_dns_servers() == ["9.9.9.9"]
+
+
+def test_read_ntp_config_uses_time_section(tmp_path, monkeypatch):
+    conf = tmp_path / "timesyncd.conf"
+    conf.write_text(
+        "[Time]\n#NTP=ignored.example\nNTP=0.pool.ntp.org 1.pool.ntp.org\n"
+        "[Other]\nNTP=not.time.section\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(device_management, "_TIMESYNCD_CONF", conf)
+
+    assert device_management._read_ntp_config() == (True, ["0.pool.ntp.org", "1.pool.ntp.org"])
+
+
+def test_apply_network_with_unsafe_values_still_writes_dns_and_dhcpcd(monkeypatch):
+    from src import system_control
+    from src.config import NetworkSettings
+
+    commands, written = [], []
+    monkeypatch.setattr(system_control, "_run_command", lambda *args, **kwargs: commands.append(args))
+    monkeypatch.setattr(system_control, "_write_file", lambda path, content: written.append(str(path)))
+    settings = NetworkSettings(
+        mode=NetworkMode.static,
+        interface="eth0\naddr flush dev wlan0",
+        static_ip="192.168.1.20",
+        subnet_mask="255.255.255.0",
+        gateway="192.168.1.1",
+        dns_servers=["1.1.1.1"],
+    )
+
+    system_control.apply_network(settings)
+
+    assert commands == []
+    assert written == ["/etc/resolv.conf", "/etc/dhcpcd.conf"]
+
+
+def test_apply_all_sets_hostname_before_dhcp_and_ntp_after(monkeypatch):
+    from src import system_control
+    from src.config import NetworkSettings, NTPSettings
+
+    commands = []
+    monkeypatch.setattr(
+        system_control, "_run_command", lambda command, stdin=None: commands.append(command[0])
+    )
+    monkeypatch.setattr(system_control, "_write_file", lambda path, content: None)
+
+    system_control.apply_all(NetworkSettings(mode=NetworkMode.dhcp, hostname="nvr"), NTPSettings())
+
+    assert commands[:4] == ["hostnamectl", "hostname", "dhclient", "dhclient"]
+    assert commands[4] == "timedatectl"
@@ -0,0 +1,30 @@
+from xml.etree import ElementTree as ET
+
+from src import discovery
+from src.discovery import WSDiscoveryResponder
+
+_ADDRESSING_NS = "http://schemas.xmlsoap.org/ws/2004/08/addressing"
+_DISCOVERY_NS = "http://schemas.xmlsoap.org/ws/2005/04/discovery"
+
+
+def test_probe_match_response_is_well_formed():
+    responder = WSDiscoveryResponder("http://192.168.1.20:8000/")
+
+    envelope = ET.fromstring(responder._build_probe_match_response().strip())
+
+    assert envelope.findtext(f".//{{{_DISCOVERY_NS}}}XAddrs") == "http://192.168.1.20:8000/"
+    assert envelope.findtext(f".//{{{_ADDRESSING_NS}}}MessageID").startswith("uuid:")
+    assert envelope.findtext(f".//{{{_DISCOVERY_NS}}}MetadataVersion").isdigit()
+
+
+def test_probe_match_echoes_probe_message_id_and_keeps_endpoint():
+    responder = WSDiscoveryResponder("http://192.168.1.20:8000/")
+    probe = b"<a:MessageID>uuid:probe-1</a:MessageID><d:Probe/>"
+    message_id = discovery._probe_message_id(probe, len(probe))
+
+    first = ET.fromstring(responder._build_probe_match_response(message_id).strip())
+    second = ET.fromstring(responder._build_probe_match_response().strip())
+
+    assert first.findtext(f".//{{{_ADDRESSING_NS}}}RelatesTo") == "uuid:probe-1"
+    address = f".//{{{_ADDRESSING_NS}}}Address"
+    assert first.findtext(address) == second.findtext(address)
@@ -0,0 +1,24 @@
+from src.config import MediaProfileSettings
+from src.media_pipeline import LightweightRTSPServer, MediaPipelineInstance
+
+
+def _instance(tmp_path) -> MediaPipelineInstance:
+    profile = MediaProfileSettings(name="Main", token="main", width=1280, height=720)
+    return MediaPipelineInstance(
+        profile=profile,
+        rtsp_server=LightweightRTSPServer(),
+        snapshot_dir=tmp_path,
+        hostname="nvr-test",
+    )
+
+
+def test_pipeline_string_is_rebuilt_after_profile_update(tmp_path):
+    instance = _instance(tmp_path)
+    first = instance.pipeline
+    assert instance.pipeline is first
+    assert "width=1280,height=720" in first
+
+    instance.update_profile(instance.profile.model_copy(update={"width": 640, "height": 480}))
+
+    assert "width=640,height=480" in instance.pipeline
+    assert "width=640,height=480" in instance.preview
@@ -0,0 +1,166 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+import yaml
+
+from src.notifications import BaseNotificationManager
+
+
+def test_mutations_coalesce_until_flush(tmp_path):
+    path = tmp_path / "subscriptions.json"
+    manager = BaseNotificationManager(path, flush_delay=60)
+
+    subscription = manager.create_subscription(topics=["tns1:Device"])
+    for index in range(5):
+        manager.enqueue_notification("tns1:Device/Trigger", {"index": str(index)})
+    assert not path.exists()
+
+    manager.close()
+
+    reloaded = BaseNotificationManager(path, flush_delay=60)
+    messages = reloaded.pull_messages(subscription.token, message_limit=10)
+    assert [message["Message"]["index"] for message in messages] == ["0", "1", "2", "3", "4"]
+    reloaded.close()
+
+
+def test_legacy_yaml_store_is_migrated(tmp_path):
+    legacy = BaseNotificationManager(tmp_path / "subscriptions.json", flush_delay=60)
+    subscription = legacy.create_subscription()
+    legacy.close()
+    payload = orjson.loads((tmp_path / "subscriptions.json").read_bytes())
+    (tmp_path / "subscriptions.json").unlink()
+    (tmp_path / "subscriptions.yaml").write_text(yaml.safe_dump(payload), encoding="utf-8")
+
+    manager = BaseNotificationManager(tmp_path / "subscriptions.json", flush_delay=60)
+    manager.close()
+
+    assert subscription.token in manager._subscriptions
+    assert (tmp_path / "subscriptions.json").exists()
+
+
+def test_pull_messages_respects_limit_and_keeps_remainder(tmp_path):
+    manager = BaseNotificationManager(tmp_path / "subscriptions.json", flush_delay=60)
+    subscription = manager.create_subscription()
+    for index in range(5):
+        manager.enqueue_notification("tns1:Device/Trigger", {"index": str(index)})
+
+    first = manager.pull_messages(subscription.token, message_limit=3)
+    rest = manager.pull_messages(subscription.token, message_limit=10)
+
+    assert [message["Sequence"] for message in first] == [1, 2, 3]
+    assert [message["Sequence"] for message in rest] == [4, 5]
+    manager.close()
+
+
+def test_enqueue_routes_by_topic_prefix(tmp_path):
+    manager = BaseNotificationManager(tmp_path / "subscriptions.json", flush_delay=60)
+    device = manager.create_subscription(topics=["tns1:Device"])
+    video = manager.create_subscription(topics=["tns1:VideoSource/Motion", "tns1:Recording"])
+    everything = manager.create_subscription()
+
+    manager.enqueue_notification("tns1:Device/Trigger/Relay", {})
+    manager.enqueue_notification("tns1:VideoSource/MotionAlarm", {})
+    manager.unsubscribe(video.token)
+    manager.enqueue_notification("tns1:Recording/JobState", {})
+
+    def topics(token):
+        return [message["Topic"] for message in manager.pull_messages(token)]
+
+    assert topics(device.token) == ["tns1:Device/Trigger/Relay"]
+    assert topics(everything.token) == [
+        "tns1:Device/Trigger/Relay",
+        "tns1:VideoSource/MotionAlarm",
+        "tns1:Recording/JobState",
+    ]
+    assert manager._topic_index.keys() == {"tns1:Device"}
+    manager.close()
+
+
+def test_persisted_form_is_rebuilt_only_for_modified_subscriptions(tmp_path):
+    manager = BaseNotificationManager(tmp_path / "subscriptions.json", flush_delay=60)
+    device = manager.create_subscription(topics=["tns1:Device"])
+    video = manager.create_subscription(topics=["tns1:VideoSource"])
+    device_dict, video_dict = device.to_dict(), video.to_dict()
+
+    manager.enqueue_notification("tns1:Device/Trigger", {"State": "true"})
+
+    assert video.to_dict() is video_dict
+    assert device.to_dict() is not device_dict
+    assert device.to_dict()["queue"][0]["message"] == {"State": "true"}
+    manager.close()
+
+
+def test_many_filters_still_route_by_prefix(tmp_path):
+    manager = BaseNotificationManager(tmp_path / "subscriptions.json", flush_delay=60)
+    subscription = manager.create_subscription(
+        topics=["tns1:A", "tns1:Bb", "tns1:Ccc", "tns1:Dddd", "tns1:Device/IO"]
+    )
+
+    manager.enqueue_notification("tns1:Unrelated", {})
+    manager.enqueue_notification("tns1:Device/IO/Input1/LogicalState", {})
+
+    messages = manager.pull_messages(subscription.token)
+    assert [message["Topic"] for message in messages] == ["tns1:Device/IO/Input1/LogicalState"]
+    manager.close()
+
+
+def test_enqueue_batch_assigns_sequences_in_order(tmp_path):
+    manager = BaseNotificationManager(tmp_path / "subscriptions.json", flush_delay=60)
+    subscription = manager.create_subscription(topics=["tns1:Recording"])
+
+    manager.enqueue_batch(
+        [
+            ("tns1:Recording/Configuration/Schedule", {"Name": "Night"}),
+            ("tns1:Device/Trigger", {}),
+            ("tns1:Recording/Configuration/Schedule", {"Name": "Day"}),
+        ]
+    )
+
+    messages = manager.pull_messages(subscription.token)
+    assert [(m["Sequence"], m["Message"].get("Name")) for m in messages] == [(1, "Night"), (2, "Day")]
+    manager.close()
+
+
+def test_concurrent_enqueue_and_pull_deliver_every_record_once(tmp_path):
+    manager = BaseNotificationManager(tmp_path / "subscriptions.json", flush_delay=0.001)
+    subscription = manager.create_subscription()
+    pulled = []
+
+    def produce():
+        for index in range(200):
+            manager.enqueue_notification("tns1:Device/Trigger", {"index": str(index)})
+
+    def consume():
+        for _ in range(200):
+            pulled.extend(manager.pull_messages(subscription.token, message_limit=5))
+
+    threads = [threading.Thread(target=produce) for _ in range(3)]
+    threads.append(threading.Thread(target=consume))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pulled.extend(manager.pull_messages(subscription.token, message_limit=1000))
+    manager.close()
+
+    assert sorted(message["Sequence"] for message in pulled) == list(range(1, 601))
+
+
+def test_expired_subscriptions_are_evicted_unless_renewed(tmp_path):
+    manager = BaseNotificationManager(tmp_path / "subscriptions.json", flush_delay=60)
+    now = datetime.now(timezone.utc)
+    short = manager.create_subscription(termination=now + timedelta(milliseconds=20))
+    renewed = manager.create_subscription(termination=now + timedelta(milliseconds=20))
+    manager.renew(now + timedelta(hours=1), renewed.token)
+
+    time.sleep(0.05)
+    manager.enqueue_notification("tns1:Device/Trigger", {})
+
+    assert set(manager._subscriptions) == {renewed.token}
+    with pytest.raises(ValueError):
+        manager.pull_messages(short.token)
+    assert len(manager.pull_messages(renewed.token)) == 1
+    manager.close()
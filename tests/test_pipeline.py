@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from src.pipeline import iso_utc_now
+
+
+def test_iso_utc_now_matches_datetime_formatting():
+    before = datetime.now(timezone.utc)
+    stamp = iso_utc_now()
+    after = datetime.now(timezone.utc)
+
+    assert stamp.endswith("Z")
+    assert before <= datetime.fromisoformat(stamp) <= after
+
+
+def test_routers_and_soap_share_one_event_pipeline():
+    from src import soap
+    from src.routers import events, recording
+
+    assert events.pipeline is recording.pipeline is soap.pipeline
+
+
+def test_saved_settings_do_not_alias_live_channels():
+    from src.config import UserSettings
+    from src.pipeline import EventPipeline
+
+    class _Config:
+        def __init__(self):
+            self.settings = UserSettings(
+                digital_inputs=[{"channel_id": 1, "direction": "input", "name": "DI1"}]
+            )
+
+        def get_user_settings(self):
+            return self.settings
+
+        def save_user_settings(self, settings):
+            self.settings = settings
+
+    config = _Config()
+    pipeline = EventPipeline(config)
+    pipeline._notifications = type("_Notifications", (), {"enqueue_notification": lambda *args: None})()
+    pipeline.update_digital_channel("input", 1, True)
+    saved = config.settings
+
+    pipeline.update_digital_channel("input", 1, False)
+
+    assert saved.digital_inputs[0]["state"] is True
+    assert config.settings.digital_inputs[0]["state"] is False
@@ -0,0 +1,109 @@
+import errno
+import os
+from datetime import datetime, timedelta, timezone
+
+from src.json_store import _parse_store
+from src.recordings import RecordingStore
+
+
+def test_recordings_are_persisted_on_flush(tmp_path):
+    path = tmp_path / "recordings.json"
+    store = RecordingStore(path, flush_delay=60)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    recording = store.index_recording("source1", start, start + timedelta(minutes=5))
+    assert not path.exists()
+    store.flush()
+
+    reloaded = RecordingStore(path, flush_delay=60)
+    assert reloaded.get_recording(recording.recording_token).source_token == "source1"
+    reloaded.close()
+    store.close()
+
+
+def test_reload_reuses_parsed_payload_until_file_changes(tmp_path):
+    path = tmp_path / "recordings.json"
+    store = RecordingStore(path, flush_delay=60)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    store.index_recording("source1", start, start + timedelta(minutes=5))
+    store.flush()
+
+    hits = _parse_store.cache_info().hits
+    RecordingStore(path, flush_delay=60).close()
+    RecordingStore(path, flush_delay=60).close()
+    assert _parse_store.cache_info().hits == hits + 1
+
+    store.index_recording("source2", start, start + timedelta(minutes=5))
+    store.close()
+    assert len(RecordingStore(path, flush_delay=60).list_recordings()) == 2
+
+
+def test_flush_skips_write_when_state_is_unchanged(tmp_path):
+    path = tmp_path / "recordings.json"
+    store = RecordingStore(path, flush_delay=60)
+    job = store.create_job("source1")
+    store.update_job_state(job.job_token, "Active")
+    store.flush()
+    written = os.stat(path).st_mtime_ns
+
+    store.update_job_state(job.job_token, "Active")
+    store.flush()
+
+    assert os.stat(path).st_mtime_ns == written
+    store.close()
+
+
+def test_search_stream_matches_pydantic_wire_format():
+    from src.recordings import RecordingMetadata, TrackMetadata
+    from src.routers.recording import _stream_recordings
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 1, 1, 0, 0, 500000, tzinfo=timezone.utc)
+    recording = RecordingMetadata(
+        recording_token="r1",
+        source_token="p",
+        start_time=start,
+        end_time=end,
+        tracks=[TrackMetadata(track_token="track1", start_time=start, end_time=end)],
+    )
+
+    assert b"".join(_stream_recordings([recording])) == (
+        b'[{"recording_token":"r1","source_token":"p","start_time":"2024-01-01T00:00:00Z",'
+        b'"end_time":"2024-01-01T01:00:00.500000Z","tracks":[{"track_token":"track1",'
+        b'"start_time":"2024-01-01T00:00:00+00:00","end_time":"2024-01-01T01:00:00.500000+00:00",'
+        b'"state":"Completed","file_path":null}]}]'
+    )
+    assert b"".join(_stream_recordings([])) == b"[]"
+
+
+def test_recording_response_encodes_utc_with_z_suffix():
+    from src.routers.recording import _RecordingResponse
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    offset = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=2)))
+
+    assert _RecordingResponse({"start_time": start, "end_time": offset}).body == (
+        b'{"start_time":"2024-01-01T00:00:00Z","end_time":"2024-01-01T00:00:00+02:00"}'
+    )
+
+
+def test_failed_write_keeps_store_dirty_until_a_later_flush(tmp_path, monkeypatch):
+    path = tmp_path / "recordings.json"
+    store = RecordingStore(path, flush_delay=60)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    recording = store.index_recording("source1", start, start + timedelta(minutes=5))
+    write = store._write
+
+    def fail_once(data):
+        monkeypatch.setattr(store, "_write", write)
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(store, "_write", fail_once)
+    store.flush()
+    assert not path.exists()
+
+    store.close()
+
+    reloaded = RecordingStore(path, flush_delay=60)
+    assert reloaded.get_recording(recording.recording_token).source_token == "source1"
+    reloaded.close()
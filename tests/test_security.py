@@ -2,7 +2,13 @@ import unittest
 
 from fastapi import HTTPException
 
-from src.security import create_username_token, verify_wsse
+from src.security import (
+    OPERATOR_ROLES,
+    create_username_token,
+    parse_username_token,
+    require_roles,
+    verify_wsse,
+)
 from src.users import AuthenticatedUser
 
 
@@ -14,7 +20,7 @@ class _DummyStore:
 
     def authenticate(self, username: str, password: str):
         if username == self.username and password == self.password:
-            return AuthenticatedUser(username=username, roles=self.roles)
+            return AuthenticatedUser(username=username, roles=frozenset(self.roles))
         raise ValueError("Invalid credentials")
 
 
@@ -73,5 +79,34 @@ class VerifyWsseLoggingTestCase(unittest.TestCase):
         self.assertIn("Invalid credentials", invalid_reasons)
 
 
+class ParseUsernameTokenTestCase(unittest.TestCase):
+    def test_accepts_case_and_whitespace_variants(self) -> None:
+        self.assertEqual(parse_username_token('UsernameToken username="a" password="b"'), ("a", "b"))
+        self.assertEqual(
+            parse_username_token('WSSE usernametoken\tUSERNAME="a"  Password="b" nonce="n"'), ("a", "b")
+        )
+        self.assertEqual(parse_username_token("alice:se:cret"), ("alice", "se:cret"))
+
+    def test_rejects_empty_fields(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_username_token('UsernameToken username="" password="b"')
+        with self.assertRaises(ValueError):
+            parse_username_token('UsernameTokenusername="a" password="b"')
+
+
+class RequireRolesTestCase(unittest.TestCase):
+    def test_identical_role_sets_share_one_dependency(self) -> None:
+        self.assertIs(require_roles(["admin", "operator"]), require_roles(OPERATOR_ROLES))
+
+    def test_rejects_users_without_an_allowed_role(self) -> None:
+        dependency = require_roles(OPERATOR_ROLES)
+        operator = AuthenticatedUser(username="bob", roles=frozenset({"operator"}))
+
+        self.assertIs(dependency(user=operator), operator)
+        with self.assertRaises(HTTPException) as ctx:
+            dependency(user=AuthenticatedUser(username="alice", roles=frozenset({"viewer"})))
+        self.assertEqual(ctx.exception.status_code, 403)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,7 +6,14 @@ from starlette.requests import Request
 from starlette.datastructures import Headers
 from xml.etree import ElementTree as ET
 
-from src.soap import SOAP_NS, WSSE_NS, _require_username_token
+from src.soap import (
+    SOAP_NS,
+    WSSE_NS,
+    _parse_iso_duration,
+    _parse_operation,
+    _peek_operation_name,
+    _require_username_token,
+)
 
 
 class _DummyStore:
@@ -86,3 +93,44 @@ def test_invalid_credentials_raise_http_exception():
         _require_username_token(envelope, store, request=None)
 
     assert exc.value.status_code == 401
+
+
+def test_parse_operation_skips_comments_and_keeps_entities_unexpanded():
+    content = (
+        b'<?xml version="1.0"?><!DOCTYPE e [<!ENTITY x "expanded">]>'
+        b'<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope"><s:Body>'
+        b"<!-- probe --><GetHostname><Name>&x;</Name></GetHostname></s:Body></s:Envelope>"
+    )
+
+    _, operation, name = _parse_operation(content)
+
+    assert name == "GetHostname"
+    assert operation.findtext("Name") != "expanded"
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("PT10M", (0, 0, 10, 0)),
+        ("P1DT2H3M4S", (1, 2, 3, 4)),
+        ("P2DT", (2, 0, 0, 0)),
+        ("PT1.5S", (0, 0, 0, 0)),
+        ("2030-01-01T00:00:00", None),
+    ],
+)
+def test_parse_iso_duration(text, expected):
+    assert _parse_iso_duration(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        (b'<s:Envelope xmlns:s="x"><s:Body><tds:GetNTP/></s:Body></s:Envelope>', "GetNTP"),
+        (b"<Envelope><Body>\n  <Stop xmlns='y'></Stop></Body></Envelope>", "Stop"),
+        (b"<s:Envelope><s:Body/></s:Envelope>", None),
+        (b"<s:Envelope><s:Body><!-- note --><Stop/></s:Body></s:Envelope>", None),
+        (b"<s:Envelope><s:Body>", None),
+    ],
+)
+def test_peek_operation_name(content, expected):
+    assert _peek_operation_name(content) == expected
@@ -0,0 +1,21 @@
+import pytest
+
+from src.routers.system import _etag_matches
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ('"other",W/"abc"', True),
+        ("*", True),
+        ('"other"', False),
+        ('"abcd"', False),
+        ("", False),
+        (None, False),
+    ],
+)
+def test_etag_matches_uses_weak_comparison(header, expected):
+    assert _etag_matches(header, '"abc"') is expected
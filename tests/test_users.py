@@ -0,0 +1,87 @@
+import pytest
+
+from src import users
+from src.users import UserStore
+
+
+def test_new_store_reuses_parsed_users_file(tmp_path, monkeypatch):
+    path = tmp_path / "users.yaml"
+    UserStore(path).add_user("alice", "pw", ["viewer"])
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("users file should not be re-parsed")
+
+    monkeypatch.setattr(users.yaml, "load", _fail)
+    assert sorted(u.username for u in UserStore(path).list_users()) == ["admin", "alice"]
+
+
+def test_authenticate_upgrades_legacy_pbkdf2_hash(tmp_path):
+    from passlib.hash import pbkdf2_sha256
+
+    path = tmp_path / "users.yaml"
+    path.write_text(
+        f"admin:\n  password_hash: '{pbkdf2_sha256.hash('secret')}'\n  roles: [admin]\n",
+        encoding="utf-8",
+    )
+    store = UserStore(path)
+
+    store.authenticate("admin", "secret")
+
+    assert store.get_user("admin").password_hash.startswith("$argon2id$")
+    assert UserStore(path).authenticate("admin", "secret").username == "admin"
+
+
+def test_batch_coalesces_mutations_into_one_write(tmp_path, monkeypatch):
+    store = UserStore(tmp_path / "users.yaml")
+    writes = []
+    persist = store._persist
+    monkeypatch.setattr(store, "_persist", lambda users: writes.append(1) or persist(users))
+
+    with store.batch():
+        store.add_user("alice", "pw", ["viewer"])
+        store.add_user("bob", "pw", ["operator"])
+        store.delete_user("alice")
+
+    assert len(writes) == 1
+    assert sorted(u.username for u in UserStore(tmp_path / "users.yaml").list_users()) == [
+        "admin",
+        "bob",
+    ]
+
+
+def test_authenticate_unknown_user_still_verifies_a_hash(tmp_path, monkeypatch):
+    store = UserStore(tmp_path / "users.yaml")
+    users._get_pwd_context()
+    calls = []
+    monkeypatch.setattr(
+        users._pwd_handler, "verify", lambda secret, hash: calls.append(hash) or False
+    )
+
+    with pytest.raises(ValueError, match="Invalid credentials"):
+        store.authenticate("nobody", "pw")
+
+    assert calls == [users._dummy_hash]
+
+
+def test_persist_leaves_other_writers_temporaries_alone(tmp_path):
+    in_flight = tmp_path / ".users.yaml.tmp"
+    in_flight.write_text("another process", encoding="utf-8")
+    store = UserStore(tmp_path / "users.yaml")
+
+    store.add_user("alice", "pw", ["viewer"])
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".users.yaml.tmp", "users.yaml"]
+    assert in_flight.read_text(encoding="utf-8") == "another process"
+    assert "alice" in (tmp_path / "users.yaml").read_text(encoding="utf-8")
+
+
+def test_authenticated_projection_is_reused_until_the_user_changes(tmp_path):
+    store = UserStore(tmp_path / "users.yaml")
+    first = users.get_authenticated(store.authenticate("admin", "admin123"))
+
+    assert users.get_authenticated(store.authenticate("admin", "admin123")) is first
+
+    store.update_user("admin", roles=["admin", "operator"])
+    updated = users.get_authenticated(store.authenticate("admin", "admin123"))
+    assert updated is not first
+    assert updated.roles == frozenset({"admin", "operator"})